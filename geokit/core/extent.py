@@ -3,7 +3,6 @@ from osgeo import gdal, ogr, osr
 from glob import glob
 import warnings
 from collections import namedtuple
-import smopy
 from os.path import isfile
 
 from . import util as UTIL
@@ -84,6 +83,13 @@ class Extent(object):
         self._box = GEOM.box(self.xMin, self.yMin,
                              self.xMax, self.yMax, srs=self.srs)
 
+    def __getstate__(self):
+        return (self.xMin, self.yMin, self.xMax, self.yMax, SRS.compactSRS(self.srs))
+
+    def __setstate__(self, state):
+        xMin, yMin, xMax, yMax, srs = state
+        self.__init__(xMin, yMin, xMax, yMax, srs=srs)
+
     @staticmethod
     def from_xXyY(bounds, srs='latlon'):
         """Create an Extent from explicitly defined boundaries
@@ -147,13 +153,9 @@ class Extent(object):
         geokit.Extent
 
         """
-        tl = smopy.num2deg(xi - 0.0, yi + 1.0, zoom)[::-1]
-        br = smopy.num2deg(xi + 1.0, yi - 0.0, zoom)[::-1]
+        xMin, yMin, xMax, yMax = SRS.tileBounds(xi, yi, zoom)
 
-        o = SRS.xyTransform([tl, br], fromSRS=SRS.EPSG4326,
-                            toSRS=SRS.EPSG3857, outputFormat='xy')
-
-        return Extent(o.x.min(), o.y.min(), o.x.max(), o.y.max(), srs=SRS.EPSG3857)
+        return Extent(xMin, yMin, xMax, yMax, srs=SRS.EPSG3857)
 
     @staticmethod
     def fromTileAt(x, y, zoom, srs):
@@ -385,7 +387,7 @@ class Extent(object):
 
     def __eq__(self, o):
         # if (self.xyXY != o.xyXY): return False
-        if (not self.srs.IsSame(o.srs)):
+        if (not SRS.isSame(self.srs, o.srs)):
             return False
         if not np.isclose(self.xMin, o.xMin):
             return False
@@ -399,7 +401,7 @@ class Extent(object):
 
     def __add__(self, o):
         # if (self.xyXY != o.xyXY): return False
-        if (not self.srs.IsSame(o.srs)):
+        if (not SRS.isSame(self.srs, o.srs)):
             o = o.castTo(self.srs)
 
         newExt = Extent(np.minimum(self.xMin, o.xMin),
@@ -613,7 +615,7 @@ class Extent(object):
         x,y = (self.xMax+self.xMin)/2, (self.yMax+self.yMin)/2
         if not srs is None:
             srs=SRS.loadSRS(srs)
-            if not srs.IsSame(self.srs):
+            if not SRS.isSame(srs, self.srs):
                 xy = SRS.xyTransform(x, y, fromSRS=self.srs, toSRS=srs, outputFormat="xy")
 
                 x = xy.x
@@ -642,7 +644,7 @@ class Extent(object):
         """
         srs = SRS.loadSRS(srs)
 
-        if(srs.IsSame(self.srs)):
+        if(SRS.isSame(srs, self.srs)):
             return self
 
         segment_size = min(self.xMax - self.xMin,
@@ -754,7 +756,9 @@ class Extent(object):
         self.box  # initialize the box
 
         # Normalize locations
-        locs = LocationSet(locs).asXY(self.srs)
+        if not isinstance(locs, LocationSet):
+            locs = LocationSet(locs)
+        locs = locs._cachedXY(self.srs)
 
         # Do tests
         sel = np.ones(locs.shape[0], dtype=bool)
@@ -828,7 +832,7 @@ class Extent(object):
 
         """
         # test raw bounds
-        if(not extent.srs.IsSame(self.srs) or
+        if(not SRS.isSame(extent.srs, self.srs) or
             extent.xMin < self.xMin or extent.yMin < self.yMin or
                 extent.xMax > self.xMax or extent.yMax > self.yMax):
             return False
@@ -876,7 +880,7 @@ class Extent(object):
         """
 
         # test srs
-        if not self.srs.IsSame(extent.srs):
+        if not SRS.isSame(self.srs, extent.srs):
             raise GeoKitExtentError("extents are not of the same srs")
 
         # try to unpack the resolution
@@ -1041,7 +1045,7 @@ class Extent(object):
         """
         if strict:
             ri = RASTER.rasterInfo(source)
-            if not self.srs.IsSame(ri.srs):
+            if not SRS.isSame(self.srs, ri.srs):
                 raise GeoKitExtentError(
                     "Extent and source do not share an srs")
             if not Extent._fromInfo(ri).contains(self, (ri.dx, ri.dy)):
@@ -1383,10 +1387,10 @@ class Extent(object):
         """
         ext4326 = self.castTo(SRS.EPSG4326)
 
-        tl_tile_xi, tl_tile_yi = smopy.deg2num(
-            ext4326.yMax, ext4326.xMin, zoom)
-        br_tile_xi, br_tile_yi = smopy.deg2num(
-            ext4326.yMin, ext4326.xMax, zoom)
+        tl_tile_xi, tl_tile_yi = SRS.tileIndices(
+            ext4326.xMin, ext4326.yMax, zoom)
+        br_tile_xi, br_tile_yi = SRS.tileIndices(
+            ext4326.xMax, ext4326.yMin, zoom)
 
         return TileIndexBox(xi_start=tl_tile_xi, xi_stop=br_tile_xi, yi_start=tl_tile_yi, yi_stop=br_tile_yi, zoom=zoom)
 
@@ -1472,17 +1476,10 @@ class Extent(object):
         br_tile_xi = tb.xi_stop
         br_tile_yi = tb.yi_stop
 
-        tl_lat, tl_lon = smopy.num2deg(tl_tile_xi, tl_tile_yi, zoom)
-        br_lat, br_lon = smopy.num2deg(br_tile_xi + 1, br_tile_yi + 1, zoom)
-
-        coords3857 = SRS.xyTransform([(tl_lon, tl_lat), (br_lon, br_lat)],
-                                     fromSRS=SRS.EPSG4326, toSRS=SRS.EPSG3857, outputFormat='xy')
+        xMin, _, _, yMax = SRS.tileBounds(tl_tile_xi, tl_tile_yi, zoom)
+        _, yMin, xMax, _ = SRS.tileBounds(br_tile_xi, br_tile_yi, zoom)
 
-        ext = Extent(coords3857.x.min(),
-                     coords3857.y.min(),
-                     coords3857.x.max(),
-                     coords3857.y.max(),
-                     srs=SRS.EPSG3857)
+        ext = Extent(xMin, yMin, xMax, yMax, srs=SRS.EPSG3857)
 
         if return_index_box:
             return ext, tb
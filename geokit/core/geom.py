@@ -1,9 +1,11 @@
+import os
+import struct
 import numpy as np
-from osgeo import ogr, osr, gdal
+from osgeo import ogr, gdal
 import warnings
 import pandas as pd
-import smopy
-from collections import namedtuple
+from collections import namedtuple, defaultdict
+from multiprocessing import Pool, current_process
 
 from . import util as UTIL
 from . import srs as SRS
@@ -143,13 +145,7 @@ def tile(xi, yi, zoom):
     ogr.Geometry
 
     """
-    tl = smopy.num2deg(xi - 0.0, yi + 1.0, zoom)[::-1]
-    br = smopy.num2deg(xi + 1.0, yi - 0.0, zoom)[::-1]
-
-    o = SRS.xyTransform([tl, br], fromSRS=SRS.EPSG4326,
-                        toSRS=SRS.EPSG3857, outputFormat='xy')
-
-    return box(o.x.min(), o.y.min(), o.x.max(), o.y.max(), srs=SRS.EPSG3857)
+    return box(*SRS.tileBounds(xi, yi, zoom), srs=SRS.EPSG3857)
 
 def tileAt(x, y, zoom, srs):
     """Generates a box corresponding to a tile at the coordinates 'x' and 'y'
@@ -183,10 +179,60 @@ def tileAt(x, y, zoom, srs):
 Tile = namedtuple("Tile", "xi yi zoom")
 
 
+def _tilesIntersecting(geom, xi0, xi1, yi0, yi1, zoom, found):
+    """GeoKit internal
+
+    Recursively collects the tiles within the index range [xi0, xi1] x 
+    [yi0, yi1] which intersect the EPSG3857 geometry 'geom'. The tiles are
+    tested as a block first, so that only tiles near the geometry's edge need
+    to be tested one by one. Tile indices are appended to 'found' as arrays
+    """
+    xMin, yMin = SRS.tileBounds(xi0, yi1, zoom)[:2]
+    xMax, yMax = SRS.tileBounds(xi1, yi0, zoom)[2:]
+
+    # Quick reject by bounding box
+    gxMin, gxMax, gyMin, gyMax = geom.GetEnvelope()
+    if xMin > gxMax or xMax < gxMin or yMin > gyMax or yMax < gyMin:
+        return
+
+    block = box(xMin, yMin, xMax, yMax, srs=None)
+    if not geom.Intersects(block):
+        return
+
+    gtype = ogr.GT_Flatten(geom.GetGeometryType())
+    isPolygon = gtype == POLYGON or gtype == MULTIPOLYGON
+    if (xi0 == xi1 and yi0 == yi1) or (isPolygon and geom.Contains(block)):
+        xi, yi = np.meshgrid(np.arange(xi0, xi1 + 1),
+                             np.arange(yi0, yi1 + 1), indexing="ij")
+        found.append((xi.ravel(), yi.ravel()))
+        return
+
+    # Clip the geometry to the block so that sub-blocks test a smaller geometry
+    #  * GeometryCollections are avoided since GEOS predicates do not support them
+    clipped = geom.Intersection(block)
+    if not clipped is None and not clipped.IsEmpty() and \
+            ogr.GT_Flatten(clipped.GetGeometryType()) != ogr.wkbGeometryCollection:
+        geom = clipped
+
+    xMid = (xi0 + xi1) // 2
+    yMid = (yi0 + yi1) // 2
+    for xa, xb in ((xi0, xMid), (xMid + 1, xi1)):
+        if xa > xb:
+            continue
+        for ya, yb in ((yi0, yMid), (yMid + 1, yi1)):
+            if ya > yb:
+                continue
+            _tilesIntersecting(geom, xa, xb, ya, yb, zoom, found)
+
+
 def subTiles(geom, zoom, checkIntersect=True, asGeom=False):
     """
     Generate a collection of tiles which encompass the passed geometry.
 
+    * When checking for intersection, blocks of tiles which are entirely 
+      inside or outside of the geometry are resolved at once, so only the 
+      tiles along the geometry's edge are tested individually
+
     Parameters:
     -----------
     geom : ogr.Geometry
@@ -209,28 +255,34 @@ def subTiles(geom, zoom, checkIntersect=True, asGeom=False):
     If asGeom is True:  Generates Geometry objects
     """
     geom4326 = transform(geom, toSRS=SRS.EPSG4326)
-    if checkIntersect:
-        geom3857 = transform(geom, toSRS=SRS.EPSG3857)
 
     xmin, xmax, ymin, ymax = geom4326.GetEnvelope()
 
-    tl_xi, tl_yi = smopy.deg2num(ymax, xmin, zoom)
-    br_xi, br_yi = smopy.deg2num(ymin, xmax, zoom)
+    tl_xi, tl_yi = SRS.tileIndices(xmin, ymax, zoom)
+    br_xi, br_yi = SRS.tileIndices(xmax, ymin, zoom)
 
-    for xi in range(tl_xi, br_xi + 1):
-        for yi in range(tl_yi, br_yi + 1):
+    if checkIntersect:
+        geom3857 = transform(geom, toSRS=SRS.EPSG3857)
 
-            if checkIntersect or asGeom:
-                gtile = tile(xi, yi, zoom)
+        found = []
+        _tilesIntersecting(geom3857, tl_xi, br_xi, tl_yi, br_yi, zoom, found)
+        if len(found) == 0:
+            return
 
-            if checkIntersect:
-                if not geom3857.Intersects(gtile):
-                    continue
+        xi = np.concatenate([f[0] for f in found])
+        yi = np.concatenate([f[1] for f in found])
+        order = np.lexsort((yi, xi))
+        xi, yi = xi[order], yi[order]
+    else:
+        xi, yi = np.meshgrid(np.arange(tl_xi, br_xi + 1),
+                             np.arange(tl_yi, br_yi + 1), indexing="ij")
+        xi, yi = xi.ravel(), yi.ravel()
 
-            if asGeom:
-                yield gtile
-            else:
-                yield Tile(xi, yi, zoom)
+    if asGeom:
+        yield from boxes(SRS.tileBounds(xi, yi, zoom), srs=SRS.EPSG3857)
+    else:
+        for xi_, yi_ in zip(xi.tolist(), yi.tolist()):
+            yield Tile(xi_, yi_, zoom)
 
 
 def tileize(geom, zoom):
@@ -440,6 +492,411 @@ def extractVerticies(geom):
         out = out[:, :2]
     return out
 
+
+####################################################################
+# Bulk geometry construction and vertex extraction
+
+_POINT_WKB = np.dtype([("order", "u1"), ("type", "<u4"),
+                       ("x", "<f8"), ("y", "<f8")])
+_BOX_WKB = np.dtype([("order", "u1"), ("type", "<u4"), ("rings", "<u4"),
+                     ("count", "<u4"), ("xy", "<f8", (10,))])
+
+
+def _geomsFromWkb(buffer, itemSize, srs):
+    """GeoKit internal
+
+    Creates geometries from a contiguous buffer of equally sized WKB records
+    """
+    if not srs is None:
+        srs = SRS.loadSRS(srs)
+
+    output = []
+    for start in range(0, len(buffer), itemSize):
+        g = ogr.CreateGeometryFromWkb(buffer[start:start + itemSize])
+        if not srs is None:
+            g.AssignSpatialReference(srs)
+        output.append(g)
+    return output
+
+
+def points(x, y=None, srs=4326):
+    """Make many point geometries at once from coordinate arrays
+
+    * Much faster than calling geokit.geom.point() in a loop, since the WKB of
+      all points is generated in a single numpy operation
+
+    Parameters:
+    -----------
+    x : numpy.ndarray
+        The X coordinates of the points to create
+          * If 'y' is not given, an Nx2 array of (x,y) coordinates is expected
+
+    y : numpy.ndarray; optional
+        The Y coordinates of the points to create
+
+    srs : Anything acceptable to geokit.srs.loadSRS(); optional
+        The srs of the points to create
+
+    Returns:
+    --------
+    list -> [ogr.Geometry, ]
+
+    """
+    if y is None:
+        xy = np.asarray(x, dtype=np.float64)
+        if xy.ndim != 2 or xy.shape[1] < 2:
+            raise GeoKitGeomError("Expected an Nx2 array of coordinates")
+        x, y = xy[:, 0], xy[:, 1]
+    x = np.asarray(x, dtype=np.float64).ravel()
+    y = np.asarray(y, dtype=np.float64).ravel()
+    if x.shape != y.shape:
+        raise GeoKitGeomError("x and y coordinates must have the same size")
+
+    wkb = np.empty(x.size, dtype=_POINT_WKB)
+    wkb["order"] = 1
+    wkb["type"] = POINT
+    wkb["x"] = x
+    wkb["y"] = y
+
+    return _geomsFromWkb(wkb.tobytes(), _POINT_WKB.itemsize, srs)
+
+
+def boxes(bounds, srs=4326):
+    """Make many box geometries at once from an array of bounds
+
+    * Much faster than calling geokit.geom.box() in a loop, since the WKB of
+      all boxes is generated in a single numpy operation
+
+    Parameters:
+    -----------
+    bounds : numpy.ndarray
+        An Nx4 array of (xMin, yMin, xMax, yMax) bounds
+
+    srs : Anything acceptable to geokit.srs.loadSRS(); optional
+        The srs of the boxes to create
+
+    Returns:
+    --------
+    list -> [ogr.Geometry, ]
+
+    """
+    bounds = np.asarray(bounds, dtype=np.float64)
+    if bounds.ndim == 1:
+        bounds = bounds.reshape((1, -1))
+    if bounds.ndim != 2 or bounds.shape[1] != 4:
+        raise GeoKitGeomError("Expected an Nx4 array of bounds")
+
+    xMin, yMin, xMax, yMax = bounds.T
+    wkb = np.empty(bounds.shape[0], dtype=_BOX_WKB)
+    wkb["order"] = 1
+    wkb["type"] = POLYGON
+    wkb["rings"] = 1
+    wkb["count"] = 5
+    wkb["xy"] = np.column_stack([xMin, yMin, xMax, yMin, xMax,
+                                 yMax, xMin, yMax, xMin, yMin])
+
+    return _geomsFromWkb(wkb.tobytes(), _BOX_WKB.itemsize, srs)
+
+
+def polygons(rings, srs=4326, checkValid=True):
+    """Make many polygon geometries at once from coordinate arrays
+
+    * Much faster than calling geokit.geom.polygon() in a loop, since each 
+      ring is written into the polygon's WKB as a single block of memory
+
+    Parameters:
+    -----------
+    rings : list
+        The polygons to create. Each item can be either:
+          * An Nx2 numpy.ndarray (or [(x,y), ]) describing the outer ring
+          * A list of such arrays, where the first is the outer ring and the
+            rest are inner rings
+          * Rings are closed automatically if needed
+
+    srs : Anything acceptable to geokit.srs.loadSRS(); optional
+        The srs of the polygons to create
+
+    checkValid : bool; optional
+        If True, an error is raised when any of the created polygons is invalid
+
+    Returns:
+    --------
+    list -> [ogr.Geometry, ]
+
+    """
+    if not srs is None:
+        srs = SRS.loadSRS(srs)
+
+    output = []
+    for item in rings:
+        if isinstance(item, np.ndarray) and item.ndim == 2:
+            item = [item, ]
+        elif len(item) > 0 and np.ndim(item[0]) == 1:
+            item = [item, ]
+
+        wkb = [struct.pack("<BII", 1, POLYGON, len(item))]
+        for ring in item:
+            ring = np.ascontiguousarray(np.asarray(ring, dtype="<f8")[:, :2])
+            if ring.shape[0] > 0 and not (ring[0] == ring[-1]).all():
+                ring = np.concatenate([ring, ring[:1]])
+            wkb.append(struct.pack("<I", ring.shape[0]))
+            wkb.append(ring.tobytes())
+
+        g = ogr.CreateGeometryFromWkb(b"".join(wkb))
+        if g is None:
+            raise GeoKitGeomError("Failed to create polygon")
+        if checkValid and not g.IsValid():
+            raise GeoKitGeomError("Polygon is invalid")
+        if not srs is None:
+            g.AssignSpatialReference(srs)
+        output.append(g)
+
+    return output
+
+
+def _wkbVerticies(wkb, offset, coords):
+    """GeoKit internal
+
+    Parses the (possibly nested) geometry in the WKB buffer starting at 
+    'offset', appending the vertices of each point sequence to 'coords' as an 
+    (N,dim) array. Returns the offset after the geometry
+    """
+    order = "<" if wkb[offset] == 1 else ">"
+    code, = struct.unpack_from(order + "I", wkb, offset + 1)
+    offset += 5
+
+    # Resolve the extended (0x80000000) and ISO (1000s) dimension flags
+    hasZ = bool(code & 0x80000000)
+    hasM = bool(code & 0x40000000)
+    code &= 0x0FFFFFFF
+    iso = code // 1000
+    code %= 1000
+    if iso in (1, 3):
+        hasZ = True
+    if iso in (2, 3):
+        hasM = True
+    dim = 2 + hasZ + hasM
+    dtype = np.dtype(order + "f8")
+
+    def sequence(offset):
+        n, = struct.unpack_from(order + "I", wkb, offset)
+        offset += 4
+        pts = np.frombuffer(wkb, dtype=dtype, count=n * dim, offset=offset)
+        coords.append(pts.reshape((n, dim)))
+        return offset + 8 * n * dim
+
+    if code == POINT:
+        pts = np.frombuffer(wkb, dtype=dtype, count=dim, offset=offset)
+        coords.append(pts.reshape((1, dim)))
+        return offset + 8 * dim
+    elif code == LINE or code == ogr.wkbLinearRing:
+        return sequence(offset)
+    elif code == POLYGON:
+        nRings, = struct.unpack_from(order + "I", wkb, offset)
+        offset += 4
+        for _ in range(nRings):
+            offset = sequence(offset)
+        return offset
+    elif code in (MULTIPOINT, MULTILINE, MULTIPOLYGON, ogr.wkbGeometryCollection):
+        nGeoms, = struct.unpack_from(order + "I", wkb, offset)
+        offset += 4
+        for _ in range(nGeoms):
+            offset = _wkbVerticies(wkb, offset, coords)
+        return offset
+    else:
+        raise GeoKitGeomError(
+            "Cannot extract points from geometry type: %d" % code)
+
+
+def extractVerticiesBulk(geoms):
+    """Get all verticies found on many geometries at once
+
+    * Vertices are read directly from each geometry's WKB, rather than 
+      through OGR's per-ring point accessors
+    * Vertices are ordered in the same way as in extractVerticies()
+
+    Parameters:
+    -----------
+    geoms : [ogr.Geometry, ]
+        The geometries to extract vertices from
+
+    Returns:
+    --------
+    tuple -> (Nx2 numpy.ndarray of vertices, N numpy.ndarray of geometry indices)
+
+    """
+    if isinstance(geoms, ogr.Geometry):
+        geoms = [geoms, ]
+
+    coords = []
+    counts = []
+    for g in geoms:
+        wkb = bytes(g.ExportToWkb())
+        before = len(coords)
+        _wkbVerticies(wkb, 0, coords)
+        counts.append(sum(c.shape[0] for c in coords[before:]))
+
+    if len(coords) == 0:
+        return np.zeros((0, 2)), np.zeros(0, dtype=np.int64)
+
+    verticies = np.concatenate([c[:, :2] for c in coords]).astype(np.float64)
+    index = np.repeat(np.arange(len(counts)), counts)
+    return verticies, index
+
+
+def extractSegments(geoms):
+    """Get all straight line segments found on many geometries at once
+
+    * Segments connect the consecutive vertices of each line and ring
+    * Points are returned as segments of zero length
+    * Vertices are read directly from each geometry's WKB
+
+    Parameters:
+    -----------
+    geoms : [ogr.Geometry, ]
+        The geometries to extract segments from
+
+    Returns:
+    --------
+    tuple -> (Nx4 numpy.ndarray of (x0, y0, x1, y1) segments, 
+              N numpy.ndarray of geometry indices)
+
+    """
+    if isinstance(geoms, ogr.Geometry):
+        geoms = [geoms, ]
+
+    segments = []
+    counts = []
+    for g in geoms:
+        coords = []
+        _wkbVerticies(bytes(g.ExportToWkb()), 0, coords)
+
+        count = 0
+        for c in coords:
+            c = c[:, :2]
+            if c.shape[0] == 1:
+                seg = np.column_stack([c, c])
+            else:
+                seg = np.column_stack([c[:-1], c[1:]])
+            segments.append(seg)
+            count += seg.shape[0]
+        counts.append(count)
+
+    if len(segments) == 0:
+        return np.zeros((0, 4)), np.zeros(0, dtype=np.int64)
+
+    segments = np.concatenate(segments).astype(np.float64)
+    index = np.repeat(np.arange(len(counts)), counts)
+    return segments, index
+
+
+def _ringEdges(geom):
+    """GeoKit internal
+
+    Returns the edges of all rings in a (multi)polygon as an (N,4) array of
+    (x0, y0, x1, y1) rows. Horizontal edges are dropped since they can never
+    be crossed by a horizontal ray
+    """
+    gtype = ogr.GT_Flatten(geom.GetGeometryType())
+    if not gtype in (POLYGON, MULTIPOLYGON):
+        raise GeoKitGeomError("Geometry must be a POLYGON or MULTIPOLYGON")
+
+    edges, _ = extractSegments(geom)
+    return edges[edges[:, 1] != edges[:, 3]]
+
+
+_PIP_CHUNK = 1 << 22
+
+
+def _pointsInRings(edges, x, y):
+    """GeoKit internal
+
+    Even-odd ray crossing test of many points against the ring edges returned 
+    by _ringEdges(). Points are sorted by y so that the points within each 
+    edge's y-band are found with a binary search, and only those edge/point 
+    pairs are evaluated (in chunks of at most _PIP_CHUNK pairs)
+    """
+    order = np.argsort(y, kind="stable")
+    ys = y[order]
+    xs = x[order]
+
+    yLow = np.minimum(edges[:, 1], edges[:, 3])
+    yHigh = np.maximum(edges[:, 1], edges[:, 3])
+    starts = np.searchsorted(ys, yLow, side="left")
+    counts = np.searchsorted(ys, yHigh, side="left") - starts
+
+    keep = counts > 0
+    edges, starts, counts = edges[keep], starts[keep], counts[keep]
+
+    crossings = np.zeros(ys.size, dtype=np.int64)
+    ends = np.cumsum(counts)
+    e0 = 0
+    while e0 < edges.shape[0]:
+        base = ends[e0] - counts[e0]
+        e1 = max(int(np.searchsorted(ends, base + _PIP_CHUNK, side="right")), e0 + 1)
+
+        cnt = counts[e0:e1]
+        ei = np.repeat(np.arange(e0, e1), cnt)
+        pos = np.arange(ends[e1 - 1] - base) - (ends[ei] - counts[ei] - base) + starts[ei]
+
+        x0, y0, x1, y1 = edges[ei].T
+        py = ys[pos]
+        xCross = x0 + (py - y0) * (x1 - x0) / (y1 - y0)
+        crossings += np.bincount(pos[xs[pos] < xCross], minlength=ys.size)
+
+        e0 = e1
+
+    inside = np.zeros(ys.size, dtype=bool)
+    inside[order] = (crossings % 2) == 1
+    return inside
+
+
+def containsPoints(geom, xy, srs=None):
+    """Tests which of many points are contained by a polygon geometry
+
+    * Points are first filtered against the geometry's envelope, and the 
+      remaining points are tested all at once against the geometry's ring 
+      edges (even-odd rule), rather than with one Contains call per point
+    * Points lying exactly on the geometry's boundary may be counted as either
+      inside or outside
+
+    Parameters:
+    -----------
+    geom : ogr.Geometry
+        The POLYGON or MULTIPOLYGON geometry to test against
+
+    xy : numpy.ndarray
+        An Nx2 array of point coordinates
+
+    srs : Anything acceptable to geokit.srs.loadSRS(); optional
+        The srs of the point coordinates
+        * If not given, the points are assumed to be in the geometry's srs
+
+    Returns:
+    --------
+    numpy.ndarray of bools
+
+    """
+    xy = np.asarray(xy, dtype=np.float64).reshape((-1, 2))
+
+    gSRS = geom.GetSpatialReference()
+    if not srs is None and not gSRS is None:
+        srs = SRS.loadSRS(srs)
+        if not SRS.isSame(srs, gSRS):
+            xy = SRS.xyTransform(xy, fromSRS=srs, toSRS=gSRS,
+                                 outputFormat="array")[:, :2]
+
+    xMin, xMax, yMin, yMax = geom.GetEnvelope()
+    candidates = np.flatnonzero((xy[:, 0] >= xMin) & (xy[:, 0] <= xMax) &
+                                (xy[:, 1] >= yMin) & (xy[:, 1] <= yMax))
+
+    output = np.zeros(xy.shape[0], dtype=bool)
+    if candidates.size > 0:
+        output[candidates] = _pointsInRings(
+            _ringEdges(geom), xy[candidates, 0], xy[candidates, 1])
+    return output
+
+
 # 3
 # Make a geometry from a WKT string
 
@@ -486,7 +943,105 @@ def convertGeoJson(geojson, srs=3857):
 # Make a geometry from a matrix mask
 
 
-def polygonizeMatrix(matrix, bounds=None, srs=None, flat=False, shrink=True, _raw=False):
+def _polygonizeTile(matrix, bounds):
+    """GeoKit internal
+
+    Polygonizes a matrix tile and returns the resulting geometries as WKB along
+    with their values. Used to transport work to a process pool
+    """
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        res = polygonizeMatrix(matrix, bounds=bounds, shrink=False, _raw=True)
+
+    if res is None:
+        return [], []
+    geoms, values = res
+    return [bytes(g.ExportToWkb()) for g in geoms], values
+
+
+def _polygonizeTiled(matrix, tileSize, jobs):
+    """GeoKit internal
+
+    Polygonizes a matrix tile-by-tile, and merges the geometries which touch
+    tile seams. Geometries are created in pixel-index coordinates (with the 
+    y-axis pointing upwards), so that seam coordinates match exactly
+    """
+    rows, cols = matrix.shape
+
+    tiles = []
+    seams = []
+    for r0 in range(0, rows, tileSize):
+        r1 = min(rows, r0 + tileSize)
+        for c0 in range(0, cols, tileSize):
+            c1 = min(cols, c0 + tileSize)
+            tileMatrix = matrix[r0:r1, c0:c1]
+            if not tileMatrix.any():
+                continue
+            tiles.append((tileMatrix, (c0, rows - r1, c1, rows - r0)))
+            seams.append((c0 if c0 > 0 else None,
+                           c1 if c1 < cols else None,
+                           rows - r1 if r1 < rows else None,
+                           rows - r0 if r0 > 0 else None))
+
+    if jobs > 1 and len(tiles) > 1:
+        with Pool(jobs) as pool:
+            results = pool.starmap(_polygonizeTile, tiles)
+    else:
+        results = [_polygonizeTile(*t) for t in tiles]
+
+    # Sort geometries by whether they touch a tile seam
+    geoms = []
+    values = []
+    seamGeoms = defaultdict(list)
+    for (wkbs, tileValues), (left, right, bottom, top) in zip(results, seams):
+        for wkb, value in zip(wkbs, tileValues):
+            g = ogr.CreateGeometryFromWkb(wkb)
+            xMin, xMax, yMin, yMax = g.GetEnvelope()
+            if xMin == left or xMax == right or yMin == bottom or yMax == top:
+                seamGeoms[value].append(g)
+            else:
+                geoms.append(g)
+                values.append(value)
+
+    # Merge the seam geometries
+    for value, members in seamGeoms.items():
+        merged = flatten(members, checkValid=False) if len(
+            members) > 1 else members[0]
+
+        if ogr.GT_Flatten(merged.GetGeometryType()) == MULTIPOLYGON:
+            for i in range(merged.GetGeometryCount()):
+                geoms.append(merged.GetGeometryRef(i).Clone())
+                values.append(value)
+        else:
+            geoms.append(merged)
+            values.append(value)
+
+    return geoms, values
+
+
+def _scaleGeoms(geoms, xMin, yMin, pixelWidth, pixelHeight, srs):
+    """GeoKit internal
+
+    Converts geometries from pixel-index coordinates to the given bounds
+    """
+    output = []
+    for g in geoms:
+        coords = []
+        layout = _vertexLayout(g, coords)
+        coords = np.vstack(coords)[:, :2]
+        coords = np.column_stack([xMin + coords[:, 0] * pixelWidth,
+                                  yMin + coords[:, 1] * pixelHeight])
+
+        wkb = []
+        _layoutToWkb(layout, np.ascontiguousarray(coords, dtype="<f8"), 0, wkb)
+        g = ogr.CreateGeometryFromWkb(b"".join(wkb))
+        if not srs is None:
+            g.AssignSpatialReference(srs)
+        output.append(g)
+    return output
+
+
+def polygonizeMatrix(matrix, bounds=None, srs=None, flat=False, shrink=True, tileSize=None, jobs=1, _raw=False):
     """Create a geometry set from a matrix of integer values
 
     Each unique-valued group of pixels will be converted to a geometry
@@ -521,6 +1076,18 @@ def polygonizeMatrix(matrix, bounds=None, srs=None, flat=False, shrink=True, _ra
           * Generally this should be left as True unless it is ABSOLUTELY 
             necessary to maintain the same area
 
+    tileSize : int; optional
+        If given, the matrix is polygonized in tiles of (tileSize x tileSize)
+        pixels, after which the geometries which touch the tile seams are merged
+          * This uses much less memory for very large matrices
+          * The order of the resulting geometries differs from the untiled 
+            procedure
+
+    jobs : int; optional
+        The number of processes to use when polygonizing tiles and shrinking
+        the resulting geometries
+          * Only used when 'tileSize' is given
+
     Returns:
     --------
     pandas.DataFrame -> With columns:
@@ -562,6 +1129,23 @@ def polygonizeMatrix(matrix, bounds=None, srs=None, flat=False, shrink=True, _ra
     if not srs is None:
         srs = SRS.loadSRS(srs)
 
+    # Polygonize in tiles, maybe
+    if not tileSize is None and (matrix.shape[0] > tileSize or matrix.shape[1] > tileSize):
+        geoms, rid = _polygonizeTiled(matrix, int(tileSize), jobs)
+
+        if len(geoms) == 0:
+            msg = "No features in created in temporary layer"
+            warnings.warn(msg, UserWarning)
+            return
+
+        geoms = _scaleGeoms(geoms, xMin, yMin, pixelWidth, pixelHeight, srs)
+
+        if shrink:
+            shrinkFactor = -0.00001 * (xMax - xMin) / matrix.shape[1]
+            geoms = bufferGeoms(geoms, shrinkFactor, jobs=jobs)
+
+        return _polygonizeResult(geoms, rid, flat, _raw)
+
     # Make a raster dataset and pull the band/maskBand objects
 
     # used 'round' instead of 'int' because this matched GDAL behavior better
@@ -632,8 +1216,21 @@ def polygonizeMatrix(matrix, bounds=None, srs=None, flat=False, shrink=True, _ra
     if shrink:
         # Compute shrink factor
         shrinkFactor = -0.00001 * (xMax - xMin) / matrix.shape[1]
-        geoms = [g.Buffer(shrinkFactor) for g in geoms]
+        geoms = bufferGeoms(geoms, shrinkFactor, jobs=1)
+
+    # Cleanup
+    vecLyr = None
+    vecDS = None
+    maskBand = None
+    rasBand = None
+    raster = None
+
+    # Done!
+    return _polygonizeResult(geoms, rid, flat, _raw)
+
 
+def _polygonizeResult(geoms, rid, flat, _raw):
+    """GeoKit internal. Arranges the output of polygonizeMatrix"""
     # Do flatten, maybe
     if flat:
         geoms = np.array(geoms)
@@ -650,21 +1247,13 @@ def polygonizeMatrix(matrix, bounds=None, srs=None, flat=False, shrink=True, _ra
         finalGeoms = geoms
         finalRID = rid
 
-    # Cleanup
-    vecLyr = None
-    vecDS = None
-    maskBand = None
-    rasBand = None
-    raster = None
-
-    # Done!
     if _raw:
         return finalGeoms, finalRID
     else:
         return pd.DataFrame(dict(geom=finalGeoms, value=finalRID))
 
 
-def polygonizeMask(mask, bounds=None, srs=None, flat=True, shrink=True):
+def polygonizeMask(mask, bounds=None, srs=None, flat=True, shrink=True, tileSize=None, jobs=1):
     """Create a geometry set from a matrix mask
 
     Each True-valued group of pixels will be converted to a geometry
@@ -698,6 +1287,14 @@ def polygonizeMask(mask, bounds=None, srs=None, flat=True, shrink=True):
           * Generally this should be left as True unless it is ABSOLUTELY 
             neccessary to maintain the same area
 
+    tileSize : int; optional
+        If given, the mask is polygonized in tiles of (tileSize x tileSize) 
+        pixels
+          * See geokit.geom.polygonizeMatrix for more info
+
+    jobs : int; optional
+        The number of processes to use when polygonizing in tiles
+
     Returns:
     --------
     If 'flat' is True: ogr.Geometry
@@ -713,7 +1310,7 @@ def polygonizeMask(mask, bounds=None, srs=None, flat=True, shrink=True):
 
     # Do vectorization
     result = polygonizeMatrix(
-        matrix=mask, bounds=bounds, srs=srs, flat=flat, shrink=shrink, _raw=True)[0]
+        matrix=mask, bounds=bounds, srs=srs, flat=flat, shrink=shrink, tileSize=tileSize, jobs=jobs, _raw=True)[0]
     if flat:
         result = result[0]
 
@@ -723,6 +1320,112 @@ def polygonizeMask(mask, bounds=None, srs=None, flat=True, shrink=True):
 # geometry transformer
 
 
+_BULK_TYPES = {POINT, MULTIPOINT, LINE, MULTILINE, POLYGON, MULTIPOLYGON}
+
+
+def _vertexLayout(g, coords):
+    """GeoKit internal
+
+    Describes the structure of a geometry so that it can be rebuilt from its
+    vertices. The geometry's vertices are appended to 'coords' as (N,3) arrays
+
+    * Returns None if the geometry cannot be described
+    """
+    gtype = ogr.GT_Flatten(g.GetGeometryType())
+    if not gtype in _BULK_TYPES or g.IsEmpty():
+        return None
+
+    def ring(r):
+        pts = np.array(r.GetPoints(), dtype=np.float64)
+        if pts.shape[1] == 2:
+            pts = np.column_stack([pts, np.zeros(pts.shape[0])])
+        coords.append(pts)
+        return pts.shape[0]
+
+    if gtype == POINT:
+        coords.append(np.array([g.GetPoint()], dtype=np.float64))
+        return (gtype, None)
+    elif gtype == LINE:
+        return (gtype, ring(g))
+    elif gtype == POLYGON:
+        return (gtype, [ring(g.GetGeometryRef(i)) for i in range(g.GetGeometryCount())])
+    else:
+        subs = []
+        for i in range(g.GetGeometryCount()):
+            sub = _vertexLayout(g.GetGeometryRef(i), coords)
+            if sub is None:
+                return None
+            subs.append(sub)
+        return (gtype, subs)
+
+
+def _layoutToWkb(layout, coords, i, out):
+    """GeoKit internal
+
+    Writes the WKB of a geometry described by _vertexLayout() into 'out', using
+    the vertices in 'coords' starting at index 'i'. Returns the next index
+    """
+    gtype, sub = layout
+    code = gtype | (0x80000000 if coords.shape[1] == 3 else 0)  # wkb25DBit
+
+    if gtype == POINT:
+        out.append(struct.pack("<BI", 1, code))
+        out.append(coords[i].tobytes())
+        return i + 1
+    elif gtype == LINE:
+        out.append(struct.pack("<BII", 1, code, sub))
+        out.append(coords[i:i + sub].tobytes())
+        return i + sub
+    elif gtype == POLYGON:
+        out.append(struct.pack("<BII", 1, code, len(sub)))
+        for n in sub:
+            out.append(struct.pack("<I", n))
+            out.append(coords[i:i + n].tobytes())
+            i += n
+        return i
+    else:
+        out.append(struct.pack("<BII", 1, code, len(sub)))
+        for s in sub:
+            i = _layoutToWkb(s, coords, i, out)
+        return i
+
+
+def _bulkTransform(geoms, trx, toSRS):
+    """GeoKit internal
+
+    Transforms the vertices of all geometries with a single TransformPoints
+    call, and rebuilds the geometries from WKB
+
+    * Returns None if any of the geometries cannot be handled this way
+    """
+    coords = []
+    layouts = []
+    for g in geoms:
+        layout = _vertexLayout(g, coords)
+        if layout is None:
+            return None
+        layouts.append((layout, g.GetCoordinateDimension() == 3))
+
+    allCoords = np.vstack(coords)
+    newCoords = np.array(trx.TransformPoints(allCoords), dtype=np.float64)
+    if not np.isfinite(newCoords[:, :2]).all():
+        raise GeoKitGeomError("Errors in geometry transformations")
+
+    coords2D = np.ascontiguousarray(newCoords[:, :2], dtype="<f8")
+    coords3D = np.ascontiguousarray(newCoords[:, :3], dtype="<f8")
+
+    output = []
+    i = 0
+    for layout, hasZ in layouts:
+        wkb = []
+        i = _layoutToWkb(layout, coords3D if hasZ else coords2D, i, wkb)
+        g = ogr.CreateGeometryFromWkb(b"".join(wkb))
+        g.AssignSpatialReference(toSRS)
+        output.append(g)
+
+    return output
+
+
 def transform(geoms, toSRS='europe_m', fromSRS=None, segment=None):
     """Transform a geometry, or a list of geometries, from one SRS to another
 
@@ -783,16 +1486,25 @@ def transform(geoms, toSRS='europe_m', fromSRS=None, segment=None):
     toSRS = SRS.loadSRS(toSRS)
 
     # make a transformer
-    trx = osr.CoordinateTransformation(fromSRS, toSRS)
+    trx = SRS.loadTransformation(fromSRS, toSRS)
 
     # Do transformation
-    geoms = [g.Clone() for g in geoms]
     if not segment is None:
+        geoms = [g.Clone() for g in geoms]
         [g.Segmentize(segment) for g in geoms]
 
-    r = [g.Transform(trx) for g in geoms]
-    if sum(r) > 0:  # check fro errors
-        raise GeoKitGeomError("Errors in geometry transformations")
+    # Try transforming all vertices at once. Otherwise, transform each geometry
+    # individually
+    transformed = _bulkTransform(geoms, trx, toSRS) if len(geoms) > 1 else None
+
+    if transformed is None:
+        geoms = [g.Clone() for g in geoms] if segment is None else geoms
+
+        r = [g.Transform(trx) for g in geoms]
+        if sum(r) > 0:  # check fro errors
+            raise GeoKitGeomError("Errors in geometry transformations")
+    else:
+        geoms = transformed
 
     # Done!
     if returnSingle:
@@ -817,25 +1529,203 @@ def boundsToBounds(bounds, boundsSRS, outputSRS):
 # Flatten a list of geometries
 
 
-def flatten(geoms):
-    """Flatten a list of geometries into a single geometry object
+####################################################################
+# Batch geometry operations
+_PARALLEL_MIN_GEOMS = 2000
+_PARALLEL_CHUNKS_PER_JOB = 4
+
+
+def _applyOperations(operations, wkbs):
+    """GeoKit internal
 
-    Combine geometries by iteratively union-ing neighbors (according to index)
-     * example, given a list of geometries (A,B,C,D,E,F,G,H,I,J):
-          [ A  B  C  D  E  F  G  H  I  J ]
-          [  AB    CD    EF    GH    IJ  ]
-          [    ABCD        EFGH      IJ  ]
-          [        ABCDEFGH          IJ  ]
-          [               ABCDEFGHIJ     ]  <- This becomes the resulting geometry  
+    Applies a list of (ogr.Geometry method name, args) operations to a chunk
+    of WKB geometries, and returns the results as WKB. Used to transport work 
+    to a process pool
+    """
+    results = []
+    for wkb in wkbs:
+        g = ogr.CreateGeometryFromWkb(wkb)
+        for name, args in operations:
+            g = getattr(g, name)(*args)
+        results.append(None if g is None else bytes(g.ExportToWkb()))
+    return results
+
+
+def applyOperations(geoms, operations, jobs=1):
+    """Apply a sequence of ogr.Geometry operations to each geometry in a list,
+    possibly in parallel
+
+    * When run in parallel, geometries are sent to a pool of processes as 
+      chunks of WKB, and the results are returned in the original order
+    * Chunks are made to have roughly equal amounts of WKB data, rather than
+      equal numbers of geometries
+    * Small inputs are always processed serially
+    * Inside a daemonic process (e.g. a worker of another multiprocessing.Pool)
+      geometries are always processed serially
+
+    Parameters:
+    -----------
+    geoms : [ogr.Geometry, ]
+        The geometries to operate on
+        * All geometries should share the same srs
+
+    operations : [(str, tuple), ]
+        The operations to apply, in order, as pairs of an ogr.Geometry method 
+        name and its arguments
+        * Ex. [("Simplify", (10,)), ("Buffer", (200,))]
+        * Each method must return a new ogr.Geometry
+
+    jobs : int; optional
+        The number of processes to use
+        * If None, the number of CPUs is used
+        * Fewer than 2000 geometries are always processed serially
+
+    Returns:
+    --------
+    [ogr.Geometry, ]
+
+    """
+    geoms = list(geoms)
+    operations = [(name, tuple(args)) for name, args in operations]
+
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+
+    # Serial fallback. Daemonic processes are not allowed to have children
+    if jobs <= 1 or len(geoms) < _PARALLEL_MIN_GEOMS or current_process().daemon:
+        output = []
+        for g in geoms:
+            for name, args in operations:
+                g = getattr(g, name)(*args)
+            output.append(g)
+        return output
+
+    # Make chunks of roughly equal WKB size
+    srs = geoms[0].GetSpatialReference()
+    wkbs = [bytes(g.ExportToWkb()) for g in geoms]
+
+    sizes = np.cumsum([len(w) for w in wkbs])
+    chunkCount = jobs * _PARALLEL_CHUNKS_PER_JOB
+    breaks = np.searchsorted(sizes, np.linspace(0, sizes[-1], chunkCount + 1)[1:-1])
+    breaks = np.unique(np.concatenate([[0], breaks, [len(wkbs)]]))
+    chunks = [(operations, wkbs[s:e]) for s, e in zip(breaks[:-1], breaks[1:])]
+
+    with Pool(jobs) as pool:
+        results = pool.starmap(_applyOperations, chunks)
+
+    output = []
+    for chunk in results:
+        for wkb in chunk:
+            if wkb is None:
+                output.append(None)
+            else:
+                g = ogr.CreateGeometryFromWkb(wkb)
+                if not srs is None:
+                    g.AssignSpatialReference(srs)
+                output.append(g)
+    return output
+
+
+def bufferGeoms(geoms, buffer, simplification=None, jobs=1):
+    """Buffer each geometry in a list, possibly in parallel
+
+    * See geokit.geom.applyOperations for more info
+
+    Parameters:
+    -----------
+    geoms : [ogr.Geometry, ]
+        The geometries to buffer
+
+    buffer : numeric
+        The buffer distance, in units of the geometries' srs
+
+    simplification : numeric; optional
+        If given, geometries are simplified (using ogr.Geometry.Simplify) with
+        this tolerance before being buffered
+
+    jobs : int; optional
+        The number of processes to use
+        * If None, the number of CPUs is used
+
+    Returns:
+    --------
+    [ogr.Geometry, ]
+
+    """
+    operations = []
+    if not simplification is None:
+        operations.append(("Simplify", (simplification, )))
+    operations.append(("Buffer", (buffer, )))
+    return applyOperations(geoms, operations, jobs=jobs)
+
+
+def simplifyGeoms(geoms, tolerance, jobs=1):
+    """Simplify each geometry in a list, possibly in parallel
+
+    * See geokit.geom.applyOperations for more info
+
+    Parameters:
+    -----------
+    geoms : [ogr.Geometry, ]
+        The geometries to simplify
+
+    tolerance : numeric
+        The simplification tolerance, in units of the geometries' srs
+
+    jobs : int; optional
+        The number of processes to use
+        * If None, the number of CPUs is used
+
+    Returns:
+    --------
+    [ogr.Geometry, ]
+
+    """
+    return applyOperations(geoms, [("Simplify", (tolerance, ))], jobs=jobs)
+
+
+def flatten(geoms, method="cascaded", grid=None, checkValid=True):
+    """Flatten a list of geometries into a single geometry object
 
     Example:
     --------
         * A list of Polygons/Multipolygons will become a single Multipolygon
         * A list of Linestrings/MultiLinestrings will become a single MultiLinestring
 
+    Parameters:
+    -----------
+    geoms : [ogr.Geometry, ]
+        The geometries to combine
+
+    method : str; optional
+        The union method to use
+        * If 'cascaded', all (multi)polygons are collected into a single 
+          collection and merged at once using ogr.Geometry.UnionCascaded
+          - Other geometry types are merged with ogr.Geometry.UnaryUnion, when
+            the installed GDAL version supports it
+        * If 'pairwise', geometries are combined by iteratively union-ing 
+          neighbors (according to index)
+          - example, given a list of geometries (A,B,C,D,E,F,G,H,I,J):
+              [ A  B  C  D  E  F  G  H  I  J ]
+              [  AB    CD    EF    GH    IJ  ]
+              [    ABCD        EFGH      IJ  ]
+              [        ABCDEFGH          IJ  ]
+              [               ABCDEFGHIJ     ]  <- This becomes the resulting geometry  
+        * 'cascaded' falls back to 'pairwise' when it cannot be applied
+
+    grid : int; optional
+        If given, the geometries are first partitioned into a (grid x grid) 
+        spatial grid according to their envelope centers, and each grid cell is
+        merged individually before merging the results
+        * Only used with the 'cascaded' method
+        * Useful for very large numbers of geometries
+
+    checkValid : bool; optional
+        If True, the input geometries are checked once for validity, and a 
+        warning is issued if any invalid geometries are found
+
     """
     if not isinstance(geoms, list):
-        geoms = list(geoms)
         try:  # geoms is not a list, but it might be iterable
             geoms = list(geoms)
         except:
@@ -844,19 +1734,54 @@ def flatten(geoms):
     if len(geoms) == 0:
         return None
 
+    if checkValid:
+        if not all([g.IsValid() for g in geoms]):
+            warnings.warn(
+                "WARNING: Invalid Geometry encountered", UserWarning)
+
+    if len(geoms) == 1:
+        return geoms[0].Clone()
+
+    if method == "cascaded":
+        srs = geoms[0].GetSpatialReference()
+        if grid is None or grid <= 1:
+            result = _unionCascaded(geoms)
+        else:
+            envs = np.array([g.GetEnvelope() for g in geoms])
+            cx = (envs[:, 0] + envs[:, 1]) / 2
+            cy = (envs[:, 2] + envs[:, 3]) / 2
+
+            xi = np.floor((cx - cx.min()) / ((cx.max() - cx.min()) / grid + 1e-12)).astype(int)
+            yi = np.floor((cy - cy.min()) / ((cy.max() - cy.min()) / grid + 1e-12)).astype(int)
+            cell = np.minimum(xi, grid - 1) * grid + np.minimum(yi, grid - 1)
+
+            # Merge each grid cell locally, and then merge the results
+            parts = []
+            for c in np.unique(cell):
+                members = [geoms[i] for i in np.argwhere(cell == c)[:, 0]]
+                parts.append(_unionCascaded(members)
+                             if len(members) > 1 else members[0])
+
+            if any([p is None for p in parts]):
+                result = None
+            elif len(parts) > 1:
+                result = _unionCascaded(parts)
+            else:
+                result = parts[0].Clone()
+
+        if not result is None:
+            if not srs is None:
+                result.AssignSpatialReference(srs)
+            return result
+
+    elif method != "pairwise":
+        raise GeoKitGeomError("method not understood: " + str(method))
+
     # Begin flattening
     while(len(geoms) > 1):
         newGeoms = []
         for gi in range(0, len(geoms), 2):
-
             try:
-                if not geoms[gi].IsValid():
-                    warnings.warn(
-                        "WARNING: Invalid Geometry encountered", UserWarning)
-                if not geoms[gi + 1].IsValid():
-                    warnings.warn(
-                        "WARNING: Invalid Geometry encountered", UserWarning)
-
                 newGeoms.append(geoms[gi].Union(geoms[gi + 1]))
             except IndexError:  # should only occur when length of geoms is odd
                 newGeoms.append(geoms[gi])
@@ -865,6 +1790,34 @@ def flatten(geoms):
     return geoms[0]
 
 
+def _unionCascaded(geoms):
+    """GeoKit internal
+
+    Merge geometries all at once. Returns None if this is not possible for the
+    given geometries
+    """
+    types = set([ogr.GT_Flatten(g.GetGeometryType()) for g in geoms])
+
+    if types.issubset({POLYGON, MULTIPOLYGON}):
+        collection = ogr.Geometry(MULTIPOLYGON)
+        for g in geoms:
+            if ogr.GT_Flatten(g.GetGeometryType()) == POLYGON:
+                collection.AddGeometry(g)
+            else:
+                for i in range(g.GetGeometryCount()):
+                    collection.AddGeometry(g.GetGeometryRef(i))
+        return collection.UnionCascaded()
+
+    elif hasattr(ogr.Geometry, "UnaryUnion"):
+        collection = ogr.Geometry(ogr.wkbGeometryCollection)
+        for g in geoms:
+            collection.AddGeometry(g)
+        return collection.UnaryUnion()
+
+    else:
+        return None
+
+
 ##########################################################################
 # Drawing functions
 def drawPoint(g, plotargs, ax, colorVal=None):
@@ -971,7 +1924,142 @@ def drawMultiPolygon(g, plotargs, ax, colorVal=None):
     return h
 
 
-def drawGeoms(geoms, srs=4326, ax=None, simplificationFactor=5000, colorBy=None, figsize=(12, 12), xlim=None, ylim=None, fontsize=16, hideAxis=False, cbarPadding=0.01, cbarTitle=None, vmin=None, vmax=None, cmap="viridis", cbar=True, cbax=None, cbargs=None, leftMargin=0.01, rightMargin=0.01, topMargin=0.01, bottomMargin=0.01, **mplArgs):
+_DRAW_BULK_MIN = 500
+
+
+def _decimateRings(rings, owners, cellSize, minPoints):
+    """GeoKit internal
+
+    Drops consecutive vertices of each ring which fall into the same cell of a
+    grid with the given cell size. Rings left with fewer than 'minPoints'
+    vertices are removed. Returns the kept rings and their owners
+    """
+    owners = np.array([o for o, r in zip(owners, rings) if r.shape[0] > 0],
+                      dtype=np.int64)
+    rings = [np.asarray(r[:, :2], dtype=np.float64)
+             for r in rings if r.shape[0] > 0]
+    if cellSize is None or cellSize <= 0 or len(rings) == 0:
+        return rings, owners
+
+    counts = np.array([r.shape[0] for r in rings], dtype=np.int64)
+
+    coords = np.concatenate(rings)
+    starts = np.cumsum(counts) - counts
+    cell = np.floor(coords / cellSize)
+
+    keep = np.ones(coords.shape[0], dtype=bool)
+    keep[1:] = (cell[1:] != cell[:-1]).any(axis=1)
+    keep[starts] = True
+    keep[starts + counts - 1] = True  # keeps rings closed
+
+    ringIds = np.repeat(np.arange(len(rings)), counts)
+    keptCounts = np.bincount(ringIds[keep], minlength=len(rings))
+    pieces = np.split(coords[keep], np.cumsum(keptCounts)[:-1])
+
+    valid = keptCounts >= minPoints
+    return [p for p, v in zip(pieces, valid) if v], owners[valid]
+
+
+def _drawGeomsBulk(geoms, ax, colorVals, simplificationFactor, xlim, ylim, mplArgs):
+    """GeoKit internal
+
+    Draws all geometries with one matplotlib collection per geometry kind, and
+    returns the created handles
+    """
+    from matplotlib.collections import PolyCollection, LineCollection
+    from matplotlib.path import Path
+
+    # Read the vertices of all geometries from their WKB, grouped by how they
+    # are drawn
+    groups = dict(polygon=([], []), line=([], []), point=([], []))
+    for gi, g in enumerate(geoms):
+        gtype = ogr.GT_Flatten(g.GetGeometryType())
+        if gtype == POLYGON or gtype == MULTIPOLYGON:
+            rings, owners = groups["polygon"]
+        elif gtype == LINE or gtype == MULTILINE or gtype == ogr.wkbLinearRing:
+            rings, owners = groups["line"]
+        elif gtype == POINT or gtype == MULTIPOINT:
+            rings, owners = groups["point"]
+        else:
+            msg = "Could not draw geometry of type: " + g.GetGeometryName()
+            warnings.warn(msg, UserWarning)
+            continue
+        if g.IsEmpty():
+            continue
+
+        count = len(rings)
+        _wkbVerticies(bytes(g.ExportToWkb()), 0, rings)
+        owners.extend([gi, ] * (len(rings) - count))
+
+    # Determine the decimation resolution
+    cellSize = None
+    allRings = groups["polygon"][0] + groups["line"][0]
+    if not simplificationFactor is None and len(allRings) > 0:
+        if xlim is None or ylim is None:
+            coords = np.concatenate([r[:, :2] for r in allRings])
+            xMin, yMin = coords.min(axis=0)
+            xMax, yMax = coords.max(axis=0)
+        if not xlim is None:
+            xMin, xMax = xlim
+        if not ylim is None:
+            yMin, yMax = ylim
+
+        cellSize = max(xMax - xMin, yMax - yMin) / simplificationFactor
+
+    h = []
+
+    # Draw polygons as one compound path per geometry
+    rings, owners = _decimateRings(*groups["polygon"], cellSize, 4)
+    if len(rings) > 0:
+        counts = np.array([r.shape[0] for r in rings])
+        ends = np.cumsum(counts)
+        coords = np.concatenate(rings)
+        codes = np.full(coords.shape[0], Path.LINETO, dtype=Path.code_type)
+        codes[ends - counts] = Path.MOVETO
+        codes[ends - 1] = Path.CLOSEPOLY
+
+        first = np.concatenate([[True], owners[1:] != owners[:-1]])
+        breaks = (ends - counts)[first][1:]
+
+        kwargs = dict(fc="#D9E9FF", ec="k", linestyle='-')
+        if not colorVals is None:
+            kwargs["fc"] = [colorVals[i] for i in owners[first]]
+        kwargs.update(mplArgs)
+
+        collection = PolyCollection([], **kwargs)
+        collection.set_verts_and_codes(np.split(coords, breaks),
+                                       np.split(codes, breaks))
+        h.append(ax.add_collection(collection))
+
+    # Draw lines
+    rings, owners = _decimateRings(*groups["line"], cellSize, 2)
+    if len(rings) > 0:
+        kwargs = dict(color='k', linestyle='-')
+        if not colorVals is None:
+            kwargs["color"] = [colorVals[i] for i in owners]
+        kwargs.update(mplArgs)
+
+        h.append(ax.add_collection(LineCollection(rings, **kwargs)))
+
+    # Draw points
+    rings, owners = groups["point"]
+    if len(rings) > 0:
+        counts = [r.shape[0] for r in rings]
+        coords = np.concatenate([r[:, :2] for r in rings])
+        if colorVals is None:
+            kwargs = dict(marker='o', color='#C32148', linestyle='None')
+            kwargs.update(mplArgs)
+            h.extend(ax.plot(coords[:, 0], coords[:, 1], **kwargs))
+        else:
+            kwargs = dict(marker='o')
+            kwargs.update(mplArgs)
+            colors = [colorVals[i] for i in np.repeat(owners, counts)]
+            h.append(ax.scatter(coords[:, 0], coords[:, 1], c=colors, **kwargs))
+
+    return h
+
+
+def drawGeoms(geoms, srs=4326, ax=None, simplificationFactor=5000, colorBy=None, figsize=(12, 12), xlim=None, ylim=None, fontsize=16, hideAxis=False, cbarPadding=0.01, cbarTitle=None, vmin=None, vmax=None, cmap="viridis", cbar=True, cbax=None, cbargs=None, leftMargin=0.01, rightMargin=0.01, topMargin=0.01, bottomMargin=0.01, bulk=None, **mplArgs):
     """Draw geometries onto a matplotlib figure
 
     * Each geometry type is displayed as an appropriate plotting type
@@ -980,6 +2068,9 @@ def drawGeoms(geoms, srs=4326, ax=None, simplificationFactor=5000, colorBy=None,
         -> Polygons/ MultiPolygons are displayed as patches using the descartes 
            library
     * Each geometry can be given its own set of matplotlib plotting parameters
+    * Large collections of geometries are drawn in bulk: all polygons are drawn
+      as a single PolyCollection, all lines as a single LineCollection, and all
+      points with a single plot call
 
     Notes:
     ------
@@ -1016,6 +2107,8 @@ def drawGeoms(geoms, srs=4326, ax=None, simplificationFactor=5000, colorBy=None,
         as the number of verticies allowed in either the X or Y dimension across
         the figure
           * A higher value means a more detailed plot, but may take longer to draw
+          * When drawing in bulk, consecutive vertices which fall into the same
+            cell of a grid with this resolution are dropped instead
 
     colorBy : str; optional
         The column in the geoms DataFrame to color by
@@ -1088,6 +2181,15 @@ def drawGeoms(geoms, srs=4326, ax=None, simplificationFactor=5000, colorBy=None,
         Additional margin to add to the left of the figure
           * Before using this, try adjusting the 'figsize'
 
+    bulk : bool; optional
+        Whether to draw all geometries in bulk, using one matplotlib collection
+        per geometry kind
+          * If not given, bulk drawing is used when at least 500 geometries are
+            given and no per-geometry plotting arguments are found
+          * Per-geometry plotting arguments cannot be used in bulk drawing
+          * Geometry handles cannot be separated when drawing in bulk, so the
+            created collections are returned instead
+
     **mplArgs
         All other keyword arguments are passed on to the plotting functions called
         for each geometry
@@ -1100,6 +2202,7 @@ def drawGeoms(geoms, srs=4326, ax=None, simplificationFactor=5000, colorBy=None,
        'ax' -> The map axis
        'handles' -> All geometry handles which were created in the order they were 
                     drawn
+                    * When drawing in bulk, the created collections
        'cbar' -> The colorbar handle if it was drawn
 
     """
@@ -1175,15 +2278,30 @@ def drawGeoms(geoms, srs=4326, ax=None, simplificationFactor=5000, colorBy=None,
     # Check Geometry SRS
     if not srs is None:
         srs = SRS.loadSRS(srs)
+        toTransform = defaultdict(list)
         for gi, g in enumerate(geoms):
             gsrs = g.GetSpatialReference()
             if gsrs is None:
                 continue  # Skip it if we don't know it...
-            if not gsrs.IsSame(srs):
-                geoms[gi] = transform(geoms[gi], srs)
+            if not SRS.isSame(gsrs, srs):
+                toTransform[SRS.srsKey(gsrs)].append(gi)
+
+        for indices in toTransform.values():  # transform together by source srs
+            newGeoms = transform([geoms[gi] for gi in indices], srs)
+            if isinstance(newGeoms, ogr.Geometry):
+                newGeoms = [newGeoms, ]
+            for gi, g in zip(indices, newGeoms):
+                geoms[gi] = g
+
+    # Choose the drawing method
+    if bulk is None:
+        bulk = pargs is None and len(geoms) >= _DRAW_BULK_MIN
+    elif bulk and not pargs is None:
+        raise GeoKitGeomError(
+            "Per-geometry plotting arguments cannot be used when drawing in bulk")
 
     # Apply simplifications if required
-    if not simplificationFactor is None:
+    if not simplificationFactor is None and not bulk:
         if xlim is None or ylim is None:
             xMin, yMin, xMax, yMax = 1e100, 1e100, -1e100, -1e100
             for g in geoms:
@@ -1240,38 +2358,46 @@ def drawGeoms(geoms, srs=4326, ax=None, simplificationFactor=5000, colorBy=None,
     # make patches
     h = []
 
-    for gi, g in enumerate(geoms):
-        if not pargs is None:
-            s = [not v is None for v in pargs.iloc[gi]]
-            plotargs = pargs.iloc[gi, s].to_dict()
-        else:
-            plotargs = dict()
-        plotargs.update(mplArgs)
+    if bulk:
+        h = _drawGeomsBulk(geoms, ax,
+                           colorVals=None if colorBy is None else _colorVals,
+                           simplificationFactor=simplificationFactor,
+                           xlim=xlim, ylim=ylim, mplArgs=mplArgs)
+        if not newAxis:
+            ax.autoscale_view()
+    else:
+        for gi, g in enumerate(geoms):
+            if not pargs is None:
+                s = [not v is None for v in pargs.iloc[gi]]
+                plotargs = pargs.iloc[gi, s].to_dict()
+            else:
+                plotargs = dict()
+            plotargs.update(mplArgs)
 
-        if not colorBy is None:
-            colorVal = _colorVals[gi]
-        else:
-            colorVal = None
-
-        # Determine type
-        if g.GetGeometryName() == "POINT":
-            h.append(drawPoint(g, plotargs, ax, colorVal))
-        elif g.GetGeometryName() == "MULTIPOINT":
-            h.append(drawMultiPoint(g, plotargs, ax, colorVal))
-        elif g.GetGeometryName() == "LINESTRING":
-            h.append(drawLine(g, plotargs, ax, colorVal))
-        elif g.GetGeometryName() == "MULTILINESTRING":
-            h.append(drawMultiLine(g, plotargs, ax, colorVal))
-        elif g.GetGeometryName() == "LINEARRING":
-            h.append(drawLinearRing(g, plotargs, ax, colorVal))
-        elif g.GetGeometryName() == "POLYGON":
-            h.append(drawPolygon(g, plotargs, ax, colorVal))
-        elif g.GetGeometryName() == "MULTIPOLYGON":
-            h.append(drawMultiPolygon(g, plotargs, ax, colorVal))
-        else:
-            msg = "Could not draw geometry of type:", pargs.index[gi], "->", g.GetGeometryName(
-            )
-            warnings.warn(msg, UserWarning)
+            if not colorBy is None:
+                colorVal = _colorVals[gi]
+            else:
+                colorVal = None
+
+            # Determine type
+            if g.GetGeometryName() == "POINT":
+                h.append(drawPoint(g, plotargs, ax, colorVal))
+            elif g.GetGeometryName() == "MULTIPOINT":
+                h.append(drawMultiPoint(g, plotargs, ax, colorVal))
+            elif g.GetGeometryName() == "LINESTRING":
+                h.append(drawLine(g, plotargs, ax, colorVal))
+            elif g.GetGeometryName() == "MULTILINESTRING":
+                h.append(drawMultiLine(g, plotargs, ax, colorVal))
+            elif g.GetGeometryName() == "LINEARRING":
+                h.append(drawLinearRing(g, plotargs, ax, colorVal))
+            elif g.GetGeometryName() == "POLYGON":
+                h.append(drawPolygon(g, plotargs, ax, colorVal))
+            elif g.GetGeometryName() == "MULTIPOLYGON":
+                h.append(drawMultiPolygon(g, plotargs, ax, colorVal))
+            else:
+                msg = "Could not draw geometry of type:", pargs.index[gi], "->", g.GetGeometryName(
+                )
+                warnings.warn(msg, UserWarning)
 
     # Add the colorbar, maybe
     if not colorBy is None and cbar:
@@ -1300,7 +2426,7 @@ def drawGeoms(geoms, srs=4326, ax=None, simplificationFactor=5000, colorBy=None,
         ax.set_ylim(*ylim)
 
     # Organize return
-    if isFrame:
+    if isFrame and not bulk:
         return UTIL.AxHands(ax, pd.Series(h, index=data.index), cbar)
     else:
         return UTIL.AxHands(ax, h, cbar)
@@ -1311,6 +2437,8 @@ def partition(geom, targetArea, growStep=None, _startPoint=0):
     to the targetArea
 
     WARNING: Not tested for several version. Will probably be removed later
+      * Use geokit.geom.partitionByArea() for a faster and more robust
+        alternative
 
     Inputs:
         geom : The geometry to partition
@@ -1457,3 +2585,135 @@ def partition(geom, targetArea, growStep=None, _startPoint=0):
 
     # Done!
     return output
+
+
+def _polygonParts(g):
+    """GeoKit internal
+
+    Removes any non-polygon parts (such as touching lines or points) from the
+    result of an overlay operation
+    """
+    gtype = ogr.GT_Flatten(g.GetGeometryType())
+    if gtype == POLYGON or gtype == MULTIPOLYGON:
+        return g
+
+    out = ogr.Geometry(ogr.wkbMultiPolygon)
+    out.AssignSpatialReference(g.GetSpatialReference())
+    for i in range(g.GetGeometryCount()):
+        sub = _polygonParts(g.GetGeometryRef(i))
+        if ogr.GT_Flatten(sub.GetGeometryType()) == POLYGON:
+            out.AddGeometry(sub)
+        else:
+            for j in range(sub.GetGeometryCount()):
+                out.AddGeometry(sub.GetGeometryRef(j))
+    return out
+
+
+def _bisectByArea(geom, count, tolerance, maxIterations, output):
+    """GeoKit internal
+
+    Recursively cuts 'geom' into 'count' pieces of nearly equal area with
+    axis-aligned cuts, appending the pieces to 'output'
+    """
+    if count <= 1:
+        output.append(geom)
+        return
+
+    total = geom.Area()
+    nLower = count // 2
+    target = total * nLower / count
+
+    # Cut across the longer side of the geometry's envelope
+    xMin, xMax, yMin, yMax = geom.GetEnvelope()
+    pad = max(xMax - xMin, yMax - yMin)
+    if (xMax - xMin) >= (yMax - yMin):
+        def side(cut, lower):
+            if lower:
+                return box(xMin - pad, yMin - pad, cut, yMax + pad, srs=None)
+            return box(cut, yMin - pad, xMax + pad, yMax + pad, srs=None)
+        lo, hi = xMin, xMax
+    else:
+        def side(cut, lower):
+            if lower:
+                return box(xMin - pad, yMin - pad, xMax + pad, cut, srs=None)
+            return box(xMin - pad, cut, xMax + pad, yMax + pad, srs=None)
+        lo, hi = yMin, yMax
+
+    # Find the cut position with a safeguarded false-position search, since the
+    # area below the cut is a continuous and monotonic function of its position
+    aLo, aHi = 0.0, total
+    cut = lo + (hi - lo) * nLower / count
+    for _ in range(maxIterations):
+        area = geom.Intersection(side(cut, True)).Area()
+        if abs(area - target) <= tolerance * total:
+            break
+        if area < target:
+            lo, aLo = cut, area
+        else:
+            hi, aHi = cut, area
+
+        if aHi > aLo:
+            cut = lo + (hi - lo) * (target - aLo) / (aHi - aLo)
+        if not lo < cut < hi or (hi - lo) < 1e-9 * pad:
+            cut = (lo + hi) / 2
+        elif cut - lo < 0.05 * (hi - lo) or hi - cut < 0.05 * (hi - lo):
+            # Avoid the slow one-sided convergence of plain false-position
+            cut = (cut + (lo + hi) / 2) / 2
+
+    lower = _polygonParts(geom.Intersection(side(cut, True)))
+    upper = _polygonParts(geom.Intersection(side(cut, False)))
+
+    _bisectByArea(lower, nLower, tolerance, maxIterations, output)
+    _bisectByArea(upper, count - nLower, tolerance, maxIterations, output)
+
+
+def partitionByArea(geom, count=None, targetArea=None, tolerance=1e-3, maxIterations=40):
+    """Partition a Polygon into a number of pieces with nearly equal areas
+
+    * Uses recursive, axis-aligned bisection: each geometry is cut across its
+      longer side such that the area on either side is proportional to the 
+      number of pieces which should be created from it
+    * Needs at most (count-1) * maxIterations intersections, so the time 
+      required is bounded regardless of the geometry's shape
+    * Areas are measured in the geometry's srs, so an equal-area projection
+      (such as EPSG3035) should be used for meaningful results
+    * Pieces of non-convex geometries can be MULTIPOLYGONs
+
+    Parameters:
+    -----------
+    geom : ogr.Geometry
+        The POLYGON or MULTIPOLYGON geometry to partition
+
+    count : int; optional
+        The number of pieces to create
+
+    targetArea : float; optional
+        The ideal area of each piece, used when 'count' is not given
+          * The number of pieces becomes the geometry's area divided by 
+            targetArea, rounded to the nearest integer
+
+    tolerance : float; optional
+        The acceptable error of each cut's area, relative to the area of the
+        geometry being cut
+
+    maxIterations : int; optional
+        The maximal number of search steps when positioning each cut
+
+    Returns:
+    --------
+    list -> [ogr.Geometry, ]
+
+    """
+    if not geom.GetGeometryName() in ("POLYGON", "MULTIPOLYGON"):
+        raise GeoKitGeomError(
+            "Geometry is not a polygon or multipolygon object")
+
+    if count is None:
+        if targetArea is None:
+            raise GeoKitGeomError("Either count or targetArea must be given")
+        count = int(round(geom.Area() / targetArea))
+    count = max(int(count), 1)
+
+    output = []
+    _bisectByArea(geom.Clone(), count, tolerance, maxIterations, output)
+    return output
@@ -1,5 +1,6 @@
 import re
 import numpy as np
+from collections import namedtuple
 from osgeo import ogr
 import pandas as pd
 
@@ -16,6 +17,58 @@ LocationMatcher = re.compile(
     r"\((?P<lon> *[0-9.-]+ *),(?P<lat> *[0-9.-]+ *)\)")
 
 
+def _coordinateArray(locations):
+    """GeoKit internal
+
+    Returns the locations as an Nx2 float64 array if they are given as numeric
+    coordinates, otherwise None
+    """
+    if isinstance(locations, (str, ogr.Geometry, Location, UTIL.Feature)):
+        return None
+    try:
+        xy = np.asarray(locations)
+    except ValueError:  # ragged inputs
+        return None
+
+    if not xy.dtype.kind in "iuf":
+        return None
+    if xy.ndim == 1 and xy.shape[0] == 2:
+        return xy.reshape((1, 2)).astype(np.float64)
+    if xy.ndim == 2 and xy.shape[1] == 2:
+        return xy.astype(np.float64)
+    return None
+
+
+def _stringArray(locations):
+    """GeoKit internal
+
+    Returns the locations as a 1D object array if they are given as a sequence
+    of strings, otherwise None
+    """
+    if isinstance(locations, str) or not isinstance(locations, (list, tuple, np.ndarray, pd.Series, pd.Index)):
+        return None
+    strings = np.asarray(locations, dtype=object)
+    if strings.ndim != 1 or strings.size == 0:
+        return None
+    if pd.api.types.infer_dtype(strings, skipna=False) != "string":
+        return None
+    return strings
+
+
+def _toLonLat(x, y, srs):
+    """GeoKit internal
+
+    Converts coordinate arrays in the given srs to longitude and latitude arrays
+    """
+    srs = SRS.loadSRS(4326 if srs is None or srs == 'latlon' else srs)
+    if SRS.isSame(srs, SRS.EPSG4326):
+        return np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64)
+
+    xyz = SRS.xyTransform(np.column_stack([x, y]), fromSRS=srs,
+                          toSRS=SRS.EPSG4326, outputFormat="array")
+    return xyz[:, 0], xyz[:, 1]
+
+
 class Location(object):
     """Represents a single location using lat/lon as a base coordinate system
 
@@ -78,6 +131,13 @@ class Location(object):
     def __ne__(self, o):
         return not(self == o)
 
+    def __getstate__(self):
+        return (self.lon, self.lat)
+
+    def __setstate__(self, state):
+        self.lon, self.lat = state
+        self._geom = None
+
     def __str__(self):
         return "(%.5f,%.5f)" % (self.lon, self.lat)
 
@@ -131,7 +191,7 @@ class Location(object):
         """
         if g.GetGeometryName() != "POINT":
             raise GeoKitLocationError("Invalid geometry given")
-        if not g.GetSpatialReference().IsSame(SRS.EPSG4326):
+        if not SRS.isSame(g.GetSpatialReference(), SRS.EPSG4326):
             g = g.Clone()
             g.TransformTo(SRS.EPSG4326)
 
@@ -245,10 +305,96 @@ class Location(object):
         return output
 
 
+NearestLocations = namedtuple("NearestLocations", "distance index")
+LocationGroup = namedtuple("LocationGroup", "locations index bounds")
+
+# Offsets the quantized coordinates in LocationSet.hashKeys() to be positive
+_KEY_OFFSET = 1 << 28
+
+# The number of srs's for which a LocationSet keeps coordinates, bounds and
+# trees cached
+_SRS_CACHE_SIZE = 4
+
+
+def _cachePut(cache, key, value):
+    """GeoKit internal
+
+    Adds a value to one of LocationSet's per-srs caches, evicting the oldest
+    entries once _SRS_CACHE_SIZE is reached
+    """
+    while len(cache) >= _SRS_CACHE_SIZE:
+        cache.pop(next(iter(cache)))
+    cache[key] = value
+
+
+def _kdPartition(xy, index, groups, output):
+    """GeoKit internal
+
+    Recursively splits the locations at 'index' into 'groups' balanced groups
+    by cutting across the longer side of their bounding box
+    """
+    if groups <= 1 or index.size <= 1:
+        output.append(index)
+        return
+
+    sub = xy[index]
+    axis = int(np.argmax(sub.max(axis=0) - sub.min(axis=0)))
+
+    nLower = groups // 2
+    k = int(round(index.size * nLower / groups))
+    k = min(max(k, 1), index.size - 1)
+
+    order = np.argpartition(sub[:, axis], k)
+    _kdPartition(xy, index[order[:k]], nLower, output)
+    _kdPartition(xy, index[order[k:]], groups - nLower, output)
+
+
+_HILBERT_ORDER = 16
+
+
+def _hilbertIndex(xy, order=_HILBERT_ORDER):
+    """GeoKit internal
+
+    Computes the position of each point along a Hilbert curve which covers the
+    points' bounding box on a grid of 2^order x 2^order cells
+    """
+    n = 1 << order
+    if xy.shape[0] == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    lower = xy.min(axis=0)
+    span = (xy.max(axis=0) - lower).max()
+    if span <= 0:
+        return np.zeros(xy.shape[0], dtype=np.int64)
+
+    cells = np.floor((xy - lower) / span * (n - 1)).astype(np.int64)
+    x, y = cells[:, 0], cells[:, 1]
+
+    d = np.zeros(xy.shape[0], dtype=np.int64)
+    s = n >> 1
+    while s > 0:
+        rx = (x & s) > 0
+        ry = (y & s) > 0
+        d += s * s * ((3 * rx.astype(np.int64)) ^ ry.astype(np.int64))
+
+        # Rotate the quadrant
+        flip = rx & ~ry
+        x = np.where(flip, n - 1 - x, x)
+        y = np.where(flip, n - 1 - y, y)
+        x, y = np.where(ry, x, y), np.where(ry, y, x)
+
+        s >>= 1
+    return d
+
+
 class LocationSet(object):
     """Represents a collection of location using lat/lon as a base coordinate 
     system
 
+    * Locations are stored as arrays of longitude and latitude values. Location
+      objects are only created when individual items are accessed
+    * The arrays are private, read-only copies of the input coordinates
+
     Note:
     -----
     When initializing, an iterable of anything acceptable by Location.load is
@@ -257,10 +403,22 @@ class LocationSet(object):
     Initializations:
     ----------------
     >>> LocationSet( iterable )
+
+    # If you have an Nx2 array of coordinates in any arbitrary SRS
+    >>> LocationSet( array, srs=SRS )
+
+    # If you have a DataFrame with 'lon' and 'lat' (or 'geom') columns
+    >>> LocationSet( dataframe )
+
+    # If you have 'x' and 'y' arrays (or DataFrame columns) in any SRS
+    >>> LocationSet.fromXY( x, y, srs=SRS )
+
+    # If you have a sequence of "(lon,lat)" strings
+    >>> LocationSet.fromStrings( strings )
     """
     _TYPE_KEY_ = "LocationSet"
 
-    def __init__(self, locations, srs=4326, _skip_check=False):
+    def __init__(self, locations, srs=4326):
         """Initialize a LocationSet Object
 
         * If only a single location is given, a set is still created
@@ -270,43 +428,169 @@ class LocationSet(object):
         locations : iterable
             The locations to collect
               * Can be anything acceptable by Location.load()
+              * Nx2 numeric arrays are read directly, without creating 
+                individual Location objects
+              * Sequences of "(x,y)" strings are parsed in a single pass
+              * DataFrames are read from their 'lon' and 'lat' columns if 
+                these exist, then from their 'x' and 'y' columns (in the
+                given srs), otherwise from their 'geom' column
+              * 'lon' and 'lat' columns are always lat/lon coordinates, so
+                'srs' must then be lat/lon as well
 
         srs : Anything acceptable to gk.srs.loadSRS; optional
             The srs for input coordinates
             * if not given, lat/lon coordinates are expected
 
         """
-        if not _skip_check:
-            if isinstance(locations, ogr.Geometry) or isinstance(locations, Location):
-                self._locations = np.array(
-                    [Location.load(locations, srs=srs), ])
-            elif isinstance(locations, LocationSet):
-                self._locations = locations[:]
-            elif isinstance(locations, pd.DataFrame):
-                self._locations = LocationSet(locations["geom"])[:]
+        if isinstance(locations, LocationSet):
+            lons, lats = locations.lons, locations.lats
+        elif isinstance(locations, ogr.Geometry) or isinstance(locations, Location):
+            loc = Location.load(locations, srs=srs)
+            lons, lats = [loc.lon, ], [loc.lat, ]
+        elif isinstance(locations, pd.DataFrame):
+            if "lon" in locations.columns and "lat" in locations.columns:
+                if not (srs is None or srs == 'latlon' or SRS.isSame(SRS.loadSRS(srs), SRS.EPSG4326)):
+                    raise GeoKitLocationError(
+                        "'lon' and 'lat' columns are always lat/lon coordinates. Use 'x' and 'y' columns for other srs's")
+                lons = locations["lon"].values
+                lats = locations["lat"].values
+            elif "x" in locations.columns and "y" in locations.columns:
+                lons, lats = _toLonLat(
+                    locations["x"].values, locations["y"].values, srs)
+            else:
+                ls = LocationSet(locations["geom"])
+                lons, lats = ls.lons, ls.lats
+        else:
+            xy = _coordinateArray(locations)
+            strings = None if not xy is None else _stringArray(locations)
+            if not xy is None:
+                lons, lats = _toLonLat(xy[:, 0], xy[:, 1], srs)
+            elif not strings is None:
+                ls = LocationSet.fromStrings(strings, srs=srs)
+                lons, lats = ls.lons, ls.lats
             else:
                 try:  # Try loading all locations one at a time
-                    self._locations = np.array(
-                        [Location.load(l, srs=srs) for l in locations])
+                    locs = [Location.load(l, srs=srs) for l in locations]
                 except GeoKitLocationError as err:
                     try:
                         # Try loading the input as as single Location
-                        self._locations = np.array(
-                            [Location.load(locations, srs=srs), ])
+                        locs = [Location.load(locations, srs=srs), ]
                     except GeoKitLocationError:
                         raise err
-        else:
-            self._locations = locations
-
-        self._lons = None
-        self._lats = None
-        self._bounds4326 = None
-        self.count = len(self._locations)
+                lons = [l.lon for l in locs]
+                lats = [l.lat for l in locs]
+
+        self._setArrays(lons, lats)
+
+    def _setArrays(self, lons, lats):
+        # Coordinates are copied and frozen, so that the cached values derived
+        # from them can never become stale
+        self._lons = np.array(lons, dtype=np.float64).ravel()
+        self._lats = np.array(lats, dtype=np.float64).ravel()
+        self._lons.setflags(write=False)
+        self._lats.setflags(write=False)
+        self.clearCache()
+        self.count = self._lons.shape[0]
         self.shape = (self.count,)
 
+    def clearCache(self):
+        """Drop all cached coordinates, bounds, trees and keys
+
+        * At most a few srs's are cached at a time in any case
+        """
+        self._xyCache = {}
+        self._boundsCache = {}
+        self._treeCache = {}
+        self._keys = None
+
+    @staticmethod
+    def _fromArrays(lons, lats):
+        """Creates a LocationSet directly from longitude and latitude arrays"""
+        output = LocationSet.__new__(LocationSet)
+        output._setArrays(lons, lats)
+        return output
+
+    @staticmethod
+    def fromXY(x, y, srs=3035):
+        """Initialize a LocationSet Object from arrays of X and Y coordinates
+
+        * Coordinates are transformed to lat/lon in a single call, without
+          creating individual Location objects
+
+        Parameters
+        ----------
+        x : array_like
+            The locations' x values
+
+        y : array_like
+            The locations' y values
+
+        srs : Anything acceptable to gk.srs.loadSRS
+            The srs for input coordinates
+
+        Returns:
+        --------
+        LocationSet
+        """
+        x = np.asarray(x, dtype=np.float64).ravel()
+        y = np.asarray(y, dtype=np.float64).ravel()
+        if x.shape != y.shape:
+            raise GeoKitLocationError("x and y must have the same length")
+
+        return LocationSet._fromArrays(*_toLonLat(x, y, srs))
+
+    @staticmethod
+    def fromStrings(strings, srs=None):
+        """Initialize a LocationSet Object from a sequence of strings
+
+        * Each string must be formated like: "(5.12243,52,11342)"
+        * Whitespace is okay
+        * Only the FIRST match within each string is used
+        * All strings are parsed in a single regular expression pass
+
+        Parameters
+        ----------
+        strings : iterable of str
+            The strings to parse
+
+        srs : Anything acceptable to gk.srs.loadSRS; optional
+            The srs for input coordinates
+            * if not given, lat/lon coordinates are expected
+
+        Returns:
+        --------
+        LocationSet
+        """
+        strings = pd.Series(np.asarray(strings, dtype=object).ravel())
+        parts = strings.str.extract(LocationMatcher.pattern)
+
+        lons = pd.to_numeric(parts["lon"].str.strip(), errors="coerce").values
+        lats = pd.to_numeric(parts["lat"].str.strip(), errors="coerce").values
+
+        bad = np.isnan(lons) | np.isnan(lats)
+        if bad.any():
+            raise GeoKitLocationError(
+                "string does not match Location specification", strings[np.argmax(bad)])
+
+        return LocationSet.fromXY(lons, lats, srs=4326 if srs is None else srs)
+
     def __len__(self): return self.count
 
-    def __getitem__(self, i): return self._locations[i]
+    def __getitem__(self, i):
+        if isinstance(i, (int, np.integer)):
+            return Location(lon=float(self._lons[i]), lat=float(self._lats[i]))
+        return LocationSet._fromArrays(self._lons[i], self._lats[i])
+
+    def __getstate__(self):
+        # Only the coordinates are kept. Cached arrays and trees are rebuilt
+        return (self._lons, self._lats)
+
+    def __setstate__(self, state):
+        self._setArrays(*state)
+
+    def __iter__(self):
+        for lon, lat in zip(self._lons.tolist(), self._lats.tolist()):
+            yield Location(lon=lon, lat=lat)
 
     def __repr__(self):
         out = " , Lon      , Lat\n"
@@ -338,32 +622,22 @@ class LocationSet(object):
         tuple -> (xMin, yMin, xMax, yMax) 
 
         """
-        if srs == 4326 and not self._bounds4326 is None:
-            return self._bounds4326
-        elif srs == 4326:
-            self._bounds4326 = (self.lons.min(), self.lats.min(),
-                                self.lons.max(), self.lats.max())
-            return self._bounds4326
-        else:
-            geoms = GEOM.transform([l.geom for l in self._locations],
-                                   fromSRS=SRS.EPSG4326, toSRS=srs)
-
-            yVals = np.array([g.GetY() for g in geoms])
-            xVals = np.array([g.GetX() for g in geoms])
+        key = SRS.srsKey(SRS.loadSRS(srs))
+        bounds = self._boundsCache.get(key)
+        if bounds is None:
+            xy = self._cachedXY(srs=srs)
+            xMin, yMin = xy.min(axis=0)
+            xMax, yMax = xy.max(axis=0)
 
-            return (xVals.min(), yVals.min(), xVals.max(), yVals.max())
+            bounds = (xMin, yMin, xMax, yMax)
+            _cachePut(self._boundsCache, key, bounds)
+        return bounds
 
     @property
-    def lats(self):
-        if self._lats is None:
-            self._lats = np.array([l.lat for l in self._locations])
-        return self._lats
+    def lats(self): return self._lats
 
     @property
-    def lons(self):
-        if self._lons is None:
-            self._lons = np.array([l.lon for l in self._locations])
-        return self._lons
+    def lons(self): return self._lons
 
     def asString(self):
         """Create a list of string representations of all locations in the set
@@ -373,14 +647,13 @@ class LocationSet(object):
         list -> [ '(lon1,lat1)', (lon2,lat2)', ... ]
 
         """
-        return [str(l) for l in self._locations]
+        return ["(%.5f,%.5f)" % lonlat for lonlat in zip(self._lons.tolist(), self._lats.tolist())]
 
     def makePickleable(self):
-        """Clears OGR objects from all individual Location's internals so that 
-        they become "pickleable"
+        """Kept for compatibility. LocationSets no longer hold OGR objects, and
+        are always "pickleable"
         """
-        for l in self._locations:
-            l.makePickleable()
+        pass
 
     def asGeom(self, srs=4326):
         """Create a list of ogr.Geometry representations of all locations in the 
@@ -398,11 +671,7 @@ class LocationSet(object):
 
         """
         srs = SRS.loadSRS(srs)
-        geoms4326 = [l.geom for l in self._locations]
-        if SRS.EPSG4326.IsSame(srs):
-            return geoms4326
-        else:
-            return GEOM.transform(geoms4326, fromSRS=SRS.EPSG4326, toSRS=srs)
+        return GEOM.points(self._cachedXY(srs=srs), srs=srs)
 
     def asXY(self, srs=3035):
         """Create an Nx2 array of x and y coordinates for all locations in the set
@@ -417,17 +686,406 @@ class LocationSet(object):
         --------
         numpy.ndarray -> Nx2
 
+        """
+        return self._cachedXY(srs).copy()
+
+    def _cachedXY(self, srs=3035):
+        """GeoKit internal
+
+        Returns the (read-only) Nx2 array of coordinates in the given srs, which
+        is computed once and cached
         """
         srs = SRS.loadSRS(srs)
-        if SRS.EPSG4326.IsSame(srs):
-            return np.column_stack([self.lons, self.lats])
+        key = SRS.srsKey(srs)
+
+        xy = self._xyCache.get(key)
+        if xy is None:
+            xy = np.column_stack([self._lons, self._lats])
+            if not SRS.isSame(SRS.EPSG4326, srs):
+                xyz = SRS.xyTransform(xy, fromSRS=SRS.EPSG4326, toSRS=srs,
+                                      outputFormat="array")
+                xy = np.ascontiguousarray(xyz[:, :2])
+
+            xy.setflags(write=False)
+            _cachePut(self._xyCache, key, xy)
+        return xy
+
+    def asHash(self):
+        e = Location._e
+        return [hash(key) for key in zip((self._lons / e).astype(np.int64).tolist(),
+                                         (self._lats / e).astype(np.int64).tolist())]
+
+    def hashKeys(self):
+        """Create an array of int64 keys which identify each location
+
+        * Longitudes and latitudes are quantized in the same way as in 
+          Location.__hash__, so locations with equal keys are equal
+        * Locations which are equal, but lie on either side of a quantization
+          step, get different keys. Use dedupe() for tolerance-based matching
+
+        Returns:
+        --------
+        numpy.ndarray -> N int64 keys
+
+        """
+        if self._keys is None:
+            e = Location._e
+            lonKeys = (self._lons / e).astype(np.int64) + _KEY_OFFSET
+            latKeys = (self._lats / e).astype(np.int64) + _KEY_OFFSET
+            self._keys = (lonKeys << 32) | latKeys
+            self._keys.setflags(write=False)
+        return self._keys
+
+    @staticmethod
+    def _asSet(locs):
+        return locs if isinstance(locs, LocationSet) else LocationSet(locs)
+
+    def indexIn(self, locs):
+        """Find the position of each location in another collection of locations
+
+        * Matching is done on the keys given by hashKeys(), using a sorted 
+          search
+
+        Parameters
+        ----------
+        locs : Anything acceptable to LocationSet()
+            The locations to search in
+            * A pandas Index of Locations is also acceptable
+
+        Returns:
+        --------
+        numpy.ndarray -> N indices
+            * The first matching position is given, or -1 if there is no match
+
+        """
+        otherKeys = LocationSet._asSet(locs).hashKeys()
+        keys = self.hashKeys()
+        if otherKeys.size == 0:
+            return np.full(keys.size, -1, dtype=np.int64)
+
+        order = np.argsort(otherKeys, kind="stable")
+        sortedKeys = otherKeys[order]
+        pos = np.minimum(np.searchsorted(sortedKeys, keys), sortedKeys.size - 1)
+
+        return np.where(sortedKeys[pos] == keys, order[pos], -1)
+
+    def isin(self, locs):
+        """Test which locations are also found in another collection of locations
+
+        Parameters
+        ----------
+        locs : Anything acceptable to LocationSet()
+            The locations to search in
+
+        Returns:
+        --------
+        numpy.ndarray -> N booleans
+
+        """
+        return np.isin(self.hashKeys(), LocationSet._asSet(locs).hashKeys())
+
+    def unique(self, returnIndex=False):
+        """Remove repeated locations, keeping the first occurrence of each
+
+        Parameters
+        ----------
+        returnIndex : bool; optional
+            If True, also return the indices of the kept locations
+
+        Returns:
+        --------
+        LocationSet
+            * If returnIndex is True: (LocationSet, numpy.ndarray)
+
+        """
+        _, first = np.unique(self.hashKeys(), return_index=True)
+        keep = np.sort(first)
+        if returnIndex:
+            return self[keep], keep
+        return self[keep]
+
+    def union(self, locs):
+        """Create a set of the unique locations found in either this set or 
+        another collection of locations
+
+        * Locations in this set come first, followed by the new locations
+
+        Returns:
+        --------
+        LocationSet
+
+        """
+        other = LocationSet._asSet(locs)
+        combined = LocationSet._fromArrays(np.concatenate([self._lons, other.lons]),
+                                           np.concatenate([self._lats, other.lats]))
+        return combined.unique()
+
+    def intersection(self, locs):
+        """Create a set of the unique locations in this set which are also found
+        in another collection of locations
+
+        Returns:
+        --------
+        LocationSet
+
+        """
+        unique = self.unique()
+        return unique[unique.isin(locs)]
+
+    def difference(self, locs):
+        """Create a set of the unique locations in this set which are not found
+        in another collection of locations
+
+        Returns:
+        --------
+        LocationSet
+
+        """
+        unique = self.unique()
+        return unique[~unique.isin(locs)]
+
+    def join(self, data):
+        """Select the rows of a DataFrame or Series which is indexed by 
+        locations, in the order of the locations in this set
+
+        * Rows are matched with indexIn()
+        * Locations which are not found get rows of NaN values
+
+        Parameters
+        ----------
+        data : pandas.DataFrame or pandas.Series
+            The data to select from
+            * Its index must be acceptable to LocationSet()
+
+        Returns:
+        --------
+        pandas.DataFrame or pandas.Series
+            * The index is 0...N, matching the positions in this set
+
+        """
+        pos = self.indexIn(data.index)
+        output = data.reset_index(drop=True).reindex(pos)
+        output.index = pd.RangeIndex(self.count)
+        return output
+
+    def kdTree(self, srs=3035):
+        """Get a KD-tree of the locations' coordinates in an arbitrary SRS
+
+        * The tree is built on first use, and cached for each srs
+        * A projected srs should be used, so that distances are meaningful
+
+        Parameters
+        ----------
+        srs : Anything acceptable to gk.srs.loadSRS; optional
+            The srs to build the tree in
+            * if not given, EPSG3035 coordinates are assumed
+
+        Returns:
+        --------
+        scipy.spatial.cKDTree
+
+        """
+        from scipy.spatial import cKDTree
+
+        srs = SRS.loadSRS(srs)
+        key = SRS.srsKey(srs)
+
+        tree = self._treeCache.get(key)
+        if tree is None:
+            tree = cKDTree(self._cachedXY(srs=srs))
+            _cachePut(self._treeCache, key, tree)
+        return tree
+
+    def nearest(self, locs, k=1, srs=3035, maxDistance=None):
+        """Find the nearest locations in the set to each of the given locations
+
+        Parameters
+        ----------
+        locs : Anything acceptable to LocationSet()
+            The locations to search around
+
+        k : int; optional
+            The number of nearest locations to find for each location
+
+        srs : Anything acceptable to gk.srs.loadSRS; optional
+            The srs in which distances are measured
+            * if not given, EPSG3035 coordinates are assumed
+
+        maxDistance : float; optional
+            The maximal distance to search to
+            * When fewer than 'k' locations are found, missing indices are -1 
+              and missing distances are inf
+
+        Returns:
+        --------
+        namedtuple -> (distance, index)
+            * Each is an array of shape (N,) when k is 1, otherwise (N,k)
+
+        """
+        if not isinstance(locs, LocationSet):
+            locs = LocationSet(locs)
+
+        tree = self.kdTree(srs=srs)
+        distance, index = tree.query(locs._cachedXY(srs=srs), k=k,
+                                     distance_upper_bound=np.inf if maxDistance is None else maxDistance)
+
+        index = np.where(index >= self.count, -1, index)
+        return NearestLocations(distance, index)
+
+    def within(self, locs, radius, srs=3035):
+        """Find the locations in the set which are within a given distance of 
+        each of the given locations
+
+        Parameters
+        ----------
+        locs : Anything acceptable to LocationSet()
+            The locations to search around
+
+        radius : float
+            The distance to search within, in units of the given srs
+
+        srs : Anything acceptable to gk.srs.loadSRS; optional
+            The srs in which distances are measured
+            * if not given, EPSG3035 coordinates are assumed
+
+        Returns:
+        --------
+        list -> [numpy.ndarray of sorted indices, ] for each given location
+
+        """
+        if not isinstance(locs, LocationSet):
+            locs = LocationSet(locs)
+
+        tree = self.kdTree(srs=srs)
+        found = tree.query_ball_point(locs._cachedXY(srs=srs), r=radius)
+        return [np.sort(np.array(f, dtype=np.int64)) for f in found]
+
+    def pairsWithin(self, radius, srs=3035):
+        """Find all pairs of locations in the set which are within a given 
+        distance of each other
+
+        Parameters
+        ----------
+        radius : float
+            The distance threshold, in units of the given srs
+
+        srs : Anything acceptable to gk.srs.loadSRS; optional
+            The srs in which distances are measured
+            * if not given, EPSG3035 coordinates are assumed
+
+        Returns:
+        --------
+        numpy.ndarray -> Mx2 array of (i, j) index pairs, where i < j
+
+        """
+        pairs = self.kdTree(srs=srs).query_pairs(r=radius, output_type="ndarray")
+        pairs = np.sort(pairs.reshape((-1, 2)), axis=1)
+        return pairs[np.lexsort((pairs[:, 1], pairs[:, 0]))]
+
+    def dedupe(self, tolerance=1.0, srs=3035, returnIndex=False):
+        """Remove locations which are within a distance tolerance of another 
+        location in the set
+
+        * Locations which are chained together by the tolerance are collapsed 
+          onto the first location of the chain
+
+        Parameters
+        ----------
+        tolerance : float; optional
+            The distance below which locations are considered equal, in units
+            of the given srs
+
+        srs : Anything acceptable to gk.srs.loadSRS; optional
+            The srs in which distances are measured
+            * if not given, EPSG3035 coordinates are assumed
+
+        returnIndex : bool; optional
+            If True, also return an array which gives the position of each 
+            original location in the deduplicated set
+
+        Returns:
+        --------
+        LocationSet
+            * If returnIndex is True: (LocationSet, numpy.ndarray)
+
+        """
+        from scipy.sparse import coo_matrix
+        from scipy.sparse.csgraph import connected_components
+
+        pairs = self.pairsWithin(tolerance, srs=srs)
+        graph = coo_matrix((np.ones(pairs.shape[0], dtype=bool), (pairs[:, 0], pairs[:, 1])),
+                           shape=(self.count, self.count))
+        _, labels = connected_components(graph, directed=False)
+
+        # Keep the first location of each group
+        first = np.full(labels.max() + 1 if self.count else 0, self.count, dtype=np.int64)
+        np.minimum.at(first, labels, np.arange(self.count))
+        keep = np.sort(first)
+
+        output = self[keep]
+        if returnIndex:
+            return output, np.searchsorted(keep, first[labels])
+        return output
+
+    def partition(self, groups, srs=3035, method="kdtree"):
+        """Split the locations into spatially compact groups of (nearly) equal
+        size
+
+        * "kdtree" recursively splits the locations at the median of the longer
+          side of their bounding box, in proportion to the number of groups 
+          which should come from each side
+        * "hilbert" orders the locations along a Hilbert curve, and cuts the
+          curve into equally sized pieces
+        * Group sizes differ by at most one location
+
+        Parameters
+        ----------
+        groups : int
+            The number of groups to create
+
+        srs : Anything acceptable to gk.srs.loadSRS; optional
+            The srs in which the locations are split
+            * if not given, EPSG3035 coordinates are assumed
+
+        method : str; optional
+            The partitioning method to use: "kdtree" or "hilbert"
+
+        Returns:
+        --------
+        list -> [ LocationGroup, ]
+            * Each LocationGroup is a namedtuple containing:
+              locations : The group's LocationSet
+              index     : The group's indices in the original set
+              bounds    : The group's (xMin, yMin, xMax, yMax) in the given srs
+
+        """
+        groups = int(groups)
+        if groups < 1:
+            raise GeoKitLocationError("groups must be at least 1")
+        groups = min(groups, max(self.count, 1))
+
+        xy = self._cachedXY(srs=srs)
+
+        if method == "kdtree":
+            indices = []
+            _kdPartition(xy, np.arange(self.count), groups, indices)
+        elif method == "hilbert":
+            order = np.argsort(_hilbertIndex(xy), kind="stable")
+            indices = np.array_split(order, groups)
         else:
-            geoms4326 = [l.geom for l in self._locations]
-            geomsSRS = GEOM.transform(
-                geoms4326, fromSRS=SRS.EPSG4326, toSRS=srs)
-            return np.array([(g.GetX(), g.GetY()) for g in geomsSRS])
+            raise GeoKitLocationError("Unknown partition method: " + str(method))
+
+        output = []
+        for index in indices:
+            index = np.sort(index)
+            sub = xy[index]
+            if index.size > 0:
+                bounds = (*sub.min(axis=0), *sub.max(axis=0))
+            else:
+                bounds = None
+            output.append(LocationGroup(self[index], index, bounds))
 
-    def asHash(self): return [hash(l) for l in self._locations]
+        return output
 
     def splitKMeans(self, groups=2, **kwargs):
         """Split the locations into groups according to KMEans clustering
@@ -454,7 +1112,7 @@ class LocationSet(object):
         km = KMeans(n_clusters=groups, **kwargs).fit(obs)
         for i in range(groups):
             sel = km.labels_ == i
-            yield LocationSet(self[sel], _skip_check=True)
+            yield self[sel]
 
     def bisect(self, lon=True, lat=True, delta=0.005):
         """Cluster the locations by finding a bisecting line in lat/lon 
@@ -486,15 +1144,15 @@ class LocationSet(object):
         latDiv = np.median(self.lats)
 
         if lon and lat:
-            yield LocationSet(self[(self.lons < lonDiv) & (self.lats < latDiv)], _skip_check=True)
-            yield LocationSet(self[(self.lons >= lonDiv) & (self.lats < latDiv)], _skip_check=True)
-            yield LocationSet(self[(self.lons < lonDiv) & (self.lats >= latDiv)], _skip_check=True)
-            yield LocationSet(self[(self.lons >= lonDiv) & (self.lats >= latDiv)], _skip_check=True)
+            yield self[(self.lons < lonDiv) & (self.lats < latDiv)]
+            yield self[(self.lons >= lonDiv) & (self.lats < latDiv)]
+            yield self[(self.lons < lonDiv) & (self.lats >= latDiv)]
+            yield self[(self.lons >= lonDiv) & (self.lats >= latDiv)]
 
         elif lon and not lat:
-            yield LocationSet(self[(self.lons < lonDiv)], _skip_check=True)
-            yield LocationSet(self[(self.lons >= lonDiv)], _skip_check=True)
+            yield self[(self.lons < lonDiv)]
+            yield self[(self.lons >= lonDiv)]
 
         elif lat and not lon:
-            yield LocationSet(self[(self.lats < latDiv)], _skip_check=True)
-            yield LocationSet(self[(self.lats >= latDiv)], _skip_check=True)
+            yield self[(self.lats < latDiv)]
+            yield self[(self.lats >= latDiv)]
@@ -463,7 +463,7 @@ def extractMatrix(
             bounds = bounds.castTo(dsInfo.srs).fit((dsInfo.dx, dsInfo.dy)).xyXY
         else:
             boundsSRS = SRS.loadSRS(boundsSRS)
-            if not dsInfo.srs.IsSame(boundsSRS):
+            if not SRS.isSame(dsInfo.srs, boundsSRS):
                 bounds = GEOM.boundsToBounds(bounds, boundsSRS, dsInfo.srs)
             bounds = UTIL.fitBoundsTo(bounds, dsInfo.dx, dsInfo.dy)
 
@@ -816,6 +816,49 @@ def rasterInfo(sourceDS):
 ptValue = namedtuple("value", "data xOffset yOffset inBounds")
 
 
+_READ_CHUNK_SIZE = 1024
+
+
+def _readWindows(band, xStarts, yStarts, window):
+    """GeoKit internal
+
+    Reads square windows of pixels starting at the given indices from a band.
+    Nearby windows are read together, with one ReadAsArray call for each 
+    chunk of the raster which contains any windows
+
+    Returns an (N, window, window) array
+    """
+    if xStarts.size == 0:
+        return np.zeros((0, window, window))
+
+    output = None
+    offsets = np.arange(window)
+    chunks = (yStarts // _READ_CHUNK_SIZE) * (xStarts.max() // _READ_CHUNK_SIZE + 1) + \
+        xStarts // _READ_CHUNK_SIZE
+    chunkIds, inverse = np.unique(chunks, return_inverse=True)
+    inverse = inverse.ravel()
+
+    # Group the windows by chunk once, rather than scanning them for each chunk
+    order = np.argsort(inverse, kind="stable")
+    bounds = np.searchsorted(inverse[order], np.arange(chunkIds.size + 1))
+    for ci in range(chunkIds.size):
+        sel = order[bounds[ci]:bounds[ci + 1]]
+        x0, y0 = xStarts[sel].min(), yStarts[sel].min()
+        block = band.ReadAsArray(xoff=int(x0),
+                                 yoff=int(y0),
+                                 win_xsize=int(xStarts[sel].max() - x0 + window),
+                                 win_ysize=int(yStarts[sel].max() - y0 + window))
+
+        if output is None:
+            output = np.empty((xStarts.size, window, window), dtype=block.dtype)
+
+        rows = (yStarts[sel] - y0)[:, None, None] + offsets[None, :, None]
+        cols = (xStarts[sel] - x0)[:, None, None] + offsets[None, None, :]
+        output[sel] = block[rows, cols]
+
+    return output
+
+
 def extractValues(
     source, points, pointSRS="latlon", winRange=0, noDataOkay=True, _onlyValues=False
 ):
@@ -880,59 +923,71 @@ def extractValues(
     info = rasterInfo(source)
     pointSRS = SRS.loadSRS(pointSRS)
 
-    # Ensure we have a list of point geometries
+    # Get the points' x/y values in the source's srs
     try:
         if points._TYPE_KEY_ == "Location":
             asSingle = True
             pointsKey = None
-            points = [
-                points.asGeom(info.srs),
-            ]
+            xy = np.array([points.asXY(info.srs), ])
         elif points._TYPE_KEY_ == "LocationSet":
             asSingle = False
             pointsKey = points
-            points = points.asGeom(info.srs)
+            xy = points._cachedXY(info.srs)
     except AttributeError:
         pointsKey = None
 
-        def loadPoint(pt, s):
-            if isinstance(pt, ogr.Geometry):
-                if pt.GetGeometryName() != "POINT":
-                    raise GEOM.GeoKitGeomError("Invalid geometry given")
-                return pt
-
-            if isinstance(pt, Location):
-                return pt.geom
-
-            tmpPt = ogr.Geometry(ogr.wkbPoint)
-            tmpPt.AddPoint(*pt)
-            tmpPt.AssignSpatialReference(s)
+        coords = None
+        if isinstance(points, (list, np.ndarray)):
+            coords = np.asarray(points)
 
-            return tmpPt
-
-        # check for an individual point input
-        if (
-            isinstance(points, Location)
-            or isinstance(points, tuple)
-            or isinstance(points, ogr.Geometry)
-        ):
-            asSingle = True
-            points = [
-                loadPoint(points, pointSRS),
-            ]
-        else:  # assume points is iterable
+        if not coords is None and coords.dtype.kind in "iuf" and coords.ndim == 2 and coords.shape[1] == 2:
+            # An array of coordinates can be transformed all at once
             asSingle = False
-            points = [loadPoint(pt, pointSRS) for pt in points]
+            xy = coords.astype(np.float64)
+            if not SRS.isSame(pointSRS, info.srs):
+                xy = SRS.xyTransform(xy, fromSRS=pointSRS, toSRS=info.srs,
+                                     outputFormat="array")[:, :2]
+        else:
+            def loadPoint(pt, s):
+                if isinstance(pt, ogr.Geometry):
+                    if pt.GetGeometryName() != "POINT":
+                        raise GEOM.GeoKitGeomError("Invalid geometry given")
+                    return pt
+
+                if isinstance(pt, Location):
+                    return pt.geom
+
+                tmpPt = ogr.Geometry(ogr.wkbPoint)
+                tmpPt.AddPoint(*pt)
+                tmpPt.AssignSpatialReference(s)
+
+                return tmpPt
+
+            # check for an individual point input
+            if (
+                isinstance(points, Location)
+                or isinstance(points, tuple)
+                or isinstance(points, ogr.Geometry)
+            ):
+                asSingle = True
+                points = [
+                    loadPoint(points, pointSRS),
+                ]
+            else:  # assume points is iterable
+                asSingle = False
+                points = [loadPoint(pt, pointSRS) for pt in points]
 
-        # Cast to source srs
-        # make sure we're using the pointSRS for the points in the list
-        pointSRS = points[0].GetSpatialReference()
-        if not pointSRS.IsSame(info.srs):
-            points = GEOM.transform(points, fromSRS=pointSRS, toSRS=info.srs)
+            # Cast to source srs
+            # make sure we're using the pointSRS for the points in the list
+            pointSRS = points[0].GetSpatialReference()
+            if not SRS.isSame(pointSRS, info.srs):
+                points = GEOM.transform(points, fromSRS=pointSRS, toSRS=info.srs)
 
-    # Get x/y values as numpy arrays
-    x = np.array([pt.GetX() for pt in points])
-    y = np.array([pt.GetY() for pt in points])
+            # Get x/y values as numpy arrays
+            xy = np.array([(pt.GetX(), pt.GetY()) for pt in points])
+
+    x = xy[:, 0]
+    y = xy[:, 1]
 
     # Calculate x/y indexes
     xValues = (x - (info.xMin + 0.5 * info.pixelWidth)) / info.pixelWidth
@@ -963,45 +1018,45 @@ def extractValues(
         warnings.warn(msg, UserWarning)
 
     # Read values
-    values = []
     band = source.GetRasterBand(1)
+    data = _readWindows(band,
+                        xStarts[inBounds].astype(np.int64),
+                        yStarts[inBounds].astype(np.int64),
+                        window)
+
+    if info.scale != 1.0:
+        data = data * info.scale
+    if info.offset != 0.0:
+        data = data + info.offset
+
+    # Look for nodata
+    if not info.noData is None:
+        nodata = data == info.noData
+        if nodata.any():
+            if noDataOkay:
+                # data will neaed to be a float type to represent a nodata value
+                data = data.astype(np.float64)
+                data[nodata] = np.nan
+            else:
+                raise GeoKitRasterError(
+                    "No data values found in extractValues with 'noDataOkay' set to False"
+                )
 
-    for xi, yi, ib in zip(xStarts, yStarts, inBounds):
-        if not ib:
-            data = np.empty((window, window))
-        else:
-            # Open and read from raster
-            data = band.ReadAsArray(
-                xoff=xi, yoff=yi, win_xsize=window, win_ysize=window
-            )
-            if info.scale != 1.0:
-                data = data * info.scale
-            if info.offset != 0.0:
-                data = data + info.offset
-
-            # Look for nodata
-            if not info.noData is None:
-                nodata = data == info.noData
-                if nodata.any():
-                    if noDataOkay:
-                        # data will neaed to be a float type to represent a nodata value
-                        data = data.astype(np.float64)
-                        data[nodata] = np.nan
-                    else:
-                        raise GeoKitRasterError(
-                            "No data values found in extractValues with 'noDataOkay' set to False"
-                        )
-
-            # flip if not in the 'flipped-y' orientation
-            if not info.yAtTop:
-                data = data[::-1, :]
+    # flip if not in the 'flipped-y' orientation
+    if not info.yAtTop:
+        data = data[:, ::-1, :]
 
-        if winRange == 0:
-            # If winRange is 0, theres no need to return a 2D matrix
-            data = data[0][0]
+    # Points outside of the raster get nan values
+    if not inBounds.all():
+        allData = np.full((inBounds.size, window, window), np.nan)
+        allData[inBounds] = data
+        data = allData
 
-        # Append to values
-        values.append(data)
+    if winRange == 0:
+        # If winRange is 0, theres no need to return a 2D matrix
+        values = data[:, 0, 0]
+    else:
+        values = list(data)
 
     # Done!
     if asSingle:  # A single point was given, so return a single result
@@ -1396,9 +1451,9 @@ def indexToCoord(
 
     # make the output
     if asPoint:
-        try:  # maybe x and y are iterable
-            output = [GEOM.point((xx, yy), srs=srs) for xx, yy in zip(x, y)]
-        except TypeError:  # x and y should be a single point
+        if np.ndim(x) > 0:  # x and y are iterable
+            output = GEOM.points(x, y, srs=srs)
+        else:  # x and y should be a single point
             output = GEOM.point((x, y), srs=srs)
     else:
         output = np.column_stack([x, y])
@@ -2120,7 +2175,7 @@ def warp(
         srs = dsInfo.srs
         srsOkay = True
     else:
-        if srs.IsSame(dsInfo.srs):
+        if SRS.isSame(srs, dsInfo.srs):
             srsOkay = True
         else:
             srsOkay = False
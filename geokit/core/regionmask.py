@@ -10,7 +10,7 @@ from . import srs as SRS
 from . import geom as GEOM
 from . import raster as RASTER
 from . import vector as VECTOR
-# from .location import Location, LocationSet
+from .location import LocationSet
 from .extent import Extent
 
 
@@ -177,7 +177,7 @@ class RegionMask(object):
             if gSRS is None:
                 raise GeoKitRegionMaskError("geom does not have an srs")
 
-            if not gSRS.IsSame(self.srs):
+            if not SRS.isSame(gSRS, self.srs):
                 GEOM.transform(self._geometry, toSRS=self.srs, fromSRS=gSRS)
         else:
             self._geometry = None
@@ -276,7 +276,7 @@ class RegionMask(object):
             extent = Extent.fromGeom(geom).castTo(
                 srs).pad(padExtent).fit(pixelRes)
         else:
-            if not extent.srs.IsSame(srs):
+            if not SRS.isSame(extent.srs, srs):
                 raise GeoKitRegionMaskError(
                     "The given srs does not match the extent's srs")
             #extent = extent.pad(padExtent)
@@ -554,11 +554,111 @@ class RegionMask(object):
         if(hasattr(self, "_TMPDIR")):
             self._TMPDIR.cleanup()
 
+    def __getstate__(self):
+        # OGR objects, temporary files and rendered views are not kept. The
+        # mask is stored as packed bits, and the geometry as WKB
+        state = dict(extent=self.extent,
+                     pixelWidth=self.pixelWidth,
+                     pixelHeight=self.pixelHeight,
+                     width=self.width,
+                     height=self.height,
+                     attributes=self.attributes,
+                     mask=None,
+                     geometry=None)
+
+        if not self._mask is None:
+            state["mask"] = (np.packbits(self._mask.ravel()), self._mask.shape)
+        if not self._geometry is None:
+            state["geometry"] = (bytes(self._geometry.ExportToWkb()),
+                                 SRS.compactSRS(self._geometry.GetSpatialReference()))
+        return state
+
+    def __setstate__(self, state):
+        self.extent = state["extent"]
+        self.srs = self.extent.srs
+        self.pixelWidth = state["pixelWidth"]
+        self.pixelHeight = state["pixelHeight"]
+        if self.pixelHeight == self.pixelWidth:
+            self._pixelRes = self.pixelHeight
+        else:
+            self._pixelRes = None
+        self.width = state["width"]
+        self.height = state["height"]
+        self.attributes = state["attributes"]
+
+        self._mask = None
+        if not state["mask"] is None:
+            bits, shape = state["mask"]
+            count = int(np.prod(shape))
+            self._mask = np.unpackbits(bits)[:count].reshape(shape).astype(bool)
+
+        self._geometry = None
+        if not state["geometry"] is None:
+            wkb, srs = state["geometry"]
+            self._geometry = ogr.CreateGeometryFromWkb(wkb)
+            if not srs is None:
+                self._geometry.AssignSpatialReference(SRS.loadSRS(srs))
+
+        self._vector = None
+        self._vectorPath = None
+
     def _resolve(self, div):
         if(div < 0):
             div = 1.0 / abs(int(div))
         return (self.pixelWidth / div, self.pixelHeight / div)
 
+    def containsLoc(self, locs, srs=None, method="mask"):
+        """Test which of many locations fall inside the region
+
+        * With method "mask", each location is mapped to its pixel index and 
+          the result is gathered from the mask in a single step
+        * With method "geometry", the locations are tested against the region's
+          geometry (see geokit.geom.containsPoints)
+
+        Parameters:
+        -----------
+        locs : Anything acceptable to LocationSet()
+            The locations to be checked
+
+        srs : Anything acceptable to geokit.srs.loadSRS(); optional
+            The srs of the input locations, when these are given as coordinates
+            * If not given, lat/lon coordinates are expected
+
+        method : str; optional
+            Either "mask" or "geometry"
+
+        Returns:
+        --------
+        * If a single location is checked: bool
+        * If multiple locations are checked: numpy.ndarray
+
+        """
+        if not isinstance(locs, LocationSet):
+            locs = LocationSet(locs, srs=4326 if srs is None else srs)
+
+        if method == "mask":
+            mask = self.mask
+            xy = locs._cachedXY(self.srs)
+
+            xi = np.floor((xy[:, 0] - self.extent.xMin) / self.pixelWidth)
+            yi = np.floor((self.extent.yMax - xy[:, 1]) / self.pixelHeight)
+
+            sel = (xi >= 0) & (xi < mask.shape[1]) & (yi >= 0) & (yi < mask.shape[0])
+            sel[sel] = mask[yi[sel].astype(np.int64), xi[sel].astype(np.int64)]
+
+        elif method == "geometry":
+            geom = self.geometry
+            sel = GEOM.containsPoints(geom, locs._cachedXY(geom.GetSpatialReference()))
+
+        else:
+            raise GeoKitRegionMaskError("method must be 'mask' or 'geometry'")
+
+        # Done!
+        if sel.size == 1:
+            return sel[0]
+        else:
+            return sel
+
     def applyMask(self, mat, noData=0):
         """Shortcut to apply the RegionMask's mask to an array. Mainly intended
         for internal use
@@ -683,7 +783,7 @@ class RegionMask(object):
 
         return geoms
 
-    def indicateValues(self, source, value, buffer=None, resolutionDiv=1, forceMaskShape=False, applyMask=True, noData=None, resampleAlg='bilinear', warpDType=None, bufferMethod='area', preBufferSimplification=None, **kwargs):
+    def indicateValues(self, source, value, buffer=None, resolutionDiv=1, forceMaskShape=False, applyMask=True, noData=None, resampleAlg='bilinear', warpDType=None, bufferMethod='area', preBufferSimplification=None, jobs=1, **kwargs):
         """
         Indicates those pixels in the RegionMask which correspond to a particular 
         value, or range of values, from a given raster datasource
@@ -816,6 +916,11 @@ class RegionMask(object):
             - Using this can drastically decrease the time it takes to perform the 
               bufferring procedure, but can decrease accuracy if it is too high
 
+        jobs : int; optional
+            The number of processes used to buffer geometries
+            * If None, the number of CPUs is used
+            * See geokit.geom.applyOperations for more info
+
         kwargs -- Passed on to RegionMask.warp()
             * Most notably: 'resampleAlg'
 
@@ -917,11 +1022,8 @@ class RegionMask(object):
             elif bufferMethod == 'area':
                 geoms = self.polygonizeMask(final > 0.5, flat=False)
 
-            if preBufferSimplification is not None:
-                geoms = [g.Simplify(preBufferSimplification) for g in geoms]
-
             if len(geoms) > 0:
-                geoms = [g.Buffer(buffer) for g in geoms]
+                geoms = GEOM.bufferGeoms(geoms, buffer, simplification=preBufferSimplification, jobs=jobs)
                 areaDS = VECTOR.createVector(geoms)
                 final = self.rasterize(areaDS, dtype="float32", bands=[1], burnValues=[1], resolutionDiv=resolutionDiv,
                                        applyMask=False, noData=noData)
@@ -949,7 +1051,7 @@ class RegionMask(object):
 
     #######################################################################################
     # Vector feature indicator
-    def indicateFeatures(self, source, where=None, buffer=None, bufferMethod='geom', resolutionDiv=1, forceMaskShape=False, applyMask=True, noData=0, preBufferSimplification=None, **kwargs):
+    def indicateFeatures(self, source, where=None, buffer=None, bufferMethod='geom', resolutionDiv=1, forceMaskShape=False, applyMask=True, noData=0, preBufferSimplification=None, mode="binary", jobs=1, **kwargs):
         """
         Indicates the RegionMask pixels which are found within the features (or 
         a subset of the features) contained in a given vector datasource
@@ -1018,6 +1120,19 @@ class RegionMask(object):
             - Using this can drastically decrease the time it takes to perform the 
               bufferring procedure, but can decrease accuracy if it is too high
 
+        mode : str; optional
+            The rasterization mode used to indicate the features
+            * If 'binary', pixels are indicated with either 0 or 1
+            * If 'coverage', pixels are indicated by the fraction of their area
+              which is covered by the features
+              - This gives area-weighted results at the native resolution, so 
+                a high 'resolutionDiv' is not needed
+            * See geokit.vector.rasterize for more info
+
+        jobs : int; optional
+            The number of processes used to buffer geometries
+            * If None, the number of CPUs is used
+            * See geokit.geom.applyOperations for more info
 
         kwargs -- Passed on to RegionMask.rasterize()
             * Most notably: 'allTouched'
@@ -1035,13 +1150,10 @@ class RegionMask(object):
         if buffer == 0:
             buffer = None
         if not buffer is None and bufferMethod == 'geom':
-            def doBuffer(ftr):
-                if preBufferSimplification is not None:
-                    geom = ftr.geom.Simplify(preBufferSimplification)
-                else:
-                    geom = ftr.geom
-                return {'geom': geom.Buffer(buffer)}
-            source = self.mutateVector(source, where=where, processor=doBuffer,
+            def doBuffer(ftrs):
+                return {'geom': GEOM.bufferGeoms(ftrs.geom.values, buffer,
+                                                 simplification=preBufferSimplification, jobs=jobs)}
+            source = self.mutateVector(source, where=where, processor=doBuffer, batch=True,
                                        matchContext=True, keepAttributes=False, _slim=True)
 
             where = None  # Set where to None since the filtering has already been done
@@ -1052,7 +1164,7 @@ class RegionMask(object):
 
         # Do rasterize
         final = self.rasterize(source, dtype='float32', value=1, where=where, resolutionDiv=resolutionDiv,
-                               applyMask=False, noData=noData)
+                               applyMask=False, noData=noData, mode=mode)
         # Check for results
         if not (final > 0).any():
             # no results were found
@@ -1066,11 +1178,8 @@ class RegionMask(object):
             elif bufferMethod == 'contour':
                 geoms = self.contoursFromMask(final)
 
-            if preBufferSimplification is not None:
-                geoms = [g.Simplify(preBufferSimplification) for g in geoms]
-
             if len(geoms) > 0:
-                geoms = [g.Buffer(buffer) for g in geoms]
+                geoms = GEOM.bufferGeoms(geoms, buffer, simplification=preBufferSimplification, jobs=jobs)
                 dataSet = VECTOR.createVector(geoms)
                 final = self.rasterize(dataSet, dtype="float32", bands=[1], burnValues=[1], resolutionDiv=resolutionDiv,
                                        applyMask=False, noData=noData)
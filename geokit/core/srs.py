@@ -2,8 +2,9 @@ import os
 import numpy as np
 from osgeo import osr
 import warnings
+import threading
+import hashlib
 from collections import namedtuple
-import smopy
 from typing import Iterable
 
 from . import util as UTIL
@@ -59,6 +60,160 @@ class _SRSCOMMON:
 # Initialize
 SRSCOMMON = _SRSCOMMON()
 
+################################################
+# SRS and transformation caches
+#  * PROJ contexts are not shareable across threads, so every thread keeps its
+#    own cache of SRS and transformation objects
+_CACHE_SIZE = 256
+_cacheLocal = threading.local()
+
+
+def _threadCache(name):
+    cache = getattr(_cacheLocal, name, None)
+    if cache is None:
+        cache = {}
+        setattr(_cacheLocal, name, cache)
+    elif len(cache) > _CACHE_SIZE:
+        cache.clear()
+    return cache
+
+
+_srsKeyCache = {}
+
+
+def srsKey(srs):
+    """
+    Get the canonical identity key of a spatial reference system
+
+    * The key is the authority code (ex. 'EPSG:4326') when the srs's WKT 
+      matches the code's own definition, otherwise it is a hash of the srs's
+      WKT
+        - SRSs sharing an authority code but with, for example, a different 
+          axis order or TOWGS84 parameters therefore get different keys
+    * Keys are remembered for each WKT string, so that new SRS objects which
+      describe the same srs (ex. from layer.GetSpatialRef()) reuse them
+
+    Parameters:
+    -----------
+    srs : Anything acceptable by geokit.srs.loadSRS
+        The srs to identify
+
+    Returns:
+    --------
+    str
+
+    """
+    srs = loadSRS(srs)
+    wkt = srs.ExportToWkt()
+
+    key = _srsKeyCache.get(wkt, None)
+    if key is None:
+        key = "WKT:" + hashlib.sha1(wkt.encode("utf-8")).hexdigest()
+
+        if srs.GetAuthorityName(None) == "EPSG":
+            try:
+                code = int(srs.GetAuthorityCode(None))
+            except (TypeError, ValueError):
+                code = None
+
+            if not code is None:
+                reference = osr.SpatialReference()
+                if reference.ImportFromEPSG(code) == 0 and reference.ExportToWkt() == wkt:
+                    key = "EPSG:%d" % code
+
+        if len(_srsKeyCache) > _CACHE_SIZE * 4:
+            _srsKeyCache.clear()
+        _srsKeyCache[wkt] = key
+    return key
+
+
+def compactSRS(srs):
+    """
+    Get a compact representation of a spatial reference system, which can be
+    restored with geokit.srs.loadSRS
+
+    * Useful for pickling objects which carry an SRS
+
+    Parameters:
+    -----------
+    srs : Anything acceptable by geokit.srs.loadSRS
+        The srs to represent
+
+    Returns:
+    --------
+    * int -> The EPSG code, if the srs matches the code's definition
+    * str -> The srs's WKT, otherwise
+
+    """
+    if srs is None:
+        return None
+    srs = loadSRS(srs)
+
+    if srs.GetAuthorityName(None) == "EPSG":
+        try:
+            code = int(srs.GetAuthorityCode(None))
+        except (TypeError, ValueError):
+            code = None
+        if not code is None and isSame(loadSRS(code), srs):
+            return code
+
+    return srs.ExportToWkt()
+
+
+_isSameCache = {}
+
+
+def isSame(srs1, srs2):
+    """
+    Check if two spatial reference systems are the same
+
+    * The canonical identity keys (see geokit.srs.srsKey) are compared first,
+      and osr.SpatialReference.IsSame is only called when they differ
+    * The outcome of IsSame is remembered for each pair of keys
+
+    Parameters:
+    -----------
+    srs1 : Anything acceptable by geokit.srs.loadSRS
+        The first srs
+
+    srs2 : Anything acceptable by geokit.srs.loadSRS
+        The second srs
+
+    Returns:
+    --------
+    bool
+
+    """
+    if srs1 is srs2:
+        return True
+    if srs1 is None or srs2 is None:
+        return False
+
+    srs1 = loadSRS(srs1)
+    srs2 = loadSRS(srs2)
+
+    key1 = srsKey(srs1)
+    key2 = srsKey(srs2)
+    if key1 == key2:
+        return True
+
+    pair = (key1, key2)
+    same = _isSameCache.get(pair, None)
+    if same is None:
+        same = bool(srs1.IsSame(srs2))
+        if len(_isSameCache) > _CACHE_SIZE * 16:
+            _isSameCache.clear()
+        _isSameCache[pair] = same
+        _isSameCache[(key2, key1)] = same
+    return same
+
+
+def clearCaches():
+    """Clear the current thread's cache of loaded SRS and transformation objects"""
+    _threadCache("srs").clear()
+    _threadCache("trx").clear()
+
+
 ################################################
 # Basic loader
 
@@ -82,6 +237,12 @@ def loadSRS(source):
     --------
     osr.SpatialReference
 
+    Note:
+    -----
+    SRS objects loaded from EPSG codes and WKT strings are cached (per thread),
+    so the same object may be returned for repeated calls. Clone it before 
+    modifying it!
+
     """
     # Do initial check of source
     if(isinstance(source, osr.SpatialReference)):
@@ -89,24 +250,67 @@ def loadSRS(source):
     elif source is None:
         return None
 
-    # Create an empty SRS
-    srs = osr.SpatialReference()
-
     # Check if source is a string
     if(isinstance(source, str)):
         if hasattr(SRSCOMMON, source):
             # assume a name for one of the common SRS's was given
-            srs = SRSCOMMON[source]
-        else:
-            srs.ImportFromWkt(source)  # assume a Wkt string was input
-    elif(isinstance(source, int)):
-        srs.ImportFromEPSG(source)
+            return SRSCOMMON[source]
+        key = source.strip()
+    elif(isinstance(source, (int, np.integer))):
+        key = int(source)
     else:
         raise GeoKitSRSError("Unknown srs source type: ", type(source))
 
+    # Look for a cached version
+    cache = _threadCache("srs")
+    srs = cache.get(key, None)
+    if srs is None:
+        srs = osr.SpatialReference()
+        if isinstance(key, int):
+            r = srs.ImportFromEPSG(key)
+        else:
+            r = srs.ImportFromWkt(key)  # assume a Wkt string was input
+
+        if r == 0:  # Only cache successful imports
+            cache[key] = srs
+
     return srs
 
 
+def loadTransformation(fromSRS, toSRS):
+    """
+    Load a coordinate transformation between two spatial reference systems
+
+    * Transformations are cached per thread and by (fromSRS, toSRS) pair, so 
+      this is much cheaper than building an osr.CoordinateTransformation each
+      time
+
+    Parameters:
+    -----------
+    fromSRS : Anything acceptable by geokit.srs.loadSRS
+        The srs of the input coordinates
+
+    toSRS : Anything acceptable by geokit.srs.loadSRS
+        The srs of the output coordinates
+
+    Returns:
+    --------
+    osr.CoordinateTransformation
+
+    """
+    fromSRS = loadSRS(fromSRS)
+    toSRS = loadSRS(toSRS)
+
+    key = (srsKey(fromSRS), srsKey(toSRS))
+    cache = _threadCache("trx")
+    trx = cache.get(key, None)
+    if trx is None:
+        trx = osr.CoordinateTransformation(fromSRS, toSRS)
+        cache[key] = trx
+
+    return trx
+
+
 # Load a few typical constants
 EPSG3035 = loadSRS(3035)
 EPSG4326 = loadSRS(4326)
@@ -157,6 +361,7 @@ def xyTransform(*args, fromSRS='latlon', toSRS='europe_m', outputFormat="raw"):
             Determine return value format
             * if 'raw', the raw output from osr.TransformPoints is given
             * if 'xy', or 'xyz' the points are given as named tuples
+            * if 'array', the points are given as an (N,3) numpy.ndarray
 
     Returns:
     --------
@@ -170,7 +375,7 @@ def xyTransform(*args, fromSRS='latlon', toSRS='europe_m', outputFormat="raw"):
     toSRS = loadSRS(toSRS)
 
     # make a transformer
-    trx = osr.CoordinateTransformation(fromSRS, toSRS)
+    trx = loadTransformation(fromSRS, toSRS)
 
     # Do transformation
     if len(args) == 0:
@@ -194,9 +399,14 @@ def xyTransform(*args, fromSRS='latlon', toSRS='europe_m', outputFormat="raw"):
     # Done!
     if outputFormat == "raw":
         return out
+
+    out = np.array(out, dtype=np.float64).reshape((-1, 3))
+    if outputFormat == "array":
+        return out
+
     elif outputFormat == "xy":
-        x = np.array([o[0] for o in out])
-        y = np.array([o[1] for o in out])
+        x = out[:, 0]
+        y = out[:, 1]
 
         TransformedPoints = namedtuple("TransformedPoints", "x y")
         return TransformedPoints(x, y)
@@ -219,7 +429,7 @@ def tileIndexAt(x, y, zoom, srs):
 
     iterable_input = isinstance(x,Iterable) or isinstance(y,Iterable)
 
-    if not srs.IsSame(EPSG4326):
+    if not isSame(srs, EPSG4326):
         pt = xyTransform(x,y, 
                 fromSRS=srs,
                 toSRS=EPSG4326, 
@@ -234,7 +444,72 @@ def tileIndexAt(x, y, zoom, srs):
         x = np.array(x)
         y = np.array(y)
 
-    xi, yi = smopy.deg2num(y, x, zoom)
+    xi, yi = tileIndices(x, y, zoom)
 
     return Tile(xi, yi, zoom)
 
+
+# The half-width of the EPSG3857 (web mercator) world, in meters
+_MERCATOR_EXTENT = 20037508.342789244
+
+
+def tileIndices(lon, lat, zoom):
+    """Get the "slippy tile" indices at the given zoom for arrays of longitude
+    and latitude coordinates
+
+    Parameters:
+    -----------
+    lon : numeric or numpy.ndarray
+        The longitude coordinates
+
+    lat : numeric or numpy.ndarray
+        The latitude coordinates
+
+    zoom : int
+        The zoom level
+
+    Returns:
+    --------
+    tuple -> (xi, yi)
+        * ints when scalar coordinates are given, otherwise int64 arrays
+
+    """
+    lon = np.asarray(lon, dtype=np.float64)
+    latRad = np.radians(np.asarray(lat, dtype=np.float64))
+    n = 2.0 ** zoom
+
+    xi = np.floor((lon + 180.0) / 360.0 * n)
+    yi = np.floor((1.0 - np.log(np.tan(latRad) + 1.0 / np.cos(latRad)) / np.pi) / 2.0 * n)
+
+    if xi.ndim == 0:
+        return int(xi), int(yi)
+    return xi.astype(np.int64), yi.astype(np.int64)
+
+
+def tileBounds(xi, yi, zoom):
+    """Get the EPSG3857 bounds of "slippy tiles" from their indices
+
+    * Computed directly in web mercator, without any coordinate transformation
+
+    Parameters:
+    -----------
+    xi : int or numpy.ndarray
+        The tiles' X-indices
+
+    yi : int or numpy.ndarray
+        The tiles' Y-indices
+
+    zoom : int
+        The zoom level
+
+    Returns:
+    --------
+    numpy.ndarray -> (..., 4) array of (xMin, yMin, xMax, yMax)
+
+    """
+    size = 2 * _MERCATOR_EXTENT / 2.0 ** zoom
+    xMin = -_MERCATOR_EXTENT + np.asarray(xi, dtype=np.float64) * size
+    yMax = _MERCATOR_EXTENT - np.asarray(yi, dtype=np.float64) * size
+
+    return np.stack(np.broadcast_arrays(xMin, yMax - size, xMin + size, yMax), axis=-1)
+
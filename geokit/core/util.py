@@ -385,8 +385,12 @@ def fitBoundsTo(bounds, dx, dy):
     return xMin, yMin, xMax, yMax
 
 
-def quickRaster(bounds, srs, dx, dy, dtype="GDT_Byte", noData=None, fill=None, data=None, scale=None, offset=None):
-    """GeoKit internal for quickly creating a raster datasource"""
+def quickRaster(bounds, srs, dx, dy, dtype="GDT_Byte", noData=None, fill=None, data=None, scale=None, offset=None, bands=1):
+    """GeoKit internal for quickly creating a raster datasource
+
+    * If multiple bands are requested, 'noData', 'fill', 'scale' and 'offset'
+      are applied to all of them, while 'data' is only written to the first
+    """
 
     #bounds = fitBoundsTo(bounds, dx, dy)
 
@@ -400,7 +404,7 @@ def quickRaster(bounds, srs, dx, dy, dtype="GDT_Byte", noData=None, fill=None, d
     # Open the driver
     driver = gdal.GetDriverByName('Mem')  # create a raster in memory
     dtype = getattr(gdal, dtype) if isinstance(dtype, str) else dtype
-    raster = driver.Create('', cols, rows, 1, dtype)
+    raster = driver.Create('', cols, rows, bands, dtype)
 
     if(raster is None):
         raise GeoKitError("Failed to create temporary raster")
@@ -410,31 +414,32 @@ def quickRaster(bounds, srs, dx, dy, dtype="GDT_Byte", noData=None, fill=None, d
     # Set the SRS
     raster.SetProjection(srs.ExportToWkt())
 
-    # get the band
-    band = raster.GetRasterBand(1)
+    for bi in range(bands):
+        # get the band
+        band = raster.GetRasterBand(bi+1)
 
-    # set optionals
-    if not noData is None:
-        band.SetNoDataValue(noData)
-        if fill is None and data is None:
-            band.Fill(noData)
+        # set optionals
+        if not noData is None:
+            band.SetNoDataValue(noData)
+            if fill is None and (data is None or bi > 0):
+                band.Fill(noData)
 
-    if not fill is None:
-        band.Fill(fill)
+        if not fill is None:
+            band.Fill(fill)
 
-    if not scale is None:
-        band.SetScale(scale)
+        if not scale is None:
+            band.SetScale(scale)
 
-    if not offset is None:
-        band.SetOffset(offset)
+        if not offset is None:
+            band.SetOffset(offset)
 
-    # add data
-    if not data is None:
-        band.WriteArray(data)
-        band.FlushCache()
+        # add data
+        if not data is None and bi == 0:
+            band.WriteArray(data)
+            band.FlushCache()
 
-    # Done!
-    del band
+        # Done!
+        del band
     raster.FlushCache()
     return raster
 
@@ -1,16 +1,20 @@
 import os
+import sys
 import numpy as np
-from osgeo import gdal, ogr, osr
+from osgeo import gdal, ogr
 from tempfile import TemporaryDirectory
 import warnings
 from collections import namedtuple, defaultdict, OrderedDict
 from collections.abc import Iterable
 import pandas as pd
+from threading import RLock
+from multiprocessing import Pool
 
 from . import util as UTIL
 from . import srs as SRS
 from . import geom as GEOM
 from . import raster as RASTER
+from .location import LocationSet
 
 
 class GeoKitVectorError(UTIL.GeoKitError):
@@ -120,19 +124,31 @@ def ogrType(s):
     raise ValueError("OGR type could not be determined")
 
 
-def filterLayer(layer, geom=None, where=None):
+def filterLayer(layer, geom=None, where=None, index=None):
     """GeoKit internal
 
     Filters an ogr Layer object accordint to a geometry and where statement
+
+    * If a SpatialIndex is given (see createSpatialIndex), the candidate FIDs
+      which intersect the geometry's envelope are prefetched from the index and
+      added to the attribute filter
+      - This is only done when there are few candidates (at most 
+        _SPATIAL_INDEX_MAX_FIDS). Otherwise only the spatial filter is used
     """
+    fids = None
     if (not geom is None):
         if isinstance(geom, ogr.Geometry):
             if(geom.GetSpatialReference() is None):
                 raise GeoKitVectorError("Input geom must have a srs")
-            if(not geom.GetSpatialReference().IsSame(layer.GetSpatialRef())):
+            if(not SRS.isSame(geom.GetSpatialReference(), layer.GetSpatialRef())):
                 geom = geom.Clone()
-                geom.TransformTo(layer.GetSpatialRef())
+                geom.Transform(SRS.loadTransformation(
+                    geom.GetSpatialReference(), layer.GetSpatialRef()))
             layer.SetSpatialFilter(geom)
+
+            if not index is None:
+                xMin, xMax, yMin, yMax = geom.GetEnvelope()
+                fids = index.query(xMin, yMin, xMax, yMax)
         else:
             if isinstance(geom, tuple):  # maybe geom is a simple tuple
                 xMin, yMin, xMax, yMax = geom
@@ -144,11 +160,237 @@ def filterLayer(layer, geom=None, where=None):
                     raise GeoKitVectorError("Geom input not understood")
             layer.SetSpatialFilterRect(xMin, yMin, xMax, yMax)
 
+            if not index is None:
+                fids = index.query(xMin, yMin, xMax, yMax)
+
+    # Only use the prefetched FIDs when they are actually selective
+    if not fids is None and fids.size > _SPATIAL_INDEX_MAX_FIDS:
+        fids = None
+
+    if not fids is None:
+        if fids.size == 0:
+            fidStatement = "FID IN (-1)"
+        else:
+            fidStatement = "FID IN (%s)" % ",".join(str(f) for f in fids)
+
+        if where is None:
+            where = fidStatement
+        else:
+            where = "(%s) AND %s" % (where, fidStatement)
+
     if(not where is None):
         r = layer.SetAttributeFilter(where)
         if(r != 0):
             raise GeoKitVectorError("Error applying where statement")
 
+
+####################################################################
+# Spatial index
+_SPATIAL_INDEX_EXT = ".gkidx.npz"
+_SPATIAL_INDEX_NODE_SIZE = 64
+# Longer FID lists cost OGR more to parse and evaluate than they save
+_SPATIAL_INDEX_MAX_FIDS = 256
+_SPATIAL_INDEX_CACHE_SIZE = 8
+_spatialIndexCache = OrderedDict()
+
+
+class SpatialIndex(object):
+    """A packed (Sort-Tile-Recursive) R-tree over the feature bounding boxes of
+    a vector source
+
+    * Feature boxes are grouped into nodes of 'nodeSize' members, and the nodes
+      are described by their own bounding box
+    * Queries first test the node boxes and then only the member boxes of the
+      overlapping nodes
+    * Usually created via geokit.vector.createSpatialIndex()
+
+    Parameters:
+    -----------
+    fids : numpy.ndarray
+        The feature IDs, in node-packed order
+
+    boxes : numpy.ndarray
+        The (N,4) array of feature boxes as (xMin, yMin, xMax, yMax), in the
+        same order as 'fids'
+
+    nodeSize : int
+        The number of features grouped into each node
+
+    """
+
+    def __init__(self, fids, boxes, nodeSize=_SPATIAL_INDEX_NODE_SIZE):
+        self.fids = np.asarray(fids, dtype=np.int64)
+        self.boxes = np.asarray(boxes, dtype=np.float64).reshape((-1, 4))
+        self.nodeSize = int(nodeSize)
+
+        nodeCount = int(np.ceil(self.fids.size / self.nodeSize))
+        self.nodes = np.empty((nodeCount, 4))
+        for ni in range(nodeCount):
+            b = self.boxes[ni*self.nodeSize:(ni+1)*self.nodeSize]
+            self.nodes[ni, :] = b[:, 0].min(), b[:, 1].min(), b[:, 2].max(), b[:, 3].max()
+
+    @staticmethod
+    def pack(fids, boxes, nodeSize=_SPATIAL_INDEX_NODE_SIZE):
+        """Build a SpatialIndex from unordered FIDs and boxes using the
+        Sort-Tile-Recursive packing method"""
+        fids = np.asarray(fids, dtype=np.int64)
+        boxes = np.asarray(boxes, dtype=np.float64).reshape((-1, 4))
+
+        cx = (boxes[:, 0] + boxes[:, 2]) / 2
+        cy = (boxes[:, 1] + boxes[:, 3]) / 2
+
+        nodeCount = int(np.ceil(fids.size / nodeSize))
+        sliceCount = max(1, int(np.ceil(np.sqrt(nodeCount))))
+        sliceSize = sliceCount * nodeSize
+
+        order = np.argsort(cx, kind="mergesort")
+        for s in range(0, fids.size, sliceSize):
+            sl = order[s:s+sliceSize]
+            order[s:s+sliceSize] = sl[np.argsort(cy[sl], kind="mergesort")]
+
+        return SpatialIndex(fids[order], boxes[order], nodeSize=nodeSize)
+
+    def query(self, xMin, yMin, xMax, yMax):
+        """Returns the sorted FIDs of all features whose box intersects the given
+        box"""
+        nodeSel = np.argwhere((self.nodes[:, 0] <= xMax) &
+                              (self.nodes[:, 2] >= xMin) &
+                              (self.nodes[:, 1] <= yMax) &
+                              (self.nodes[:, 3] >= yMin))[:, 0]
+        if nodeSel.size == 0:
+            return np.zeros(0, dtype=np.int64)
+
+        members = np.concatenate([np.arange(ni*self.nodeSize, min((ni+1)*self.nodeSize, self.fids.size))
+                                  for ni in nodeSel])
+        b = self.boxes[members]
+        sel = (b[:, 0] <= xMax) & (b[:, 2] >= xMin) & (
+            b[:, 1] <= yMax) & (b[:, 3] >= yMin)
+
+        return np.sort(self.fids[members[sel]])
+
+    def save(self, output):
+        """Save the index to disc as a numpy .npz file"""
+        with open(output, "wb") as fo:
+            np.savez(fo, fids=self.fids, boxes=self.boxes,
+                     nodeSize=self.nodeSize)
+        return output
+
+    @staticmethod
+    def load(path):
+        """Load an index which was saved with SpatialIndex.save()"""
+        with np.load(path) as data:
+            return SpatialIndex(data["fids"], data["boxes"], nodeSize=int(data["nodeSize"]))
+
+
+def _spatialIndexPath(source):
+    return source + _SPATIAL_INDEX_EXT
+
+
+def _loadSpatialIndex(source):
+    """GeoKit internal
+
+    Returns the geokit-managed SpatialIndex of the source, if one exists and is
+    not older than the source itself. Otherwise returns None
+    """
+    if not isinstance(source, str):
+        return None
+
+    path = _spatialIndexPath(source)
+    if not os.path.isfile(path):
+        return None
+
+    mtime = os.path.getmtime(path)
+    if os.path.isfile(source) and os.path.getmtime(source) > mtime:
+        warnings.warn("Ignoring outdated spatial index: " + path, UserWarning)
+        return None
+
+    key = (path, mtime)
+    if key in _spatialIndexCache:
+        _spatialIndexCache.move_to_end(key)
+    else:
+        # Drop outdated versions of this index, and the least recently used
+        # ones beyond the cache size
+        for k in [k for k in _spatialIndexCache if k[0] == path]:
+            del _spatialIndexCache[k]
+        _spatialIndexCache[key] = SpatialIndex.load(path)
+        while len(_spatialIndexCache) > _SPATIAL_INDEX_CACHE_SIZE:
+            _spatialIndexCache.popitem(last=False)
+    return _spatialIndexCache[key]
+
+
+def createSpatialIndex(source, method="auto", nodeSize=_SPATIAL_INDEX_NODE_SIZE):
+    """Build and persist a spatial index for a vector source so that subsequent
+    geometry-filtered reads (e.g. extractFeatures, countFeatures, mutateVector)
+    do not need to scan every feature
+
+    * The index is used automatically once it exists
+
+    Parameters:
+    -----------
+    source : str
+        The path to the vector datasource to index
+
+    method : str; optional
+        The indexing method to use
+        * "qix" -> Uses OGR's 'CREATE SPATIAL INDEX' statement which writes a
+          .qix file next to the source
+            - Only available for ESRI Shapefiles
+            - OGR uses the .qix file by itself
+        * "packed" -> Writes a geokit-managed packed R-tree of the feature
+          bounding boxes next to the source (as <source>.gkidx.npz)
+            - Available for all vector formats
+        * "auto" -> "qix" for shapefiles, otherwise "packed"
+
+    nodeSize : int; optional
+        The number of features grouped into each node of a packed R-tree
+
+    Returns:
+    --------
+    str -> The path to the created index file
+
+    """
+    if not isinstance(source, str):
+        raise GeoKitVectorError("source must be a path to a vector on disc")
+
+    ds = loadVector(source)
+    layer = ds.GetLayer()
+    isShapefile = ds.GetDriver().ShortName == "ESRI Shapefile"
+
+    if method == "auto":
+        method = "qix" if isShapefile else "packed"
+
+    if method == "qix":
+        if not isShapefile:
+            raise GeoKitVectorError(
+                "The 'qix' method is only available for ESRI Shapefiles")
+        layerName = layer.GetName()
+        del layer, ds
+
+        ds = gdal.OpenEx(source, gdal.OF_VECTOR | gdal.OF_UPDATE)
+        if ds is None:
+            raise GeoKitVectorError("Could not open source for updating: ", source)
+        ds.ExecuteSQL("CREATE SPATIAL INDEX ON \"%s\"" % layerName)
+        del ds
+        return os.path.splitext(source)[0] + ".qix"
+
+    elif method == "packed":
+        fids = []
+        boxes = []
+        for ftr in loopFeatures(layer):
+            g = ftr.GetGeometryRef()
+            if g is None:
+                continue
+            xMin, xMax, yMin, yMax = g.GetEnvelope()
+            fids.append(ftr.GetFID())
+            boxes.append((xMin, yMin, xMax, yMax))
+        del layer, ds
+
+        index = SpatialIndex.pack(fids, boxes, nodeSize=nodeSize)
+        return index.save(_spatialIndexPath(source))
+
+    else:
+        raise GeoKitVectorError("method not understood: " + str(method))
+
 ####################################################################
 # Vector feature count
 
@@ -182,7 +424,7 @@ def countFeatures(source, geom=None, where=None):
     """
     ds = loadVector(source)
     layer = ds.GetLayer()
-    filterLayer(layer, geom, where)
+    filterLayer(layer, geom, where, index=_loadSpatialIndex(source))
     return layer.GetFeatureCount()
 
 
@@ -238,23 +480,289 @@ def vectorInfo(source):
 
     return vecInfo(**info)
 
+####################################################################
+# Feature cache
+_featureCache = None
+
+
+class _CachedFeatures(object):
+    """GeoKit internal
+
+    Holds the decoded features of a (filtered) vector source as WKB strings,
+    attribute dictionaries, and an (N,4) array of the feature bounding boxes
+    in the source's srs
+    """
+
+    def __init__(self, wkbs, items, boxes, layerSRS, outputSRS):
+        self.wkbs = wkbs
+        self.items = items
+        self.boxes = np.asarray(boxes, dtype=np.float64).reshape((-1, 4))
+        self.layerSRS = layerSRS
+        self.outputSRS = outputSRS
+
+        self.nbytes = self.boxes.nbytes
+        for w in wkbs:
+            self.nbytes += 0 if w is None else len(w)
+        for i in items:
+            self.nbytes += sys.getsizeof(i) + \
+                sum(sys.getsizeof(v) for v in i.values())
+
+    def geometry(self, i):
+        """Decode the i'th geometry"""
+        if self.wkbs[i] is None:
+            return None
+        g = ogr.CreateGeometryFromWkb(self.wkbs[i])
+        if not self.outputSRS is None:
+            g.AssignSpatialReference(self.outputSRS)
+        return g
+
+    def select(self, geom=None):
+        """Returns the indices of the features which match the geometry filter,
+        along with the geometries which were already decoded during the search
+        (or None)"""
+        if geom is None:
+            return np.arange(len(self.wkbs)), None
+
+        exact = None
+        if isinstance(geom, ogr.Geometry):
+            geomSRS = geom.GetSpatialReference()
+            if(geomSRS is None):
+                raise GeoKitVectorError("Input geom must have a srs")
+
+            # The envelope is searched in the source's srs, while the exact
+            # intersection is tested in the srs of the cached geometries
+            search = geom
+            if(not SRS.isSame(geomSRS, self.layerSRS)):
+                search = geom.Clone()
+                search.Transform(SRS.loadTransformation(geomSRS, self.layerSRS))
+            xMin, xMax, yMin, yMax = search.GetEnvelope()
+
+            exact = geom
+            if(not SRS.isSame(geomSRS, self.outputSRS)):
+                exact = geom.Clone()
+                exact.Transform(SRS.loadTransformation(geomSRS, self.outputSRS))
+
+        elif isinstance(geom, tuple):  # maybe geom is a simple tuple
+            xMin, yMin, xMax, yMax = geom
+        else:
+            try:  # maybe geom is an extent object
+                xMin, yMin, xMax, yMax = geom.castTo(self.layerSRS).xyXY
+            except:
+                raise GeoKitVectorError("Geom input not understood")
+
+        b = self.boxes
+        sel = np.argwhere((b[:, 0] <= xMax) & (b[:, 2] >= xMin) &
+                          (b[:, 1] <= yMax) & (b[:, 3] >= yMin))[:, 0]
+
+        if exact is None:
+            return sel, None
+
+        finalSel = []
+        geoms = []
+        for i in sel:
+            g = self.geometry(i)
+            if not g is None and g.Intersects(exact):
+                finalSel.append(i)
+                geoms.append(g)
+        return np.array(finalSel, dtype=int), geoms
+
+
+# Files which belong to a source on disc and may change independently of it
+_SIDECAR_EXTS = (".dbf", ".shx", ".prj", ".cpg")
+
+
+class FeatureCache(object):
+    """An in-process, least-recently-used cache of decoded vector features
+
+    * Features are stored per source as WKB, attributes and bounding boxes
+    * Entries are keyed by the source's path, the modification times of the
+      source and its sidecar files (e.g. a shapefile's .dbf), the output srs, 
+      and the where-statement used to read it
+    * Geometry filtering is performed against the cached bounding boxes
+    * The least-recently-used entries are evicted once 'maxBytes' is exceeded
+    * Sources which do not fit within 'maxBytes' are remembered as uncacheable
+      and are read normally from then on
+    * Usually enabled via geokit.vector.enableFeatureCache()
+
+    Parameters:
+    -----------
+    maxBytes : int
+        The (approximate) memory budget of the cache, in bytes
+
+    """
+
+    def __init__(self, maxBytes):
+        self.maxBytes = int(maxBytes)
+        self.nbytes = 0
+        self._entries = OrderedDict()
+        self._uncacheable = set()
+        self._lock = RLock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        """Remove all entries from the cache"""
+        with self._lock:
+            self._entries.clear()
+            self._uncacheable.clear()
+            self.nbytes = 0
+
+    @staticmethod
+    def key(source, srs=None, where=None):
+        """Make the cache key of a source, or return None if the source cannot
+        be cached"""
+        if not isinstance(source, str) or not os.path.exists(source):
+            return None
+
+        stem = os.path.splitext(source)[0]
+        mtimes = [os.path.getmtime(source), ]
+        for ext in _SIDECAR_EXTS:
+            if os.path.isfile(stem + ext):
+                mtimes.append(os.path.getmtime(stem + ext))
+
+        srsKey = None if srs is None else SRS.loadSRS(srs).ExportToWkt()
+        return (os.path.abspath(source), tuple(mtimes), srsKey, where)
+
+    def get(self, source, srs=None, where=None):
+        """Get the cached features of a source, reading them if needed
+
+        Returns None when the source cannot be cached, including when its 
+        features do not fit within the cache's budget
+        """
+        key = self.key(source, srs, where)
+        if key is None:
+            return None
+
+        with self._lock:
+            if key in self._uncacheable:
+                return None
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+
+        entry = _readFeatures(source, srs, where)
+
+        with self._lock:
+            if entry.nbytes > self.maxBytes:
+                self._uncacheable.add(key)
+                return None
+
+            self._entries[key] = entry
+            self.nbytes += entry.nbytes
+
+            while self.nbytes > self.maxBytes:
+                _, old = self._entries.popitem(last=False)
+                self.nbytes -= old.nbytes
+        return entry
+
+
+def _readFeatures(source, srs, where):
+    """GeoKit internal
+
+    Read all features of a source into a _CachedFeatures object
+    """
+    ds = loadVector(source)
+    layer = ds.GetLayer()
+    filterLayer(layer, None, where)
+
+    layerSRS = layer.GetSpatialRef()
+    outputSRS = layerSRS
+    trx = None
+    if(not srs is None):
+        srs = SRS.loadSRS(srs)
+        if (not SRS.isSame(layerSRS, srs)):
+            trx = SRS.loadTransformation(layerSRS, srs)
+            outputSRS = srs
+
+    wkbs = []
+    items = []
+    boxes = []
+    for ftr in loopFeatures(layer):
+        oGeom = ftr.GetGeometryRef()
+        if oGeom is None:
+            wkbs.append(None)
+            boxes.append((np.nan, np.nan, np.nan, np.nan))
+        else:
+            xMin, xMax, yMin, yMax = oGeom.GetEnvelope()
+            boxes.append((xMin, yMin, xMax, yMax))
+
+            if (not trx is None):
+                oGeom = oGeom.Clone()
+                oGeom.Transform(trx)
+            wkbs.append(bytes(oGeom.ExportToWkb()))
+
+        items.append(ftr.items().copy())
+
+    return _CachedFeatures(wkbs, items, boxes, layerSRS, outputSRS)
+
+
+def enableFeatureCache(maxBytes=512 * 1024 * 1024):
+    """Enable the in-process feature cache used by extractFeatures (and 
+    everything built on it, such as mutateVector, Extent.extractFeatures and
+    RegionMask.extractFeatures)
+
+    * Repeated reads of the same source, srs and where-statement will then skip
+      re-opening the source and re-decoding the geometries
+    * Only sources which are files on disc are cached
+    * If the cache is already enabled, its budget is updated
+
+    Parameters:
+    -----------
+    maxBytes : int; optional
+        The approximate memory budget of the cache, in bytes
+
+    Returns:
+    --------
+    FeatureCache
+
+    """
+    global _featureCache
+    if _featureCache is None:
+        _featureCache = FeatureCache(maxBytes)
+    else:
+        with _featureCache._lock:
+            _featureCache.maxBytes = int(maxBytes)
+            _featureCache._uncacheable.clear()  # these might fit now
+            while _featureCache.nbytes > _featureCache.maxBytes:
+                _, old = _featureCache._entries.popitem(last=False)
+                _featureCache.nbytes -= old.nbytes
+    return _featureCache
+
+
+def disableFeatureCache():
+    """Disable (and empty) the in-process feature cache"""
+    global _featureCache
+    if not _featureCache is None:
+        _featureCache.clear()
+    _featureCache = None
+
+
 ####################################################################
 # Iterable to loop over vector items
 
 
 def _extractFeatures(source, geom, where, srs, onlyGeom, onlyAttr, skipMissingGeoms, ):
+    # Try the feature cache
+    if not _featureCache is None:
+        cached = _featureCache.get(source, srs, where)
+        if not cached is None:
+            yield from _extractCachedFeatures(cached, geom, onlyGeom, onlyAttr, skipMissingGeoms)
+            return
+
     # Do filtering
+    index = _loadSpatialIndex(source)
     source = loadVector(source)
     layer = source.GetLayer()
-    filterLayer(layer, geom, where)
+    filterLayer(layer, geom, where, index=index)
 
     # Make a transformer
     trx = None
     if(not srs is None):
         srs = SRS.loadSRS(srs)
         lyrSRS = layer.GetSpatialRef()
-        if (not lyrSRS.IsSame(srs)):
-            trx = osr.CoordinateTransformation(lyrSRS, srs)
+        if (not SRS.isSame(lyrSRS, srs)):
+            trx = SRS.loadTransformation(lyrSRS, srs)
 
     # Yield features and attributes
     for ftr in loopFeatures(layer):
@@ -284,6 +792,34 @@ def _extractFeatures(source, geom, where, srs, onlyGeom, onlyAttr, skipMissingGe
             yield UTIL.Feature(oGeom, oItems)
 
 
+def _extractCachedFeatures(cached, geom, onlyGeom, onlyAttr, skipMissingGeoms):
+    sel, geoms = cached.select(geom)
+
+    for j, i in enumerate(sel):
+        if not onlyAttr:
+            if geoms is None:
+                oGeom = cached.geometry(i)
+            else:
+                oGeom = geoms[j]
+
+            if oGeom is None and skipMissingGeoms:
+                continue
+        else:
+            oGeom = None
+
+        if not onlyGeom:
+            oItems = cached.items[i].copy()
+        else:
+            oItems = None
+
+        if onlyGeom:
+            yield oGeom
+        elif onlyAttr:
+            yield oItems
+        else:
+            yield UTIL.Feature(oGeom, oItems)
+
+
 def extractFeatures(source, where=None, geom=None, srs=None, onlyGeom=False, onlyAttr=False, asPandas=True, indexCol=None, skipMissingGeoms=True, **kwargs):
     """Creates a generator which extract the features contained within the source
 
@@ -459,7 +995,7 @@ def extractFeature(source, where=None, geom=None, srs=None, onlyGeom=False, only
 
     if(not srs is None and not onlyAttr):
         srs = SRS.loadSRS(srs)
-        if (not fGeom.GetSpatialReference().IsSame(srs)):
+        if (not SRS.isSame(fGeom.GetSpatialReference(), srs)):
             fGeom.TransformTo(srs)
 
     # Done!
@@ -613,8 +1149,8 @@ def createVector(geoms, output=None, srs=None, fieldVals=None, fieldDef=None, ov
         doTransform = False
         setSRS = False
 
-        if(srs and geomSRS and not srs.IsSame(geomSRS)):  # Test if a transformation is needed
-            trx = osr.CoordinateTransformation(geomSRS, srs)
+        if(srs and geomSRS and not SRS.isSame(srs, geomSRS)):  # Test if a transformation is needed
+            trx = SRS.loadTransformation(geomSRS, srs)
             doTransform = True
         # Test if an srs was NOT given, but the incoming geometries have an SRS already
         elif(srs is None and geomSRS):
@@ -886,7 +1422,57 @@ def createGeoJson(geoms, output=None, srs=4326, topo=False, fill=''):
 # mutuate a vector
 
 
-def mutateVector(source, processor=None, srs=None, geom=None, where=None, fieldDef=None, output=None, keepAttributes=True, _slim=False, **kwargs):
+def _mutateRowsFromWKB(processor, srsWkt, columns, rows):
+    """GeoKit internal
+
+    Applies a per-row mutateVector processor to a chunk of rows whose 
+    geometries are given as WKB. Used to transport work to a process pool
+    """
+    srs = None if srsWkt is None else SRS.loadSRS(srsWkt)
+
+    results = []
+    for row in rows:
+        ftr = pd.Series(list(row), index=columns, dtype=object)
+        g = ogr.CreateGeometryFromWkb(ftr["geom"])
+        if not srs is None:
+            g.AssignSpatialReference(srs)
+        ftr["geom"] = g
+
+        res = dict(processor(ftr))
+        if isinstance(res.get("geom", None), ogr.Geometry):
+            res["geom"] = bytes(res["geom"].ExportToWkb())
+        results.append(res)
+    return results
+
+
+def _mutateInPool(geoms, processor, srs, jobs):
+    """GeoKit internal
+
+    Applies a per-row mutateVector processor in a pool of 'jobs' processes
+    """
+    srsWkt = None if srs is None else SRS.loadSRS(srs).ExportToWkt()
+
+    columns = list(geoms.columns)
+    rows = list(zip(*[geoms[c].values for c in columns]))
+    gi = columns.index("geom")
+    rows = [r[:gi] + (bytes(r[gi].ExportToWkb()),) + r[gi + 1:] for r in rows]
+
+    chunkSize = int(np.ceil(len(rows) / (jobs * 4)))
+    chunks = [(processor, srsWkt, columns, rows[i:i + chunkSize])
+              for i in range(0, len(rows), chunkSize)]
+
+    with Pool(jobs) as pool:
+        results = pool.starmap(_mutateRowsFromWKB, chunks)
+
+    results = [r for chunk in results for r in chunk]
+    for r in results:
+        if isinstance(r.get("geom", None), bytes):
+            r["geom"] = ogr.CreateGeometryFromWkb(r["geom"])
+
+    return pd.DataFrame(results, index=geoms.index)
+
+
+def mutateVector(source, processor=None, srs=None, geom=None, where=None, fieldDef=None, output=None, keepAttributes=True, batch=False, jobs=1, _slim=False, **kwargs):
     """Process a vector dataset according to an arbitrary function
 
     Note:
@@ -950,6 +1536,21 @@ def mutateVector(source, processor=None, srs=None, geom=None, where=None, fieldD
             * Unless they are over written by the processor
         If False, only the newly specified attributes are kept
 
+    batch : bool; optional
+        If True, the processor is called only once with the whole filtered
+        pandas.DataFrame of features, instead of once per feature
+        * The processor must then return a pandas.DataFrame (or a dict of 
+          columns) with one row per input feature, containing the new 
+          geometries in the 'geom' column as well as any other new attributes
+        * This is much faster than the per-feature mode for large sources
+
+    jobs : int; optional
+        The number of processes to use when applying a per-feature processor
+        * Geometries are transported to and from the worker processes as WKB
+        * The processor must be picklable (i.e. defined at the top level of a
+          module, not a lambda or a nested function)
+        * Ignored when 'batch' is True
+
     Returns:
     --------
     * If 'output' is None: gdal.Dataset
@@ -989,7 +1590,18 @@ def mutateVector(source, processor=None, srs=None, geom=None, where=None, fieldD
 
     # Do processing
     if not processor is None:
-        result = geoms.apply(lambda x: pd.Series(processor(x)), axis=1)
+        if batch:
+            result = processor(geoms.copy())
+            if isinstance(result, pd.DataFrame):
+                result.index = geoms.index
+            else:
+                result = pd.DataFrame(result, index=geoms.index)
+        elif jobs > 1:
+            result = _mutateInPool(geoms, processor, srs, jobs)
+        else:
+            result = pd.DataFrame([processor(ftr) for _, ftr in geoms.iterrows()],
+                                  index=geoms.index)
+
         if keepAttributes:
             for c in result.columns:
                 geoms[c] = result[c].values
@@ -1012,7 +1624,107 @@ def mutateVector(source, processor=None, srs=None, geom=None, where=None, fieldD
         return createVector(geoms, srs=srs, output=output, **kwargs)
 
 
-def rasterize(source, pixelWidth, pixelHeight, srs=None, bounds=None, where=None, value=1, output=None, dtype=None, compress=True, noData=None, overwrite=True, fill=None, **kwargs):
+def _rasterizeContext(source, pixelWidth, pixelHeight, srs, bounds):
+    """GeoKit internal
+
+    Normalizes the source, srs and bounds inputs of the rasterize functions
+    """
+    # Normalize some inputs
+    if isinstance(source, ogr.Geometry):
+        source = createVector(source)
+    else:
+        source = loadVector(source)
+
+    # Get the vector's info
+    vecinfo = vectorInfo(source)
+
+    if srs is None:
+        srs = vecinfo.srs
+        srsOkay = True
+    else:
+        srs = SRS.loadSRS(srs)
+        if SRS.isSame(srs, vecinfo.srs):
+            srsOkay = True
+        else:
+            srsOkay = False
+
+    # Look for bounds input
+    if bounds is None:
+        bounds = vecinfo.bounds
+        if not srsOkay:
+            bounds = GEOM.boundsToBounds(bounds, vecinfo.srs, srs)
+    else:
+        try:
+            bounds = bounds.xyXY  # Get a tuple from an Extent object
+        except:
+            pass  # Bounds should already be a tuple
+
+    bounds = UTIL.fitBoundsTo(bounds, pixelWidth, pixelHeight)
+
+    return source, srs, srsOkay, bounds
+
+
+def _coverageMatrix(source, pixelWidth, pixelHeight, srs, bounds, where):
+    """GeoKit internal
+
+    Computes the fraction of each pixel which is covered by the (polygon) 
+    features of a source
+
+    * Pixels which are touched by a feature's boundary are evaluated exactly
+      by intersecting the features with the pixel's box
+    * All other touched pixels are fully inside a feature
+    """
+    xMin, yMin, xMax, yMax = bounds
+    cols = int(round((xMax - xMin) / pixelWidth))
+    rows = int(round((yMax - yMin) / abs(pixelHeight)))
+    pixelArea = abs(pixelWidth * pixelHeight)
+
+    geoms = [g for g in extractFeatures(
+        source, where=where, srs=srs, onlyGeom=True, asPandas=False)]
+    geoms = [g for g in geoms if g.GetDimension() == 2]
+    if len(geoms) == 0:
+        return np.zeros((rows, cols), dtype=np.float32)
+
+    # Find the touched pixels and the boundary pixels
+    def touched(_geoms):
+        ds = UTIL.quickRaster(bounds=bounds, srs=srs, dx=pixelWidth,
+                              dy=pixelHeight, dtype="GDT_Byte", fill=0)
+        vec = createVector(_geoms, srs=srs)
+        if gdal.Rasterize(ds, vec, burnValues=[1], allTouched=True) == 0:
+            raise RASTER.GeoKitRasterError("Rasterization failed!")
+        return ds.GetRasterBand(1).ReadAsArray().astype(bool)
+
+    inside = touched(geoms)
+    edges = touched([g.Boundary() for g in geoms])
+
+    coverage = inside.astype(np.float32)
+
+    # Evaluate the boundary pixels exactly, one row-strip at a time
+    envelopes = np.array([g.GetEnvelope() for g in geoms])  # xMin, xMax, yMin, yMax
+    for yi in np.argwhere(edges.any(axis=1))[:, 0]:
+        stripTop = yMax - yi * abs(pixelHeight)
+        stripBot = stripTop - abs(pixelHeight)
+        strip = GEOM.box(xMin, stripBot, xMax, stripTop, srs=srs)
+
+        sel = (envelopes[:, 2] <= stripTop) & (envelopes[:, 3] >= stripBot)
+        pieces = [geoms[i].Intersection(strip) for i in np.argwhere(sel)[:, 0]]
+        pieces = [p for p in pieces if not p is None and not p.IsEmpty()]
+        if len(pieces) == 0:
+            coverage[yi, edges[yi, :]] = 0
+            continue
+        piece = GEOM.flatten(pieces) if len(pieces) > 1 else pieces[0]
+
+        for xi in np.argwhere(edges[yi, :])[:, 0]:
+            cellLeft = xMin + xi * pixelWidth
+            cell = GEOM.box(cellLeft, stripBot, cellLeft +
+                            pixelWidth, stripTop, srs=srs)
+            overlap = piece.Intersection(cell)
+            coverage[yi, xi] = 0 if overlap is None else overlap.Area() / pixelArea
+
+    return np.clip(coverage, 0, 1)
+
+
+def rasterize(source, pixelWidth, pixelHeight, srs=None, bounds=None, where=None, value=1, output=None, dtype=None, compress=True, noData=None, overwrite=True, fill=None, mode="binary", **kwargs):
     """Rasterize a vector datasource onto a raster context
 
     Note:
@@ -1088,43 +1800,39 @@ def rasterize(source, pixelWidth, pixelHeight, srs=None, bounds=None, where=None
         * If set to False and an 'output' is specified which already exists,
           an error will be raised
 
+    mode : str; optional
+        The rasterization mode
+        * If 'binary', pixels are burned according to whether they are 
+          in a feature (or touched by one, see the 'allTouched' kwarg)
+        * If 'coverage', each pixel is given the fraction of its area which is
+          covered by the source's polygon features (between 0 and 1)
+            - Boundary pixels are computed exactly, so no oversampling is needed
+            - 'value' and 'fill' are ignored, and 'dtype' defaults to Float32
+
     Returns:
     --------
     * If 'output' is None: gdal.Dataset
     * If 'output' is a string: The path to the output is returned (for easy opening)
 
     """
-    # Normalize some inputs
-    if isinstance(source, ogr.Geometry):
-        source = createVector(source)
-    else:
-        source = loadVector(source)
+    source, srs, srsOkay, bounds = _rasterizeContext(
+        source, pixelWidth, pixelHeight, srs, bounds)
 
-    # Get the vector's info
-    vecinfo = vectorInfo(source)
+    # Do coverage rasterization
+    if mode == "coverage":
+        data = _coverageMatrix(source, pixelWidth, pixelHeight, srs, bounds, where)
+        dtype = "GDT_Float32" if dtype is None else RASTER.gdalType(dtype)
 
-    if srs is None:
-        srs = vecinfo.srs
-        srsOkay = True
-    else:
-        srs = SRS.loadSRS(srs)
-        if srs.IsSame(vecinfo.srs):
-            srsOkay = True
+        if output is None:
+            return UTIL.quickRaster(bounds=bounds, srs=srs, dx=pixelWidth, dy=pixelHeight,
+                                    dtype=dtype, noData=noData, data=data)
         else:
-            srsOkay = False
-
-    # Look for bounds input
-    if bounds is None:
-        bounds = vecinfo.bounds
-        if not srsOkay:
-            bounds = GEOM.boundsToBounds(bounds, vecinfo.srs, srs)
-    else:
-        try:
-            bounds = bounds.xyXY  # Get a tuple from an Extent object
-        except:
-            pass  # Bounds should already be a tuple
-
-    bounds = UTIL.fitBoundsTo(bounds, pixelWidth, pixelHeight)
+            return RASTER.createRaster(bounds=bounds, output=output, pixelWidth=pixelWidth,
+                                       pixelHeight=pixelHeight, dtype=dtype, srs=srs,
+                                       compress=compress, noData=noData, overwrite=overwrite,
+                                       data=data)
+    elif mode != "binary":
+        raise GeoKitVectorError("mode not understood: " + str(mode))
 
     # Determine DataType is not given
     if dtype is None:
@@ -1203,3 +1911,612 @@ def rasterize(source, pixelWidth, pixelHeight, srs=None, bounds=None, where=None
             raise RASTER.GeoKitRasterError("Rasterization failed!")
 
         return output
+
+
+def _sqlLiteral(v):
+    """GeoKit internal. Format a value for use in an OGR SQL where-statement"""
+    if isinstance(v, str):
+        return "'%s'" % v.replace("'", "''")
+    else:
+        return repr(v)
+
+
+def rasterizeBands(source, pixelWidth, pixelHeight, values, srs=None, bounds=None, where=None, fid=False, output=None, dtype=None, compress=True, noData=None, fill=None, allTouched=False, overwrite=True, asMatrix=False):
+    """Rasterize several value-specifications of a vector datasource into one 
+    multi-band raster, while reading the source only once
+
+    * The (filtered and projected) features are first read into memory, after
+      which each band is burned from the in-memory copy
+    * Each band's description states the specification it was created from
+
+    Parameters:
+    -----------
+    source : str or ogr.Geometry
+        If str, the path to the vector file to load
+        If ogr.Geometry, an Polygon geometry
+            - Will be immediately turned into a vector
+
+    pixelWidth : numeric
+        The pixel width of the raster in the working srs
+        * Is 'srs' is not given, these are the units of the source's inherent srs
+
+    pixelHeight : numeric
+        The pixel height of the raster in the working srs
+        * Is 'srs' is not given, these are the units of the source's inherent srs
+
+    values : str or [(where, value), ]
+        The band specifications
+        * If a string is given, it is assumed to be the name of a categorical 
+          attribute. One band is created for each (sorted) unique value of the
+          attribute, into which a 1 is burned for each matching feature
+        * If a list is given, one band is created for each (where, value) pair
+            - 'where' is an SQL-like where statement (or None), selecting the
+              features to burn into the band
+            - 'value' is either a numeric to burn, or the name of an attribute
+              whose values should be burned
+
+    srs : Anything acceptable to geokit.srs.loadSRS(); optional
+        The srs of the point to create
+        * If 'bounds' is an Extent object, the bounds' internal srs will override
+          this input
+
+    bounds : (xMin, yMix, xMax, yMax) or Extent; optional
+        The geographic extents spanned by the raster
+        * If not given, the whole bounds spanned by the input is used
+
+    where : str; optional
+        An SQL-like where statement to use to filter the vector before 
+        rasterizing any of the bands
+
+    fid : bool; optional
+        If True, an additional (last) band is created containing the ID of the
+        feature found at each pixel
+        * Pixels without a feature are given a value of -1
+        * The datatype is promoted to at least Int32 (or Float64) to hold the IDs
+
+    output : str; optional
+        A path to an output file 
+        * If output is None, the raster will be created in memory and a dataset 
+          handel will be returned
+
+    dtype : str; optional
+        The datatype of the created raster's bands
+        * If not given, 'Byte' is used when only the value 1 is burned (as well
+          as for categorical attributes), otherwise 'Float32'
+
+    compress : bool
+        A flag instructing the output raster to use a compression algorithm
+        * only useful if 'output' has been defined
+
+    noData : numeric; optional
+        Specifies which value should be considered as 'no data' in the created 
+        raster
+
+    fill : numeric; optional
+        The initial value given to all pixels in the value bands
+
+    allTouched : bool; optional
+        If True, all pixels touched by a feature are burned, instead of only
+        those whose center is within the feature
+
+    overwrite : bool
+        A flag to overwrite a pre-existing output file
+
+    asMatrix : bool; optional
+        If True, a (bands, rows, cols) numpy.ndarray is returned instead of a 
+        raster
+
+    Returns:
+    --------
+    * If 'asMatrix' is True: numpy.ndarray
+    * If 'output' is None: gdal.Dataset
+    * If 'output' is a string: The path to the output is returned (for easy opening)
+
+    """
+    source, srs, srsOkay, bounds = _rasterizeContext(
+        source, pixelWidth, pixelHeight, srs, bounds)
+
+    # Read the features into memory in a single pass
+    tOpts = dict(format="Memory", where=where, preserveFID=True)
+    if not srsOkay:
+        tOpts["dstSRS"] = srs.ExportToWkt()
+        tOpts["reproject"] = True
+    memDS = gdal.VectorTranslate("", source, **tOpts)
+    if memDS is None:
+        raise GeoKitVectorError("Could not read source into memory")
+    layer = memDS.GetLayer()
+
+    if isinstance(values, str):
+        categories = set()
+        if fid:
+            layer.CreateField(ogr.FieldDefn("_gk_fid", ogr.OFTInteger64))
+
+        for ftr in loopFeatures(layer):
+            categories.add(ftr.GetField(values))
+            if fid:
+                ftr.SetField("_gk_fid", ftr.GetFID())
+                layer.SetFeature(ftr)
+
+        categories.discard(None)
+        specs = [('"%s" = %s' % (values, _sqlLiteral(c)), 1)
+                 for c in sorted(categories)]
+    else:
+        specs = [tuple(spec) for spec in values]
+        if fid:
+            layer.CreateField(ogr.FieldDefn("_gk_fid", ogr.OFTInteger64))
+            for ftr in loopFeatures(layer):
+                ftr.SetField("_gk_fid", ftr.GetFID())
+                layer.SetFeature(ftr)
+
+    # Determine DataType is not given
+    if dtype is None:
+        if all([v == 1 for _, v in specs]):
+            dtype = "GDT_Byte"
+        else:
+            dtype = "GDT_Float32"
+    else:
+        dtype = RASTER.gdalType(dtype)
+
+    if fid:
+        if dtype in ["GDT_Byte", "GDT_Int16", "GDT_UInt16", "GDT_UInt32"]:
+            dtype = "GDT_Int32"
+        elif dtype == "GDT_Float32":
+            dtype = "GDT_Float64"
+
+    # Create the raster
+    bandCount = len(specs) + (1 if fid else 0)
+    if bandCount == 0:
+        raise GeoKitVectorError("No bands to rasterize")
+
+    outputDS = UTIL.quickRaster(bounds=bounds, srs=srs, dx=pixelWidth, dy=pixelHeight,
+                                dtype=dtype, noData=noData, fill=fill, bands=bandCount)
+
+    # Burn each band
+    options = ["ALL_TOUCHED=TRUE"] if allTouched else []
+    for bi, (bWhere, bValue) in enumerate(specs):
+        if layer.SetAttributeFilter(bWhere) != 0:
+            raise GeoKitVectorError("Error applying where statement")
+
+        if isinstance(bValue, str):
+            r = gdal.RasterizeLayer(outputDS, [bi + 1], layer,
+                                    options=options + ["ATTRIBUTE=%s" % bValue])
+        else:
+            r = gdal.RasterizeLayer(outputDS, [bi + 1], layer,
+                                    burn_values=[bValue], options=options)
+        if r != 0:
+            raise RASTER.GeoKitRasterError("Rasterization failed!")
+
+        outputDS.GetRasterBand(bi + 1).SetDescription(
+            "%s : %s" % (bWhere, bValue))
+
+    if fid:
+        band = outputDS.GetRasterBand(bandCount)
+        band.SetNoDataValue(-1)
+        band.Fill(-1)
+        band.SetDescription("FID")
+        del band
+
+        layer.SetAttributeFilter(None)
+        r = gdal.RasterizeLayer(outputDS, [bandCount], layer,
+                                options=options + ["ATTRIBUTE=_gk_fid"])
+        if r != 0:
+            raise RASTER.GeoKitRasterError("Rasterization failed!")
+
+    outputDS.FlushCache()
+    del layer, memDS
+
+    # Done!
+    if asMatrix:
+        return outputDS.ReadAsArray().reshape((bandCount, outputDS.RasterYSize, outputDS.RasterXSize))
+
+    if output is None:
+        return outputDS
+    else:
+        data = [outputDS.GetRasterBand(i + 1).ReadAsArray()
+                for i in range(bandCount)]
+        RASTER.createRaster(bounds=bounds, output=output, pixelWidth=pixelWidth,
+                            pixelHeight=pixelHeight, dtype=dtype, srs=srs, compress=compress,
+                            noData=noData, overwrite=overwrite, data=data)
+
+        ds = gdal.Open(output, gdal.GA_Update)
+        for i in range(bandCount):
+            ds.GetRasterBand(i + 1).SetDescription(
+                outputDS.GetRasterBand(i + 1).GetDescription())
+        if fid:
+            ds.GetRasterBand(bandCount).SetNoDataValue(-1)
+        ds.FlushCache()
+        del ds
+
+        return output
+
+
+####################################################################
+# Location queries
+_FeatureArrays = namedtuple("_FeatureArrays", "srs fids geoms items index")
+
+
+def _readFeatureArrays(source, locs, where, pad=0, srs=None):
+    """GeoKit internal
+
+    Reads the FIDs, geometries and attributes of the features of a source which
+    lie within 'pad' of the bounding box of the given locations, and packs
+    their bounding boxes into a SpatialIndex which refers to the read order
+
+    * If 'pad' is None, all features are read
+    * If 'srs' is given, geometries are transformed to it and 'pad' is given in
+      its units. Otherwise the source's srs is used
+    """
+    ds = loadVector(source)
+    layer = ds.GetLayer()
+    layerSRS = layer.GetSpatialRef()
+
+    trx = None
+    outputSRS = layerSRS
+    if not srs is None:
+        srs = SRS.loadSRS(srs)
+        if not SRS.isSame(srs, layerSRS):
+            trx = SRS.loadTransformation(layerSRS, srs)
+            outputSRS = srs
+
+    bounds = None
+    if not pad is None:
+        xMin, yMin, xMax, yMax = locs.getBounds(outputSRS)
+        bounds = (xMin - pad, yMin - pad, xMax + pad, yMax + pad)
+        if not trx is None:  # Densify the box so that its curved edges are kept
+            segment = max(bounds[2] - bounds[0], bounds[3] - bounds[1]) / 32
+            area = GEOM.transform(GEOM.box(bounds, srs=outputSRS), toSRS=layerSRS,
+                                  segment=segment if segment > 0 else None)
+            xMin, xMax, yMin, yMax = area.GetEnvelope()
+            bounds = (xMin, yMin, xMax, yMax)
+    filterLayer(layer, bounds, where, index=_loadSpatialIndex(source))
+
+    fids = []
+    geoms = []
+    items = []
+    boxes = []
+    for ftr in loopFeatures(layer):
+        g = ftr.GetGeometryRef()
+        if g is None:
+            continue
+        g = g.Clone()
+        if not trx is None:
+            g.Transform(trx)
+            g.AssignSpatialReference(outputSRS)
+        xMin, xMax, yMin, yMax = g.GetEnvelope()
+
+        fids.append(ftr.GetFID())
+        geoms.append(g)
+        items.append(ftr.items().copy())
+        boxes.append((xMin, yMin, xMax, yMax))
+
+    index = SpatialIndex.pack(np.arange(len(fids)), boxes)
+    return _FeatureArrays(outputSRS, np.array(fids, dtype=np.int64), geoms, items, index)
+
+
+def _featureTable(features, match, attributes):
+    """GeoKit internal
+
+    Builds the output table of a location query given the index of the matched
+    feature for each location (or -1)
+    """
+    if attributes is None:
+        table = pd.DataFrame(features.items)
+    elif len(attributes) == 0:
+        table = pd.DataFrame(index=np.arange(len(features.items)))
+    else:
+        table = pd.DataFrame(features.items, columns=list(attributes))
+
+    matched = match >= 0
+    fid = np.full(match.size, -1, dtype=np.int64)
+    fid[matched] = features.fids[match[matched]]
+
+    output = table.reindex(match)
+    output.index = pd.RangeIndex(match.size)
+    output.insert(0, "fid", fid)
+    return output
+
+
+def _emptyFeatureTable(source, attributes):
+    """GeoKit internal
+
+    Builds the output table of a location query without any locations, taking
+    the columns from the source's layer definition
+    """
+    columns = vectorInfo(source).attributes if attributes is None else list(attributes)
+    output = pd.DataFrame(columns=columns, index=pd.RangeIndex(0))
+    output.insert(0, "fid", np.zeros(0, dtype=np.int64))
+    return output
+
+
+def _containingFeatures(features, xy):
+    """GeoKit internal
+
+    Returns the read position of the first polygon feature which contains each
+    point, or -1. Non-polygon features are ignored
+
+    * Each node of the features' STR tree selects its candidate points from an
+      x-sorted point array, and each feature in the node is then tested against
+      its candidates all at once
+    """
+    order = np.argsort(xy[:, 0], kind="stable")
+    xs = xy[order, 0]
+
+    # Use the read position as the match value, so that the first feature wins
+    noMatch = len(features.geoms)
+    best = np.full(xy.shape[0], noMatch, dtype=np.int64)
+
+    index = features.index
+    for ni, (nxMin, nyMin, nxMax, nyMax) in enumerate(index.nodes):
+        lo = np.searchsorted(xs, nxMin, side="left")
+        hi = np.searchsorted(xs, nxMax, side="right")
+        nodePts = order[lo:hi]
+        nodePts = nodePts[(xy[nodePts, 1] >= nyMin) & (xy[nodePts, 1] <= nyMax)]
+        if nodePts.size == 0:
+            continue
+
+        for j in range(ni * index.nodeSize, min((ni + 1) * index.nodeSize, index.fids.size)):
+            fi = index.fids[j]
+            g = features.geoms[fi]
+            if not ogr.GT_Flatten(g.GetGeometryType()) in (GEOM.POLYGON, GEOM.MULTIPOLYGON):
+                continue
+
+            xMin, yMin, xMax, yMax = index.boxes[j]
+            pts = nodePts[(xy[nodePts, 0] >= xMin) & (xy[nodePts, 0] <= xMax) &
+                          (xy[nodePts, 1] >= yMin) & (xy[nodePts, 1] <= yMax)]
+            if pts.size == 0:
+                continue
+
+            pts = pts[GEOM.containsPoints(g, xy[pts])]
+            best[pts] = np.minimum(best[pts], fi)
+
+    best[best == noMatch] = -1
+    return best
+
+
+def spatialJoin(source, locations, attributes=None, where=None):
+    """Find the polygon feature of a vector source which contains each of many
+    locations
+
+    * Feature bounding boxes are packed into a Sort-Tile-Recursive tree, and 
+      each tree node selects its candidate locations from an x-sorted point 
+      array. Each feature is then tested exactly against its candidates all at 
+      once (see geokit.geom.containsPoints)
+    * If a location is contained by several features, the feature which was 
+      read first is used
+
+    Parameters:
+    -----------
+    source : Anything acceptable by loadVector()
+        The vector datasource to read from
+        * Must contain POLYGON or MULTIPOLYGON features
+
+    locations : Anything acceptable to LocationSet()
+        The locations to join
+
+    attributes : [str, ]; optional
+        The feature attributes to return
+        * If not given, all attributes are returned
+
+    where : str; optional
+        An SQL-like where statement to apply to the source
+        * Feature attribute name do not need quotes
+        * String values should be wrapped in 'single quotes'
+
+    Returns:
+    --------
+    pandas.DataFrame
+        * One row for each location, in the order they were given
+        * The 'fid' column holds the containing feature's ID, or -1 if no 
+          feature contains the location
+        * The remaining columns hold the containing feature's attributes
+
+    """
+    if not isinstance(locations, LocationSet):
+        locations = LocationSet(locations)
+
+    if locations.count == 0:
+        return _emptyFeatureTable(source, attributes)
+
+    features = _readFeatureArrays(source, locations, where)
+    for g in features.geoms:
+        if not ogr.GT_Flatten(g.GetGeometryType()) in (GEOM.POLYGON, GEOM.MULTIPOLYGON):
+            raise GeoKitVectorError(
+                "spatialJoin requires POLYGON or MULTIPOLYGON features")
+
+    match = _containingFeatures(features, locations._cachedXY(features.srs))
+    return _featureTable(features, match, attributes)
+
+
+_NEAREST_CHUNK = 1 << 16
+_NEAREST_K = 16
+_NEAREST_MAX_PIECE_RATIO = 4
+
+
+def _segmentDistance(px, py, segments):
+    """GeoKit internal
+
+    Distance from points to line segments given as (..., 4) arrays of 
+    (x0, y0, x1, y1), broadcasting the points against the segments
+    """
+    x0, y0, x1, y1 = np.moveaxis(segments, -1, 0)
+    dx = x1 - x0
+    dy = y1 - y0
+    length2 = dx * dx + dy * dy
+
+    t = ((px - x0) * dx + (py - y0) * dy) / np.where(length2 > 0, length2, 1)
+    t = np.clip(t, 0, 1)
+    return np.hypot(px - (x0 + t * dx), py - (y0 + t * dy))
+
+
+def _splitSegments(segments, owners, halfLength, maxPieces):
+    """GeoKit internal
+
+    Splits segments into equal pieces so that no piece is longer than twice 
+    'halfLength'
+
+    * 'halfLength' is doubled until the total number of pieces is at most 
+      'maxPieces' (or each segment is a single piece)
+    """
+    dx = segments[:, 2] - segments[:, 0]
+    dy = segments[:, 3] - segments[:, 1]
+    lengths = np.hypot(dx, dy)
+    while True:
+        pieces = np.maximum(1, np.ceil(lengths / (2 * halfLength))).astype(np.int64)
+        if pieces.sum() <= maxPieces:
+            break
+        halfLength *= 2
+
+    if (pieces == 1).all():
+        return segments, owners
+
+    si = np.repeat(np.arange(segments.shape[0]), pieces)
+    k = np.arange(si.size) - np.repeat(np.cumsum(pieces) - pieces, pieces)
+    t0 = k / pieces[si]
+    t1 = (k + 1) / pieces[si]
+
+    x0, y0 = segments[si, 0], segments[si, 1]
+    output = np.column_stack([x0 + t0 * dx[si], y0 + t0 * dy[si],
+                              x0 + t1 * dx[si], y0 + t1 * dy[si]])
+    return output, owners[si]
+
+
+def nearestFeatures(source, locations, maxDistance=None, srs=None, attributes=None, where=None):
+    """Find the nearest feature of a vector source, and its distance, for each
+    of many locations
+
+    * All features are broken into straight line segments (points become 
+      segments of zero length), and long segments are split into pieces of a
+      similar length (into at most 4 times as many pieces as there are 
+      segments)
+    * The pieces' midpoints are organized into a KD-tree. For each location, 
+      the nearest pieces are searched until no unchecked piece can be closer 
+      than the closest one found so far
+    * Locations inside polygon features have a distance of zero
+    * If a maximum distance is given, only features near to the locations are
+      read and the search stops at this distance
+
+    Parameters:
+    -----------
+    source : Anything acceptable by loadVector()
+        The vector datasource to read from
+
+    locations : Anything acceptable to LocationSet()
+        The locations to search from
+
+    maxDistance : float; optional
+        The largest distance to search, in units of 'srs'
+        * Locations which have no feature within this distance get a distance
+          of inf and a 'fid' of -1
+
+    srs : Anything acceptable to geokit.srs.loadSRS(); optional
+        The srs in which distances are measured
+        * Should be a projected srs with meaningful units
+        * If not given, a Lambert-Azimuthal-Equal-Area projection centered on 
+          the locations is used (see geokit.srs.centeredLAEA)
+            - Distances are then measured in meters, but become distorted for 
+              locations far (more than roughly 1000 km) from the center. For 
+              locations spread over a larger area, pass a suitable srs
+
+    attributes : [str, ]; optional
+        The feature attributes to return
+        * If not given, all attributes are returned
+
+    where : str; optional
+        An SQL-like where statement to apply to the source
+        * Feature attribute name do not need quotes
+        * String values should be wrapped in 'single quotes'
+
+    Returns:
+    --------
+    pandas.DataFrame
+        * One row for each location, in the order they were given
+        * The 'fid' column holds the nearest feature's ID (or -1)
+        * The 'distance' column holds the distance to the nearest feature
+        * The remaining columns hold the nearest feature's attributes
+
+    """
+    from scipy.spatial import cKDTree
+
+    if not isinstance(locations, LocationSet):
+        locations = LocationSet(locations)
+
+    if locations.count == 0:
+        output = _emptyFeatureTable(source, attributes)
+        output.insert(1, "distance", np.zeros(0))
+        return output
+
+    if srs is None:
+        lonMin, latMin, lonMax, latMax = locations.getBounds(4326)
+        srs = SRS.centeredLAEA((lonMin + lonMax) / 2, (latMin + latMax) / 2)
+
+    pad = None if maxDistance is None else float(maxDistance)
+    features = _readFeatureArrays(source, locations, where, pad=pad, srs=srs)
+
+    match = np.full(locations.count, -1, dtype=np.int64)
+    distance = np.full(locations.count, np.inf)
+
+    segments, owners = GEOM.extractSegments(features.geoms)
+    if segments.shape[0] > 0:
+        xy = locations._cachedXY(features.srs)
+
+        # Locations within polygons are at a distance of zero
+        inside = _containingFeatures(features, xy)
+        match[inside >= 0] = inside[inside >= 0]
+        distance[inside >= 0] = 0
+
+        # Split unusually long segments, and find the distance within which
+        # every piece lies from its midpoint
+        lengths = np.hypot(segments[:, 2] - segments[:, 0],
+                           segments[:, 3] - segments[:, 1])
+        if (lengths > 0).any():
+            segments, owners = _splitSegments(
+                segments, owners, np.percentile(lengths[lengths > 0], 90) / 2,
+                maxPieces=_NEAREST_MAX_PIECE_RATIO * segments.shape[0])
+        halfLength = np.hypot(segments[:, 2] - segments[:, 0],
+                              segments[:, 3] - segments[:, 1]).max() / 2
+        tree = cKDTree((segments[:, :2] + segments[:, 2:]) / 2)
+
+        limit = np.inf if maxDistance is None else float(maxDistance)
+        todo = np.flatnonzero(inside < 0)
+        for c in range(0, todo.size, _NEAREST_CHUNK):
+            pts = todo[c:c + _NEAREST_CHUNK]
+            best = np.full(pts.size, np.inf)
+            bestSeg = np.full(pts.size, -1, dtype=np.int64)
+
+            k = _NEAREST_K
+            active = np.arange(pts.size)
+            while active.size > 0:
+                kk = min(k, segments.shape[0])
+                midDist, si = tree.query(xy[pts[active]], k=kk,
+                                         distance_upper_bound=limit + halfLength)
+                midDist = midDist.reshape((active.size, kk))
+                si = si.reshape((active.size, kk))
+
+                found = np.isfinite(midDist)
+                d = np.full(midDist.shape, np.inf)
+                p = xy[pts[active]]
+                d[found] = _segmentDistance(p[:, 0:1].repeat(kk, 1)[found],
+                                            p[:, 1:2].repeat(kk, 1)[found],
+                                            segments[si[found]])
+
+                j = np.argmin(d, axis=1)
+                dMin = d[np.arange(active.size), j]
+                better = dMin < best[active]
+                best[active[better]] = dMin[better]
+                bestSeg[active[better]] = si[better, j[better]]
+
+                # Unchecked pieces could still be closer if the farthest 
+                # checked piece's midpoint is within reach
+                more = found[:, -1] & (midDist[:, -1] <= np.minimum(best[active], limit) + halfLength)
+                if kk == segments.shape[0]:
+                    break
+                active = active[more]
+                k *= 2
+
+            ok = (bestSeg >= 0) & (best <= limit)
+            match[pts[ok]] = owners[bestSeg[ok]]
+            distance[pts[ok]] = best[ok]
+
+    output = _featureTable(features, match, attributes)
+    output.insert(1, "distance", distance)
+    return output
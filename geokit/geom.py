@@ -1,6 +1,9 @@
 from geokit.core.geom import (GeoKitGeomError,
                               point,
                               box,
+                              points,
+                              boxes,
+                              polygons,
                               tile,
                               tileAt,
                               subTiles,
@@ -19,7 +22,14 @@ from geokit.core.geom import (GeoKitGeomError,
                               convertGeoJson,
                               transform,
                               flatten,
+                              applyOperations,
+                              bufferGeoms,
+                              simplifyGeoms,
                               drawGeoms,
                               partition,
+                              partitionByArea,
                               extractVerticies,
+                              extractVerticiesBulk,
+                              extractSegments,
+                              containsPoints,
                               )
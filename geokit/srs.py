@@ -1,2 +1,3 @@
-from geokit.core.srs import (GeoKitSRSError, SRSCOMMON, loadSRS,
-                             xyTransform, EPSG4326, EPSG3035, EPSG3857, centeredLAEA, tileIndexAt)
+from geokit.core.srs import (GeoKitSRSError, SRSCOMMON, loadSRS, loadTransformation, clearCaches, srsKey, isSame, compactSRS,
+                             xyTransform, EPSG4326, EPSG3035, EPSG3857, centeredLAEA, tileIndexAt,
+                             tileIndices, tileBounds)
@@ -61,6 +61,7 @@ AACHEN_SHAPE_EXTENT_3035 = (4035500.0, 3048700.0, 4069500.0, 3101000.0)
 AACHEN_ELIGIBILITY_RASTER = source("aachen_eligibility.tif")
 AACHEN_ZONES = source("aachen_zones.shp")
 AACHEN_POINTS = source("aachen_points.shp")
+AACHEN_RAILS = source("aachen_rails.shp")
 AACHEN_URBAN_LC = source("urban_land_cover_aachenClipped.tif")
 
 NUMPY_FLOAT_ARRAY = np.arange(10, dtype="float")
@@ -58,3 +58,90 @@ def test_tileIndexAt():
     assert np.isclose(tiles.xi, [2126, 2126, 2127]).all()
     assert np.isclose(tiles.yi, [1391, 1391, 1391]).all()
     assert np.isclose(tiles.zoom, 12).all()
+
+
+def test_tileIndices():
+    xi, yi = srs.tileIndices(6.083, 50.775, zoom=8)
+    assert (xi, yi) == (132, 85)
+
+    xi, yi = srs.tileIndices([6.083, 6.083, -179.9], [50.775, -50.775, 0.1], zoom=8)
+    assert (xi == [132, 132, 0]).all()
+    assert (yi == [85, 170, 127]).all()
+
+
+def test_tileBounds():
+    b = srs.tileBounds(4250, 2775, zoom=13)
+    assert np.isclose(b, [753363.3507786973, 6457400.14953169,
+                          758255.3205889486, 6462292.119341941]).all()
+
+    b = srs.tileBounds(np.array([0, 1]), np.array([0, 1]), zoom=1)
+    assert b.shape == (2, 4)
+    assert np.isclose(b[0], [-20037508.342789244, 0, 0, 20037508.342789244]).all()
+    assert np.isclose(b[1], [0, -20037508.342789244, 20037508.342789244, 0]).all()
+
+
+def test_xyTransform_array():
+    pts = srs.xyTransform(pointsInAachen4326, fromSRS='latlon',
+                          toSRS='europe_m', outputFormat="array")
+    assert pts.shape == (3, 3)
+    assert np.isclose(pts[0, 0], 4042131.1581, 1e-6)
+    assert np.isclose(pts[2, 1], 3087947.743, 1e-6)
+
+    xy = srs.xyTransform(pointsInAachen4326, fromSRS='latlon',
+                         toSRS='europe_m', outputFormat="xy")
+    assert np.isclose(xy.x, pts[:, 0]).all()
+    assert np.isclose(xy.y, pts[:, 1]).all()
+
+
+def test_loadTransformation():
+    # SRS objects from EPSG codes are reused
+    assert srs.loadSRS(3035) is srs.loadSRS(3035)
+
+    # Transformations are reused
+    t1 = srs.loadTransformation(4326, 3035)
+    t2 = srs.loadTransformation(srs.EPSG4326, 'europe_m')
+    assert t1 is t2
+
+    x, y, _ = t1.TransformPoint(*pointsInAachen4326[0])
+    assert np.isclose(x, 4042131.1581, 1e-6)
+
+    # ...but not across threads
+    from threading import Thread
+    other = []
+    th = Thread(target=lambda: other.append(srs.loadTransformation(4326, 3035)))
+    th.start()
+    th.join()
+    assert not other[0] is t1
+
+    srs.clearCaches()
+    assert not srs.loadTransformation(4326, 3035) is t1
+
+
+def test_isSame():
+    assert srs.srsKey(4326) == "EPSG:4326"
+    assert srs.srsKey(srs.EPSG3035) == "EPSG:3035"
+
+    laea = srs.centeredLAEA(6.8, 50.0775)
+    assert srs.srsKey(laea).startswith("WKT:")
+    assert srs.srsKey(laea) == srs.srsKey(laea.ExportToWkt())
+
+    assert srs.isSame(srs.EPSG4326, 4326)
+    assert srs.isSame(srs.EPSG4326, srs.EPSG4326.ExportToWkt())
+    assert not srs.isSame(srs.EPSG4326, srs.EPSG3035)
+    assert not srs.isSame(laea, srs.EPSG3035)
+    assert not srs.isSame(srs.EPSG4326, None)
+
+    # A modified srs keeps its authority code, but not its key
+    modified = osr.SpatialReference()
+    modified.ImportFromEPSG(4326)
+    modified.SetTOWGS84(100, 200, 300)
+    assert modified.GetAuthorityCode(None) == "4326"
+    assert srs.srsKey(modified).startswith("WKT:")
+    assert srs.isSame(modified, 4326) == bool(modified.IsSame(srs.EPSG4326))
+
+    # Keys are remembered per WKT, so new wrappers of the same srs reuse them
+    copy = osr.SpatialReference()
+    copy.ImportFromWkt(laea.ExportToWkt())
+    from geokit.core import srs as coreSRS
+    assert laea.ExportToWkt() in coreSRS._srsKeyCache
+    assert srs.srsKey(copy) == srs.srsKey(laea)
@@ -1,5 +1,5 @@
 from .helpers import MASK_DATA, np, pointInAachen3035, pointsInAachen4326, EPSG3035, EPSG4326, POLY, GEOM, SUB_GEOMS, SUB_GEOM, result
-from geokit import geom
+from geokit import geom, srs
 import matplotlib.pyplot as plt
 import pytest
 import pandas as pd
@@ -13,6 +13,44 @@ def test_box():
     assert np.isclose(b1.Area(), 50)
 
 
+def test_boxes():
+    b = geom.boxes(np.array([[0, 0, 5, 10], [1, 1, 2, 3]]), srs=EPSG3035)
+    assert len(b) == 2
+    assert np.isclose(b[0].Area(), 50)
+    assert np.isclose(b[1].Area(), 2)
+    assert b[1].GetEnvelope() == (1, 2, 1, 3)
+    assert b[0].GetSpatialReference().IsSame(EPSG3035)
+
+
+def test_points():
+    x = np.array([5, 6, 7.5])
+    y = np.array([20, 21, 22.5])
+
+    # From separate arrays
+    p1 = geom.points(x, y, srs=EPSG4326)
+    assert len(p1) == 3
+    assert np.isclose(p1[2].GetX(), 7.5)
+    assert np.isclose(p1[2].GetY(), 22.5)
+    assert p1[0].GetSpatialReference().IsSame(EPSG4326)
+
+    # From an Nx2 array
+    p2 = geom.points(np.column_stack([x, y]), srs=EPSG3035)
+    assert [g.GetX() for g in p2] == list(x)
+    assert p2[1].GetSpatialReference().IsSame(EPSG3035)
+
+
+def test_polygons():
+    box_ = [(-2, -2), (-2, 2), (2, 2), (2, -2)]  # unclosed
+    diamond = np.array([(0, 1), (-0.5, 0), (0, -1), (0.5, 0), (0, 1)])
+
+    g = geom.polygons([box_, [box_, diamond]], srs=EPSG3035)
+    assert len(g) == 2
+    assert np.isclose(g[0].Area(), 16)
+    assert np.isclose(g[1].Area(), 15)
+    assert g[1].GetGeometryRef(0).GetPointCount() == 5
+    assert g[1].GetSpatialReference().IsSame(EPSG3035)
+
+
 def test_tile():
     # fun func
     t1 = geom.tile(xi=4250, yi=2775, zoom=13)
@@ -71,6 +109,18 @@ def test_subTiles():
     assert tiles[5] == (68, 51, 7)
     assert tiles[6] == (69, 49, 7)
 
+    geoms = list(geom.subTiles(GEOM, zoom=7, checkIntersect=True, asGeom=True))
+    assert len(geoms) == 7
+    assert np.isclose(geoms[3].GetEnvelope(),
+                      geom.tile(68, 49, 7).GetEnvelope()).all()
+
+    # Block-wise filtering should match a tile-by-tile check
+    geom3857 = geom.transform(GEOM, toSRS=3857)
+    allTiles = geom.subTiles(GEOM, zoom=10, checkIntersect=False)
+    expected = [t for t in allTiles if geom3857.Intersects(geom.tile(*t))]
+    tiles = list(geom.subTiles(GEOM, zoom=10, checkIntersect=True))
+    assert tiles == expected
+
 
 def test_tileize():
     geoms = list(geom.tileize(GEOM, zoom=7))
@@ -157,6 +207,33 @@ def test_polygonizeMatrix():
         EPSG3035)  # polygonizeMatrix: contexted srs
 
 
+def test_polygonizeMatrix_tiled():
+    complexmatrix = np.array([[0, 2, 0, 0, 0],
+                              [2, 2, 0, 1, 0],
+                              [0, 0, 0, 1, 1],
+                              [1, 1, 0, 1, 0],
+                              [3, 1, 0, 0, 0]], dtype=np.int)
+
+    # Geometries crossing tile seams should be merged
+    g1 = geom.polygonizeMatrix(complexmatrix, shrink=None, tileSize=2)
+    assert g1.shape[0] == 4
+    assert np.isclose(sum([g.Area() for g in g1.geom]), 11.0)
+    assert sorted(g1.value) == [1, 1, 2, 3]
+    assert np.isclose(sorted([g.Area() for g in g1.geom]), [1, 3, 3, 4]).all()
+
+    # Compare against the untiled version, with context and in parallel
+    g2 = geom.polygonizeMask(MASK_DATA, bounds=(-3, 10, 22, 35), srs=EPSG3035,
+                             flat=True, shrink=None, tileSize=30, jobs=2)
+    g3 = geom.polygonizeMask(MASK_DATA, bounds=(-3, 10, 22, 35), srs=EPSG3035,
+                             flat=True, shrink=None)
+    assert np.isclose(g2.Area(), g3.Area())
+    assert g2.GetSpatialReference().IsSame(EPSG3035)
+
+    g4 = geom.polygonizeMask(MASK_DATA, flat=False, shrink=None, tileSize=30)
+    g5 = geom.polygonizeMask(MASK_DATA, flat=False, shrink=None)
+    assert len(g4) == len(g5)
+
+
 def test_polygonizeMask():
     # test a simple box
     boxmask = np.array([[0, 0, 0, 0, 0],
@@ -216,6 +293,19 @@ def test_flatten():
 
     assert f1.GetSpatialReference().IsSame(EPSG4326)  # flattened srs
 
+    # pairwise and grid-partitioned unions give the same result
+    f2 = geom.flatten(geomList, method="pairwise")
+    assert np.isclose(f2.Area(), 16.0)
+
+    f3 = geom.flatten(geomList, grid=2)
+    assert np.isclose(f3.Area(), 16.0)
+    assert f3.GetSpatialReference().IsSame(EPSG4326)
+
+    # disjoint polygons become a multipolygon
+    f4 = geom.flatten(SUB_GEOMS, checkValid=False)
+    assert f4.GetGeometryName() == "MULTIPOLYGON"
+    assert f4.GetGeometryCount() == 3
+
 
 def test_transform():
     # test a single point
@@ -240,6 +330,16 @@ def test_transform():
     assert np.isclose(sum([t.Area() for t in t2]),
                       83747886418.48529)  # "Transform Area
 
+    # bulk transformation of mixed geometries should match individual transformations
+    mixed = [geom.point(7, 48, srs=EPSG4326), GEOM, GEOM.Boundary(), geom.flatten(SUB_GEOMS)]
+    t3 = geom.transform(mixed, toSRS=EPSG3035)
+    for a, b in zip(mixed, t3):
+        check = a.Clone()
+        check.TransformTo(EPSG3035)
+        assert b.GetGeometryName() == check.GetGeometryName()
+        assert b.GetSpatialReference().IsSame(EPSG3035)
+        assert np.isclose(geom.extractVerticies(b), geom.extractVerticies(check)).all()
+
 
 def test_extractVerticies():
     # Test polygon
@@ -266,6 +366,39 @@ def test_extractVerticies():
     assert pts5.shape == (1, 2)
 
 
+def test_extractVerticiesBulk():
+    geoms = [GEOM, geom.flatten(SUB_GEOMS), GEOM.Boundary(),
+             geom.point(5, 20)]
+    pts, index = geom.extractVerticiesBulk(geoms)
+
+    assert pts.shape == (10 + 12 + 10 + 1, 2)
+    assert (np.bincount(index) == [10, 12, 10, 1]).all()
+
+    # Should match the single geometry extraction
+    for i, g in enumerate(geoms):
+        assert np.isclose(pts[index == i], geom.extractVerticies(g)).all()
+
+
+def test_containsPoints():
+    rng = np.random.RandomState(0)
+    xMin, xMax, yMin, yMax = GEOM.GetEnvelope()
+    xy = np.column_stack([rng.uniform(xMin - 1, xMax + 1, 2000),
+                          rng.uniform(yMin - 1, yMax + 1, 2000)])
+
+    # Compare against one Contains call per point
+    for g in [GEOM, geom.flatten(SUB_GEOMS)]:
+        sel = geom.containsPoints(g, xy)
+        assert sel.dtype == bool
+        expected = [g.Contains(geom.point(x, y, srs=EPSG4326)) for x, y in xy]
+        assert (sel == expected).all()
+
+    # Points in another srs
+    xy3035 = srs.xyTransform(xy, fromSRS=EPSG4326, toSRS=EPSG3035,
+                             outputFormat="array")[:, :2]
+    sel3035 = geom.containsPoints(GEOM, xy3035, srs=EPSG3035)
+    assert (sel3035 == geom.containsPoints(GEOM, xy)).mean() > 0.999
+
+
 def test_drawGeoms():
     # Draw single polygon
     r = geom.drawGeoms(SUB_GEOM)
@@ -303,3 +436,80 @@ def test_drawGeoms():
     plt.savefig(result("drawGeoms-8.png"), dpi=100)
 
     assert True
+
+
+def test_drawGeoms_bulk():
+    # Draw polygons, lines and points together as collections
+    geoms = SUB_GEOMS + [SUB_GEOM.Boundary(), geom.point(7.2, 49.8)]
+    r = geom.drawGeoms(geoms, bulk=True)
+    plt.savefig(result("drawGeoms-bulk-1.png"), dpi=100)
+    assert len(r.handles) == 3
+    assert len(r.handles[0].get_paths()) == 3
+
+    # Color by a column
+    df = pd.DataFrame(dict(geom=SUB_GEOMS, hats=[1, 2, 3]))
+    r = geom.drawGeoms(df, srs=3035, colorBy="hats", bulk=True)
+    plt.savefig(result("drawGeoms-bulk-2.png"), dpi=100)
+    assert len(r.handles) == 1
+
+    # Without decimation, every vertex is kept
+    r = geom.drawGeoms(SUB_GEOMS, bulk=True, simplificationFactor=None)
+    assert [len(p.vertices) for p in r.handles[0].get_paths()] == [4, 4, 4]
+
+
+def test_bufferGeoms():
+    pts = [geom.point(x, y, srs=EPSG3035) for x, y in np.random.random((2500, 2)) * 1000]
+
+    # Serial
+    b1 = geom.bufferGeoms(pts[:10], 5, jobs=1)
+    assert len(b1) == 10
+    assert np.isclose(b1[0].Area(), np.pi * 25, rtol=1e-2)
+    assert b1[0].GetSpatialReference().IsSame(EPSG3035)
+
+    # Parallel, with order retention
+    b2 = geom.bufferGeoms(pts, 5, simplification=0.1, jobs=2)
+    assert len(b2) == len(pts)
+    assert b2[-1].GetSpatialReference().IsSame(EPSG3035)
+    for i in [0, 1234, 2499]:
+        c = b2[i].Centroid()
+        assert np.isclose(c.GetX(), pts[i].GetX())
+        assert np.isclose(c.GetY(), pts[i].GetY())
+
+
+def _bufferInWorker(count):
+    pts = [geom.point(x, x, srs=EPSG3035) for x in range(count)]
+    return len(geom.bufferGeoms(pts, 5, jobs=2))
+
+
+def test_bufferGeoms_daemon():
+    # Worker processes cannot start their own pool, so they must run serially
+    from multiprocessing import Pool
+    with Pool(1) as pool:
+        assert pool.apply(_bufferInWorker, (2500, )) == 2500
+
+
+def test_simplifyGeoms():
+    s1 = geom.simplifyGeoms([GEOM, SUB_GEOM], 0.5, jobs=1)
+    assert len(s1) == 2
+    assert s1[0].GetGeometryName() == "POLYGON"
+    assert len(geom.extractVerticies(s1[0])) < len(geom.extractVerticies(GEOM))
+
+
+def test_partitionByArea():
+    g = geom.transform(GEOM, toSRS=EPSG3035)
+    total = g.Area()
+
+    parts = geom.partitionByArea(g, count=5)
+    assert len(parts) == 5
+
+    areas = np.array([p.Area() for p in parts])
+    assert np.isclose(areas, total / 5, rtol=0.01).all()
+    assert np.isclose(areas.sum(), total)
+    assert parts[0].GetSpatialReference().IsSame(EPSG3035)
+
+    # pieces should not overlap
+    assert np.isclose(geom.flatten(parts).Area(), total)
+
+    # count can be derived from a target area
+    parts = geom.partitionByArea(g, targetArea=total / 3)
+    assert len(parts) == 3
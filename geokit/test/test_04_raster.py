@@ -1,5 +1,5 @@
 from .helpers import *  # NUMPY_FLOAT_ARRAY, CLC_RASTER_PATH, result
-from geokit import raster, geom, util
+from geokit import raster, geom, util, LocationSet
 from osgeo import gdal
 import pytest
 
@@ -126,6 +126,21 @@ def test_extractValues():
     v4 = raster.extractValues(CLC_RASTER_PATH, pt, winRange=2)
     assert np.isclose(np.abs(v4.data-real).sum(), 0.0)
 
+    # test array and LocationSet inputs
+    v5 = raster.extractValues(CLC_RASTER_PATH, np.array(points))
+    assert (v5.data.values == realValue).all()
+    assert np.isclose(v5.xOffset, [d[0] for d in realDiffs], rtol=1e-4).all()
+
+    locs = LocationSet(points)
+    v6 = raster.extractValues(CLC_RASTER_PATH, locs)
+    assert (v6.data.values == realValue).all()
+    assert v6.index[1] == locs[1]
+
+    # test window fetch for many points
+    v7 = raster.extractValues(CLC_RASTER_PATH, [pt.GetPoint_2D(), pt.GetPoint_2D()],
+                              pointSRS=EPSG3035, winRange=2)
+    assert np.isclose(np.abs(v7.data[1]-real).sum(), 0.0)
+
 # A nicer way to get a single value
 
 
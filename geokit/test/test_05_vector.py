@@ -1,5 +1,5 @@
 from .helpers import *
-from geokit import vector, raster, geom, util
+from geokit import vector, raster, geom, util, LocationSet
 
 # ogrType
 
@@ -308,3 +308,290 @@ def test_rasterize():
     mat = raster.extractMatrix(r, autocorrect=True)
     assert np.isclose(np.isnan(mat).sum(), 53706)
     assert np.isclose(np.nanmean(mat), 2004.96384743)
+
+
+def test_createSpatialIndex():
+    import shutil
+    for ext in [".shp", ".shx", ".dbf", ".prj"]:
+        shutil.copy(BOXES[:-4] + ext, result("indexed_boxes" + ext))
+    indexed = result("indexed_boxes.shp")
+
+    # Geokit-managed packed index
+    out = vector.createSpatialIndex(indexed, method="packed")
+    assert isfile(out)
+
+    index = vector.SpatialIndex.load(out)
+    fids = index.query(0, 0, 3, 3)
+    assert 0 in fids
+    assert 1 in fids
+
+    vi = vector.extractFeatures(indexed, geom=geom.box(0, 0, 3, 3, srs=EPSG4326))
+    assert vi.shape[0] == 2
+    assert vi['name'][0] == "harry"
+    assert vi['name'][1] == "ron"
+
+    cnt = vector.countFeatures(indexed, geom=geom.box(0, 0, 3, 3, srs=EPSG4326), where="smart>0")
+    assert cnt == 0
+
+    # The index restricts the features OGR reads before the spatial filter
+    # is evaluated
+    from geokit.core import vector as coreVector
+    ds = vector.loadVector(indexed)
+    layer = ds.GetLayer()
+    coreVector.filterLayer(layer, geom=(0, 0, 3, 3), index=index)
+    assert layer.GetFeatureCount() == 2
+    layer.SetSpatialFilter(None)
+    assert layer.GetFeatureCount() == len(fids)
+    assert len(fids) < 3
+
+    # Long candidate lists are not turned into attribute filters
+    limit = coreVector._SPATIAL_INDEX_MAX_FIDS
+    try:
+        coreVector._SPATIAL_INDEX_MAX_FIDS = 1
+        layer = ds.GetLayer()
+        layer.SetAttributeFilter(None)
+        coreVector.filterLayer(layer, geom=(0, 0, 3, 3), index=index)
+        layer.SetSpatialFilter(None)
+        assert layer.GetFeatureCount() == 3
+    finally:
+        coreVector._SPATIAL_INDEX_MAX_FIDS = limit
+
+    # Indexes of several sources stay cached together
+    for ext in [".shp", ".shx", ".dbf", ".prj"]:
+        shutil.copy(BOXES[:-4] + ext, result("indexed_boxes_2" + ext))
+    indexed2 = result("indexed_boxes_2.shp")
+    vector.createSpatialIndex(indexed2, method="packed")
+    first = coreVector._loadSpatialIndex(indexed)
+    coreVector._loadSpatialIndex(indexed2)
+    assert coreVector._loadSpatialIndex(indexed) is first
+
+    # Shapefile .qix index
+    out = vector.createSpatialIndex(indexed, method="qix")
+    assert isfile(out)
+    assert vector.countFeatures(indexed, geom=geom.box(0, 0, 3, 3, srs=EPSG4326)) == 2
+
+
+def test_enableFeatureCache():
+    cache = vector.enableFeatureCache(maxBytes=10 * 1024 * 1024)
+    try:
+        # Cached reads should match uncached reads
+        vi = vector.extractFeatures(BOXES, geom=geom.box(0, 0, 3, 3, srs=EPSG4326))
+        assert len(cache) == 1
+        assert vi.shape[0] == 2
+        assert vi['name'][0] == "harry"
+        assert vi['name'][1] == "ron"
+
+        vi = vector.extractFeatures(BOXES, geom=(0, 0, 3, 3))
+        assert len(cache) == 1  # same entry is reused
+        assert vi.shape[0] == 2
+
+        # A different srs and where statement create a new entry
+        vi = list(vector.extractFeatures(
+            BOXES, where="smart>0", srs=EPSG3035, asPandas=False))
+        assert len(cache) == 2
+        assert len(vi) == 1
+        assert vi[0][0].GetSpatialReference().IsSame(EPSG3035)
+        assert vi[0][1]['name'] == "hermoine"
+
+        # Eviction
+        vector.enableFeatureCache(maxBytes=0)
+        assert len(cache) == 0
+
+        # Sources over the budget are read normally and are not retried
+        assert cache.get(BOXES) is None
+        assert cache.key(BOXES) in cache._uncacheable
+        vi = vector.extractFeatures(BOXES, geom=geom.box(0, 0, 3, 3, srs=EPSG4326))
+        assert vi.shape[0] == 2
+        assert len(cache) == 0
+
+        # Changes to a shapefile's sidecar files change the key
+        import shutil
+        for ext in [".shp", ".shx", ".dbf", ".prj"]:
+            shutil.copy(BOXES[:-4] + ext, result("cached_boxes" + ext))
+        path = result("cached_boxes.shp")
+        key = cache.key(path)
+        mtime = os.path.getmtime(path[:-4] + ".dbf")
+        os.utime(path[:-4] + ".dbf", (mtime + 10, mtime + 10))
+        assert cache.key(path) != key
+    finally:
+        vector.disableFeatureCache()
+
+
+def test_spatialJoin():
+    info = vector.vectorInfo(BOXES)
+    rng = np.random.RandomState(0)
+    pts = np.column_stack([rng.uniform(info.xMin - 1, info.xMax + 1, 1000),
+                           rng.uniform(info.yMin - 1, info.yMax + 1, 1000)])
+
+    result = vector.spatialJoin(BOXES, pts)
+    assert result.shape[0] == 1000
+    assert result.columns[0] == "fid"
+    assert "name" in result.columns
+
+    # Compare against a brute force search
+    ftrs = list(vector.extractFeatures(BOXES, asPandas=False))
+    for i in range(0, 1000, 10):
+        p = geom.point(*pts[i], srs=EPSG4326)
+        names = [a["name"] for g, a in ftrs if g.Contains(p)]
+        if len(names) == 0:
+            assert result.fid[i] == -1
+            assert pd.isnull(result["name"][i])
+        else:
+            assert result["name"][i] == names[0]
+    assert (result.fid >= 0).any()
+
+    # Attribute selection, where statement and srs handling
+    pts3035 = LocationSet(pts).asXY(3035)
+    result = vector.spatialJoin(BOXES, LocationSet(pts3035, srs=3035),
+                                attributes=["name"], where="smart>0")
+    assert list(result.columns) == ["fid", "name"]
+    assert (result["name"][result.fid >= 0] == "hermoine").all()
+
+    # No locations
+    empty = vector.spatialJoin(BOXES, np.zeros((0, 2)))
+    assert empty.shape[0] == 0
+    assert list(empty.columns) == ["fid"] + vector.vectorInfo(BOXES).attributes
+
+
+def test_nearestFeatures():
+    rails = list(vector.extractFeatures(AACHEN_RAILS, srs=EPSG3035, asPandas=False))
+    xMin, xMax, yMin, yMax = geom.flatten([g for g, a in rails]).GetEnvelope()
+
+    rng = np.random.RandomState(0)
+    pts = np.column_stack([rng.uniform(xMin, xMax, 500),
+                           rng.uniform(yMin, yMax, 500)])
+    locs = LocationSet(pts, srs=3035)
+
+    result = vector.nearestFeatures(AACHEN_RAILS, locs, srs=EPSG3035)
+    assert result.shape[0] == 500
+    assert list(result.columns[:2]) == ["fid", "distance"]
+    assert (result.fid >= 0).all()
+
+    # Compare against a brute force search
+    fids = [ftr.GetFID() for ftr in vector.loopFeatures(AACHEN_RAILS)
+            if not ftr.GetGeometryRef() is None]
+    for i in range(0, 500, 25):
+        p = geom.point(*locs.asXY(3035)[i], srs=EPSG3035)
+        dists = [g.Distance(p) for g, a in rails]
+        assert np.isclose(result.distance[i], min(dists), atol=1e-3)
+        assert np.isclose(dists[fids.index(result.fid[i])], min(dists), atol=1e-3)
+
+    # Distance cut-off
+    limited = vector.nearestFeatures(AACHEN_RAILS, locs, maxDistance=500,
+                                     srs=EPSG3035, attributes=[])
+    near = result.distance <= 500
+    assert list(limited.columns) == ["fid", "distance"]
+    assert np.isclose(limited.distance[near], result.distance[near]).all()
+    assert (limited.fid[~near] == -1).all()
+    assert np.isinf(limited.distance[~near]).all()
+
+    # By default, distances are measured in a projection centered on the
+    # locations
+    centered = vector.nearestFeatures(AACHEN_RAILS, locs[:50], attributes=[])
+    assert (centered.fid.values == result.fid.values[:50]).all()
+    assert np.isclose(centered.distance.values, result.distance.values[:50], rtol=1e-2).all()
+
+    # Locations inside polygons have a distance of zero
+    c = list(vector.extractFeatures(BOXES, asPandas=False))[0][0].Centroid()
+    result = vector.nearestFeatures(BOXES, [(c.GetX(), c.GetY()), (-20, -20)])
+    assert result.distance[0] == 0
+    assert result["name"][0] == "harry"
+    assert result.distance[1] > 0
+
+    # No locations
+    empty = vector.nearestFeatures(BOXES, np.zeros((0, 2)), attributes=["name"])
+    assert empty.shape[0] == 0
+    assert list(empty.columns) == ["fid", "distance", "name"]
+
+
+def test_nearestFeatures_splitSegments():
+    from geokit.core import vector as coreVector
+
+    # Many short segments and one very long one
+    segments = np.zeros((100, 4))
+    segments[:, 2] = 1
+    segments[0, 2] = 1e6
+    owners = np.arange(100)
+
+    pieces, pieceOwners = coreVector._splitSegments(segments, owners, 0.5, maxPieces=400)
+    assert 100 < pieces.shape[0] <= 400
+    assert (pieceOwners[:pieces.shape[0] - 99] == 0).all()
+
+    # The pieces cover the long segment exactly
+    long = pieces[pieceOwners == 0]
+    assert long[0, 0] == 0 and np.isclose(long[-1, 2], 1e6)
+    assert np.isclose(long[1:, 0], long[:-1, 2]).all()
+
+
+def _growByWordLength(ftr):
+    size = len(ftr["word"])*10
+    return {'geom': ftr.geom.Buffer(size), "size": size}
+
+
+def test_mutateVector_batch():
+    sentance = ["Never", "have", "I", "ever", "ridden", "on",
+                "a", "horse", "Did", "you", "know", "that", "?"]
+
+    # Batch processor
+    def growAll(ftrs):
+        size = ftrs.word.apply(len).values*10
+        return {'geom': [g.Buffer(s) for g, s in zip(ftrs.geom, size)], "size": size}
+
+    ps1 = vector.mutateVector(AACHEN_POINTS, processor=growAll, srs=EPSG3035, batch=True)
+    res1 = vector.extractFeatures(ps1)
+    assert res1.shape[0] == 13
+    for i in range(13):
+        assert res1.geom[i].GetGeometryName() == "POLYGON"
+        assert res1['word'][i] == sentance[i]
+        assert res1['size'][i] == len(sentance[i])*10
+        area = np.power(10*len(sentance[i]), 2)*np.pi
+        assert np.isclose(area, res1.geom[i].Area(), rtol=1.e-3)
+
+    # Per-feature processor in a process pool
+    ps2 = vector.mutateVector(AACHEN_POINTS, processor=_growByWordLength, srs=EPSG3035, jobs=2)
+    res2 = vector.extractFeatures(ps2)
+    assert res2.shape[0] == 13
+    for i in range(13):
+        assert res2.geom[i].GetSpatialReference().IsSame(EPSG3035)
+        assert res2['word'][i] == sentance[i]
+        assert np.isclose(res1.geom[i].Area(), res2.geom[i].Area())
+
+
+def test_rasterizeBands():
+    # Specification list
+    mats = vector.rasterizeBands(source=AACHEN_ZONES,
+                                 values=[("YEAR>2000", 1), (None, 1), (None, "YEAR")],
+                                 pixelWidth=250,
+                                 pixelHeight=250,
+                                 asMatrix=True)
+    assert mats.shape[0] == 3
+    assert np.isclose(mats[1].mean(), 0.13910192)
+    assert (mats[0] <= mats[1]).all()
+
+    single = raster.extractMatrix(vector.rasterize(
+        source=AACHEN_ZONES, pixelWidth=250, pixelHeight=250, where="YEAR>2000"))
+    assert np.isclose(mats[0], single).all()
+
+    # Categorical attribute, with feature IDs, written to disc
+    out = vector.rasterizeBands(source=BOXES,
+                                values="name",
+                                pixelWidth=0.1,
+                                pixelHeight=0.1,
+                                fid=True,
+                                output=result("rasterizeBands.tif"))
+    ds = raster.loadRaster(out)
+    assert ds.RasterCount == 4  # harry, hermoine, ron, and FID
+
+    fids = ds.GetRasterBand(4).ReadAsArray()
+    assert fids.min() == -1
+    assert fids.max() == 2
+
+
+def test_rasterize_coverage():
+    box = geom.box(0, 0, 1.05, 1.05, srs=EPSG3035)
+    r = vector.rasterize(source=box, pixelWidth=0.1, pixelHeight=0.1, mode="coverage")
+    mat = raster.extractMatrix(r)
+
+    assert np.isclose(mat.sum() * 0.01, box.Area())
+    assert np.isclose(mat.max(), 1)
+    assert np.isclose(mat[0, -1], 0.25)  # top right corner pixel (when yAtTop)
@@ -2,6 +2,22 @@ from .helpers import *
 from geokit import srs, Extent, LocationSet, util, raster, vector, error, _test_data_
 
 
+def test_Extent_pickle():
+    import pickle
+
+    ex = Extent(3, -4, -5, 10, srs=EPSG3035)
+    ex2 = pickle.loads(pickle.dumps(ex))
+    assert ex2.xyXY == ex.xyXY
+    assert ex2.srs.IsSame(EPSG3035)
+    assert np.isclose(ex2.box.Area(), ex.box.Area())
+
+    # srs without an EPSG code
+    lea = srs.centeredLAEA(6, 50)
+    ex = Extent(0, 0, 100, 100, srs=lea)
+    ex2 = pickle.loads(pickle.dumps(ex))
+    assert ex2.srs.IsSame(lea)
+
+
 def test_Extent___init__():
     # basic
     ex1 = Extent(3, -4, -5, 10, srs=EPSG4326)
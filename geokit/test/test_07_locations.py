@@ -1,5 +1,6 @@
+import pickle
 from .helpers import *
-from geokit import Location, LocationSet, geom
+from geokit import Location, LocationSet, geom, error
 
 xy = (9, 5)
 
@@ -186,6 +187,39 @@ def test_LocationSet___init__():
     ls5 = LocationSet(pts)
     assert ls5.count == 10
 
+    # From a DataFrame with lon/lat columns
+    df = pd.DataFrame(np.array(pointsInAachen4326), columns=["lon", "lat"])
+    ls6 = LocationSet(df)
+    assert ls6.count == 3
+    assert ls[2] == ls6[2]
+
+    # lon/lat columns cannot be in another srs
+    try:
+        LocationSet(df, srs=3035)
+        assert False
+    except error.GeoKitLocationError:
+        pass
+
+    # From a DataFrame with geometries
+    df = pd.DataFrame(dict(geom=pts))
+    ls7 = LocationSet(df)
+    assert ls7.count == 10
+    assert np.isclose(ls7.lons, ls5.lons).all()
+
+    # From another LocationSet
+    ls8 = LocationSet(ls)
+    assert (ls8.lats == ls.lats).all()
+    assert ls8.lats.dtype == np.float64
+
+    # Input arrays are copied, and the stored arrays are read-only
+    arr = np.array(pointsInAachen4326)
+    ls9 = LocationSet(arr)
+    arr[0, 0] = 0
+    assert ls9.lons[0] == pointsInAachen4326[0][0]
+    assert not ls9.lons.flags.writeable
+    assert not ls9[1:].lats.flags.writeable
+    assert not np.shares_memory(ls9[1:].lats, ls9.lats)
+
 
 def test_LocationSet___getitem__():
     ls = LocationSet([[1, 1],
@@ -194,6 +228,20 @@ def test_LocationSet___getitem__():
                       [2, 3], ])
 
     assert ls[2] == (2, 2.5)
+    assert ls[-1] == (2, 3)
+
+    # slicing and masking give array-backed sets
+    sub = ls[ls.lons > 1]
+    assert isinstance(sub, LocationSet)
+    assert sub.count == 2
+    assert sub[0] == (2, 2.5)
+
+    sub = ls[1:3]
+    assert isinstance(sub, LocationSet)
+    assert (sub.lats == [2, 2.5]).all()
+
+    # iteration gives Locations
+    assert [l for l in ls][1] == (1, 2)
 
 
 def test_LocationSet_getBounds():
@@ -206,6 +254,11 @@ def test_LocationSet_getBounds():
     assert np.isclose(bounds[2], 4065568.4155270099)
     assert np.isclose(bounds[3], 3087947.74365965)
 
+    # Bounds are cached per srs
+    assert ls.getBounds(EPSG3035) is bounds
+    assert ls.getBounds() == (ls.lons.min(), ls.lats.min(),
+                              ls.lons.max(), ls.lats.max())
+
 
 def test_LocationSet_asString():
     pts = [(2, 3), (4, 2), (5, 5)]
@@ -231,12 +284,13 @@ def test_LocationSet_makePickleable():
     ls = LocationSet(pts)
     geoms = ls.asGeom()
 
-    assert not ls[1]._geom is None
-
     ls.makePickleable()
 
     assert ls[1]._geom is None
 
+    ls2 = pickle.loads(pickle.dumps(ls))
+    assert ls2[1] == ls[1]
+
 
 def test_LocationSet_asXY():
     pts = [(2, 3), (4, 2), (5, 7)]
@@ -246,6 +300,28 @@ def test_LocationSet_asXY():
     assert np.isclose(xyvals[1], (4, 2)).all()
     assert np.isclose(xyvals[2], (5, 7)).all()
 
+    # Transformed coordinates are cached per srs, but the returned arrays are
+    # independent copies
+    xy3035 = ls.asXY(srs=3035)
+    assert ls._cachedXY(srs=EPSG3035) is ls._cachedXY(srs=3035)
+    assert not ls._cachedXY(srs=3035).flags.writeable
+
+    g = geom.transform(geom.point(4, 2, srs=EPSG4326), toSRS=EPSG3035)
+    assert np.isclose(xy3035[1], (g.GetX(), g.GetY())).all()
+
+    xy3035[:, 0] += 100
+    assert np.isclose(ls.asXY(srs=3035)[1], (g.GetX(), g.GetY())).all()
+
+    # Only a few srs's are cached at a time
+    for code in [4326, 3035, 3857, 32632, 25832, 31467]:
+        ls.asXY(srs=code)
+        ls.getBounds(srs=code)
+    assert len(ls._xyCache) <= 4
+    assert len(ls._boundsCache) <= 4
+
+    ls.clearCache()
+    assert len(ls._xyCache) == 0
+
 
 def test_LocationSet_asHash():
     pts = [(2, 3), (4, 2), (5, 7)]
@@ -320,3 +396,187 @@ def test_LocationSet_bisect():
     assert sublocs[1][1] == (2, 1)
     assert sublocs[1][2] == (2, 1.5)
     assert sublocs[1][3] == (2, -1)
+
+
+def test_LocationSet_nearest():
+    ls = LocationSet(pointsInAachen3035, srs=3035)
+
+    # The closest location to each location is itself
+    n = ls.nearest(ls)
+    assert (n.index == [0, 1, 2]).all()
+    assert np.isclose(n.distance, 0, atol=1e-3).all()
+
+    # Find the two nearest
+    n = ls.nearest(LocationSet(pointInAachen3035, srs=3035), k=2)
+    assert n.index.shape == (1, 2)
+    assert (n.index[0] == [2, 1]).all()
+
+    # Limit the search distance
+    n = ls.nearest(ls, k=2, maxDistance=15000)
+    assert (n.index[:, 0] == [0, 1, 2]).all()
+    assert (n.index[:, 1] == [1, 0, -1]).all()
+    assert np.isinf(n.distance[2, 1])
+
+
+def test_LocationSet_within():
+    ls = LocationSet(pointsInAachen3035, srs=3035)
+
+    found = ls.within(LocationSet(pointInAachen3035, srs=3035), radius=10000)
+    assert len(found) == 1
+    assert (found[0] == [2]).all()
+
+    found = ls.within(ls, radius=15000)
+    assert (found[0] == [0, 1]).all()
+    assert (found[2] == [2]).all()
+
+    pairs = ls.pairsWithin(15000)
+    assert pairs.tolist() == [[0, 1]]
+
+
+def test_LocationSet_dedupe():
+    pts = [(6.0, 50.0), (6.00001, 50.0), (7.0, 50.0), (6.0, 50.000005), (7.0, 51.0)]
+    ls = LocationSet(pts)
+
+    unique, index = ls.dedupe(tolerance=1.0, returnIndex=True)
+    assert unique.count == 3
+    assert unique[0] == (6.0, 50.0)
+    assert unique[1] == (7.0, 50.0)
+    assert (index == [0, 0, 1, 0, 2]).all()
+
+
+def test_LocationSet_hashKeys():
+    ls = LocationSet([(2, 3), (4, 2), (2, 3.000001), (-4, -2)])
+    keys = ls.hashKeys()
+
+    assert keys.dtype == np.int64
+    assert keys[0] == keys[2]
+    assert len(set(keys[[0, 1, 3]])) == 3
+
+
+def test_LocationSet_setOperations():
+    ls1 = LocationSet([(2, 3), (4, 2), (5, 7), (2, 3)])
+    ls2 = LocationSet([(5, 7), (1, 1), (2, 3)])
+
+    assert ls1.unique().count == 3
+    assert (ls1.isin(ls2) == [True, False, True, True]).all()
+    assert (ls1.indexIn(ls2) == [2, -1, 0, 2]).all()
+
+    u = ls1.union(ls2)
+    assert u.asString() == ["(2.00000,3.00000)", "(4.00000,2.00000)",
+                            "(5.00000,7.00000)", "(1.00000,1.00000)"]
+
+    i = ls1.intersection(ls2)
+    assert i.asString() == ["(2.00000,3.00000)", "(5.00000,7.00000)"]
+
+    d = ls1.difference(ls2)
+    assert d.asString() == ["(4.00000,2.00000)"]
+
+
+def test_LocationSet_join():
+    results = pd.DataFrame(dict(value=[10, 20, 30]),
+                           index=[Location(5, 7), Location(1, 1), Location(2, 3)])
+    ls = LocationSet([(2, 3), (4, 2), (5, 7)])
+
+    joined = ls.join(results)
+    assert joined.shape == (3, 1)
+    assert joined.value[0] == 30
+    assert np.isnan(joined.value[1])
+    assert joined.value[2] == 10
+
+    joined = ls.join(results.value)
+    assert joined[2] == 10
+
+
+def test_Location_pickle():
+    l = Location(9, 5)
+    l.geom  # build the geometry
+    l2 = pickle.loads(pickle.dumps(l))
+    assert l2 == l
+    assert l2._geom is None
+    assert np.isclose(l2.geom.GetX(), 9)
+
+
+def test_LocationSet_pickle():
+    ls = LocationSet(pointsInAachen4326)
+    ls.asXY(3035)
+    ls.kdTree()
+
+    data = pickle.dumps(ls)
+    ls2 = pickle.loads(data)
+    assert ls2.count == 3
+    assert (ls2.lons == ls.lons).all()
+    assert np.isclose(ls2.asXY(3035), ls.asXY(3035)).all()
+
+
+def test_LocationSet_partition():
+    rng = np.random.RandomState(0)
+    lons = rng.uniform(5.5, 7.0, 1001)
+    lats = rng.uniform(50.0, 51.0, 1001)
+    ls = LocationSet(np.column_stack([lons, lats]))
+
+    for method in ["kdtree", "hilbert"]:
+        parts = ls.partition(7, method=method)
+        assert len(parts) == 7
+
+        sizes = [p.locations.count for p in parts]
+        assert sum(sizes) == 1001
+        assert max(sizes) - min(sizes) <= 1
+
+        allIndex = np.sort(np.concatenate([p.index for p in parts]))
+        assert (allIndex == np.arange(1001)).all()
+
+        for p in parts:
+            assert (p.locations.lons == lons[p.index]).all()
+            xy = p.locations.asXY(3035)
+            assert (xy[:, 0] >= p.bounds[0]).all()
+            assert (xy[:, 1] >= p.bounds[1]).all()
+            assert (xy[:, 0] <= p.bounds[2]).all()
+            assert (xy[:, 1] <= p.bounds[3]).all()
+
+    # kdtree groups should not overlap when split in two
+    a, b = ls.partition(2, srs=4326)
+    assert a.bounds[2] <= b.bounds[0] or a.bounds[3] <= b.bounds[1]
+
+    # more groups than locations
+    parts = LocationSet(pointsInAachen4326).partition(10)
+    assert len(parts) == 3
+
+
+def test_LocationSet_fromStrings():
+    strings = ["(6.06,50.78)", " ( 6.1 , 50.8 ) ", "Some text (-1.5,2.25) more"]
+    ls = LocationSet.fromStrings(strings)
+    assert ls.count == 3
+    assert np.isclose(ls.lons, [6.06, 6.1, -1.5]).all()
+    assert np.isclose(ls.lats, [50.78, 50.8, 2.25]).all()
+
+    # Same result through the constructor and from pandas
+    ls2 = LocationSet(pd.Series(strings))
+    assert (ls2.lons == ls.lons).all()
+
+    # Round trip with asString
+    ls3 = LocationSet(LocationSet(pointsInAachen4326).asString())
+    assert np.isclose(ls3.lons, [p[0] for p in pointsInAachen4326]).all()
+
+    # Strings in another srs
+    strings3035 = ["(%f,%f)" % xy for xy in pointsInAachen3035]
+    ls4 = LocationSet.fromStrings(strings3035, srs=3035)
+    assert np.isclose(ls4.lons, [p[0] for p in pointsInAachen4326]).all()
+
+    try:
+        LocationSet.fromStrings(["(6.06,50.78)", "not a location"])
+        assert False
+    except error.GeoKitLocationError:
+        pass
+
+
+def test_LocationSet_fromXY():
+    x = [p[0] for p in pointsInAachen3035]
+    y = [p[1] for p in pointsInAachen3035]
+
+    ls = LocationSet.fromXY(x, y, srs=3035)
+    assert np.isclose(ls.lons, [p[0] for p in pointsInAachen4326]).all()
+    assert np.isclose(ls.lats, [p[1] for p in pointsInAachen4326]).all()
+
+    ls2 = LocationSet(pd.DataFrame(dict(x=x, y=y)), srs=3035)
+    assert np.isclose(ls2.lons, ls.lons).all()
+    assert np.isclose(ls2.lats, ls.lats).all()
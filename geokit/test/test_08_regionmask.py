@@ -1,8 +1,64 @@
 from .helpers import *
-from geokit import RegionMask, Extent, geom, vector, raster, util, error
+from geokit import RegionMask, Extent, LocationSet, geom, vector, raster, util, error
 import pytest
 
 
+def test_RegionMask_pickle():
+    import pickle
+
+    ext = Extent(0, 0, 100, 100, srs=EPSG3035)
+    rm = RegionMask(ext, 1, mask=MASK_DATA, attributes=dict(name="test"))
+    rm2 = pickle.loads(pickle.dumps(rm))
+
+    assert rm2.mask.dtype == bool
+    assert (rm2.mask == rm.mask).all()
+    assert rm2.extent == rm.extent
+    assert rm2.pixelRes == 1
+    assert rm2.attributes["name"] == "test"
+    assert rm2.srs.IsSame(EPSG3035)
+
+    # geometry-based masks keep their geometry
+    rm = RegionMask(ext, 2, geom=GEOM)
+    rm2 = pickle.loads(pickle.dumps(rm))
+    assert rm2._mask is None
+    assert np.isclose(rm2.geometry.Area(), rm.geometry.Area())
+    assert rm2.geometry.GetSpatialReference().IsSame(
+        rm.geometry.GetSpatialReference())
+
+
+def test_RegionMask_containsLoc():
+    rng = np.random.RandomState(0)
+    rows = rng.randint(0, 100, 500)
+    cols = rng.randint(0, 100, 500)
+
+    # Pixel centers in the mask's srs
+    ext = Extent(0, 0, 100, 100, srs=EPSG3035)
+    rm = RegionMask(ext, 1, mask=MASK_DATA)
+    xy = np.column_stack([cols + 0.5, 100 - rows - 0.5])
+
+    sel = rm.containsLoc(xy, srs=3035)
+    assert sel.dtype == bool
+    assert (sel == MASK_DATA[rows, cols]).all()
+
+    # Locations outside of the extent are never contained
+    sel = rm.containsLoc([(-5, 50), (150, 50), (50, 150)], srs=3035)
+    assert not sel.any()
+
+    # Geometry method
+    rm = RegionMask.fromGeom(GEOM, pixelRes=0.05, srs=EPSG4326, padExtent=0.2)
+    xMin, xMax, yMin, yMax = GEOM.GetEnvelope()
+    locs = LocationSet(np.column_stack([rng.uniform(xMin, xMax, 500),
+                                        rng.uniform(yMin, yMax, 500)]))
+
+    selGeom = rm.containsLoc(locs, method="geometry")
+    expected = [GEOM.Contains(l.geom) for l in locs]
+    assert (selGeom == expected).all()
+
+    # The mask is a close approximation of the geometry
+    selMask = rm.containsLoc(locs)
+    assert (selMask == selGeom).mean() > 0.95
+
+
 def test_RegionMask___init__():
     ext = Extent(0, 0, 100, 100, srs=EPSG3035)
     # test succeed
@@ -351,6 +407,14 @@ def test_RegionMask_indicateFeatures():
 
     assert np.isclose(res4.sum(), -83792, 1e-6)
 
+    # Fractional coverage
+    res5 = rm.indicateFeatures(
+        NATURA_PATH, where="SITECODE='DE5404303'", mode="coverage")
+    assert res5.max() <= 1
+    assert res5.min() >= 0
+    assert ((res5 > 0) & (res5 < 1)).any()
+    assert np.isclose(res5.sum(), res.sum(), rtol=0.05)
+
 
 @pytest.mark.skip("No test implemented")
 def test_RegionMask_indicateGeoms():
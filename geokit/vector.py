@@ -8,4 +8,12 @@ from geokit.core.vector import (   loadVector,
                                     createVector, 
                                     createGeoJson,
                                     mutateVector, 
-                                    rasterize )
\ No newline at end of file
+                                    rasterize,
+                                    rasterizeBands,
+                                    createSpatialIndex,
+                                    SpatialIndex,
+                                    FeatureCache,
+                                    enableFeatureCache,
+                                    disableFeatureCache,
+                                    spatialJoin,
+                                    nearestFeatures )
\ No newline at end of file